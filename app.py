@@ -1,124 +1,269 @@
-from flask import Flask, render_template, request, jsonify, send_file
+from flask import Flask, render_template, request, jsonify, send_file, Response, stream_with_context, has_request_context
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
-import requests
 from bs4 import BeautifulSoup
-import base64
-import io
+import mimetypes
 import os
-import json
-from datetime import datetime
+import queue
+import threading
+from datetime import datetime, timedelta
 from pathlib import Path
-import time
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import Select
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.chrome.service import Service
+from urllib.parse import quote
 
 from case_manager import CaseManager, CaseListingChecker
+from ecourts_scraper import CauseListScraper
+from browser_broker import open_scraper
 from pdf_manager import PDFDownloadManager
 from output_manager import OutputManager
+from watchlist import WatchlistMonitor
+from hearing_index import HearingIndex, get_index_path
+from captcha_pool import CaptchaPool, CaptchaPoolLockedError, check_pool_lock
+from metrics import metrics
+from scraper_errors import ECourtsError
+from single_flight import SingleFlight
+from serialization import dumps, dumps_bytes, loads
+
+class FastJSONProvider(JSONProvider):
+    """jsonify and request parsing through the shared serialization layer (orjson when installed)"""
+    
+    def dumps(self, obj, **kwargs) -> str:
+        return dumps(obj, pretty='indent' in kwargs)
+    
+    def loads(self, s, **kwargs):
+        return loads(s)
+    
+    def response(self, *args, **kwargs) -> Response:
+        """Compact JSON for machine consumers; indented in debug mode or with ?pretty=1"""
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = self._app.debug or (has_request_context() and request.args.get('pretty') in ('1', 'true'))
+        return self._app.response_class(dumps_bytes(obj, pretty=pretty), mimetype='application/json')
 
 app = Flask(__name__)
+app.json = FastJSONProvider(app)
 CORS(app)
 
 # Create downloads folder if it doesn't exist
 DOWNLOADS_FOLDER = Path('downloads')
 DOWNLOADS_FOLDER.mkdir(exist_ok=True)
 
-ECOURTS_URL = "https://services.ecourts.gov.in/ecourtindia_v6/?p=cause_list/"
+# Client and proxy cache lifetimes (seconds)
+HIERARCHY_CACHE_TTL = 24 * 60 * 60   # states, districts, complexes and courts
+RESULT_CACHE_TTL = 5 * 60            # cause list listing results (watchlist responses always revalidate)
+FILE_CACHE_TTL = 60 * 60             # downloaded PDFs, revalidated with ETag/Last-Modified
+
+# How downloaded files reach the client:
+#   'wsgi'       - send_file through the server's wsgi.file_wrapper (os.sendfile under gunicorn)
+#   'x-sendfile' - hand the file path to Apache/lighttpd in an X-Sendfile header
+#   'x-accel'    - hand an internal URI to nginx in an X-Accel-Redirect header
+FILE_SERVING_MODE = os.environ.get('ECOURTS_FILE_SERVING', 'wsgi')
+X_ACCEL_PREFIX = os.environ.get('ECOURTS_X_ACCEL_PREFIX', '/protected-downloads')
+app.config['USE_X_SENDFILE'] = FILE_SERVING_MODE == 'x-sendfile'
+
+# Seconds between keep-alive comments on idle event streams
+SSE_KEEPALIVE_INTERVAL = 15
+
+# HTTP status for each typed scraping error
+ERROR_STATUS_CODES = {
+    'timeout': 504,
+    'portal_down': 503,
+    'circuit_open': 503,
+    'element_missing': 502,
+    'captcha_rejected': 400,
+    'pdf_absent': 404,
+    'captcha_pool_locked': 503
+}
 
 case_manager = CaseManager()
 listing_checker = CaseListingChecker()
 pdf_manager = PDFDownloadManager()
 output_manager = OutputManager()
 
-def get_chrome_driver():
-    """Initialize and return a Chrome WebDriver instance"""
-    options = webdriver.ChromeOptions()
-    options.add_argument('--start-maximized')
-    options.add_argument('--disable-blink-features=AutomationControlled')
-    options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
+# Loaded on first use, so importing the app (tests, WSGI servers) reads no watchlist and writes no index
+watchlist_monitor = None
+watchlist_monitor_lock = threading.Lock()
+
+# Concurrent identical lookups share one in-flight scrape
+scrape_flight = SingleFlight('scrape_flight')
+
+# Browser sessions holding captchas for batched solving, started on first use;
+# its jobs live in this process, so serve the app from a single worker process
+captcha_pool = None
+captcha_pool_lock = threading.Lock()
+
+def get_captcha_pool() -> CaptchaPool:
+    """Start the captcha pool on first use, raising CaptchaPoolLockedError if another process serves it"""
+    global captcha_pool
+    with captcha_pool_lock:
+        if captcha_pool is None:
+            captcha_pool = CaptchaPool(pdf_manager=pdf_manager)
+        return captcha_pool
+
+def get_watchlist_monitor() -> WatchlistMonitor:
+    """Load the watchlist and its hearing index, kept under the output directory, on first use"""
+    global watchlist_monitor
+    with watchlist_monitor_lock:
+        if watchlist_monitor is None:
+            watchlist_monitor = WatchlistMonitor(
+                case_manager=case_manager, index=HearingIndex(get_index_path(output_manager.output_dir))
+            )
+        return watchlist_monitor
+
+def error_response(error: ECourtsError):
+    """Build a JSON error response for a typed scraping error"""
+    status_code = ERROR_STATUS_CODES.get(error.error_type, 500)
+    return jsonify({'error': str(error), 'error_type': error.error_type}), status_code
+
+def cached_json(payload, max_age: int, public: bool = True):
+    """
+    Build a JSON response with an ETag and Cache-Control, answering 304 when the client copy is current
+    
+    Args:
+        payload: Data to serialize
+        max_age: Seconds clients and proxies may reuse the response; 0 forces revalidation
+        public: Allow shared proxy caches to store the response
+    """
+    response = jsonify(payload)
+    response.add_etag()
+    
+    if max_age > 0:
+        response.cache_control.max_age = max_age
+    else:
+        response.cache_control.no_cache = True
+    
+    if public:
+        response.cache_control.public = True
+    else:
+        response.cache_control.private = True
+    
+    return response.make_conditional(request)
+
+def send_download(filepath: Path):
+    """Send a downloaded file with validators, 304 handling and byte-range support"""
+    if FILE_SERVING_MODE == 'x-accel':
+        # nginx serves the bytes (with its own sendfile, ranges and validators) from an internal location
+        response = Response(mimetype='application/pdf' if filepath.suffix == '.pdf' else 'application/octet-stream')
+        response.headers['X-Accel-Redirect'] = f"{X_ACCEL_PREFIX}/{quote(filepath.name)}"
+        response.headers['Content-Disposition'] = f"attachment; filename*=UTF-8''{quote(filepath.name)}"
+        response.cache_control.max_age = FILE_CACHE_TTL
+        return response
     
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=options)
-    return driver
+    # Absolute, so neither Flask's root path nor an X-Sendfile server reinterprets it
+    return send_file(
+        filepath.resolve(),
+        as_attachment=True,
+        conditional=True,
+        etag=True,
+        max_age=FILE_CACHE_TTL
+    )
+
+def stream_progress(job):
+    """
+    Run a long job in the background and stream its progress as Server-Sent Events
+    
+    Args:
+        job: Callable taking a progress_callback(event, data) and returning the final result
+    
+    Returns:
+        text/event-stream response ending with a 'complete' or 'error' event
+    """
+    events = queue.Queue()
+    
+    def run():
+        try:
+            result = job(lambda event, data: events.put((event, data)))
+            events.put(('complete', result))
+        except Exception as e:
+            events.put(('error', {'error': str(e)}))
+        finally:
+            events.put(None)
+    
+    threading.Thread(target=run, daemon=True).start()
+    
+    def generate():
+        while True:
+            try:
+                item = events.get(timeout=SSE_KEEPALIVE_INTERVAL)
+            except queue.Empty:
+                yield ": keep-alive\n\n"
+                continue
+            
+            if item is None:
+                break
+            
+            event, data = item
+            yield f"event: {event}\ndata: {dumps(data, lenient=True)}\n\n"
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+def queue_needs_captcha(results: dict) -> dict:
+    """
+    Queue the downloads a batch left without a usable captcha in the captcha pool
+    
+    A captcha code only answers the first submit, so the operator solves the
+    remaining courts' captchas in the captcha grid.
+    """
+    needs_captcha = results.pop('needs_captcha', [])
+    if needs_captcha:
+        try:
+            job_ids = get_captcha_pool().add_jobs(needs_captcha)
+        except CaptchaPoolLockedError as e:
+            results.update(needs_captcha=needs_captcha, captcha_pool_error=str(e))
+            return results
+        results['captcha_jobs'] = [
+            {'court': download['court_name'], 'date': download['date'], 'job_id': job_id}
+            for download, job_id in zip(needs_captcha, job_ids)
+        ]
+    return results
 
 @app.route('/')
 def index():
     """Render the main page"""
     return render_template('index.html')
 
-@app.route('/fetch_dropdowns', methods=['POST'])
+@app.route('/fetch_dropdowns', methods=['GET', 'POST'])
 def fetch_dropdowns():
     """Fetch dropdown data from eCourts website"""
     try:
-        data = request.json
+        # GET lets browsers and proxies cache the hierarchy
+        data = request.args if request.method == 'GET' else request.json
         state = data.get('state')
         district = data.get('district')
         complex_name = data.get('complex')
         
-        driver = get_chrome_driver()
-        driver.get(ECOURTS_URL)
-        
-        # Wait for page to load
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_all_elements_located((By.TAG_NAME, "select"))
-        )
-        
         result = {}
         
         # Fetch states if not provided
         if not state:
-            state_select = Select(driver.find_element(By.ID, "state_code"))
-            states = [option.text for option in state_select.options if option.text != "---Select---"]
-            result['states'] = states
+            cause_list_info = scrape_flight.do(('cause_list_info',), case_manager.get_cause_list_info)
+            result['states'] = cause_list_info.get('states', [])
         
         # Fetch districts if state is provided
         if state and not district:
-            state_select = Select(driver.find_element(By.ID, "state_code"))
-            state_select.select_by_visible_text(state)
-            time.sleep(2)
-            
-            district_select = Select(driver.find_element(By.ID, "district_code"))
-            districts = [option.text for option in district_select.options if option.text != "---Select---"]
-            result['districts'] = districts
+            result['districts'] = scrape_flight.do(
+                ('districts', state), case_manager.get_districts_for_state, state
+            )
         
         # Fetch court complexes if district is provided
         if state and district and not complex_name:
-            state_select = Select(driver.find_element(By.ID, "state_code"))
-            state_select.select_by_visible_text(state)
-            time.sleep(1)
-            
-            district_select = Select(driver.find_element(By.ID, "district_code"))
-            district_select.select_by_visible_text(district)
-            time.sleep(2)
-            
-            complex_select = Select(driver.find_element(By.ID, "court_complex_code"))
-            complexes = [option.text for option in complex_select.options if option.text != "---Select---"]
-            result['complexes'] = complexes
+            result['complexes'] = scrape_flight.do(
+                ('complexes', state, district), case_manager.get_complexes_for_district, state, district
+            )
         
         # Fetch court names if complex is provided
         if state and district and complex_name:
-            state_select = Select(driver.find_element(By.ID, "state_code"))
-            state_select.select_by_visible_text(state)
-            time.sleep(1)
-            
-            district_select = Select(driver.find_element(By.ID, "district_code"))
-            district_select.select_by_visible_text(district)
-            time.sleep(1)
-            
-            complex_select = Select(driver.find_element(By.ID, "court_complex_code"))
-            complex_select.select_by_visible_text(complex_name)
-            time.sleep(2)
-            
-            court_select = Select(driver.find_element(By.ID, "court_name_code"))
-            courts = [option.text for option in court_select.options if option.text != "---Select---"]
-            result['courts'] = courts
+            result['courts'] = scrape_flight.do(
+                ('courts', state, district, complex_name),
+                case_manager.get_courts_for_complex, state, district, complex_name
+            )
+        
+        if request.method == 'GET':
+            # Don't let clients hold on to an empty list from a failed scrape
+            return cached_json(result, HIERARCHY_CACHE_TTL if all(result.values()) else 0)
         
-        driver.quit()
         return jsonify(result)
     
     except Exception as e:
@@ -128,24 +273,9 @@ def fetch_dropdowns():
 def get_captcha():
     """Fetch captcha image from eCourts"""
     try:
-        driver = get_chrome_driver()
-        driver.get(ECOURTS_URL)
-        
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.ID, "captcha_image"))
-        )
-        
-        captcha_img = driver.find_element(By.ID, "captcha_image")
-        captcha_src = captcha_img.get_attribute('src')
+        with open_scraper(CauseListScraper) as scraper:
+            captcha_data = scraper.get_captcha()
         
-        # If it's a data URL, use it directly; otherwise fetch it
-        if captcha_src.startswith('data:'):
-            captcha_data = captcha_src
-        else:
-            response = requests.get(captcha_src)
-            captcha_data = f"data:image/png;base64,{base64.b64encode(response.content).decode()}"
-        
-        driver.quit()
         return jsonify({'captcha': captcha_data})
     
     except Exception as e:
@@ -163,69 +293,18 @@ def download_pdf():
         date = data.get('date')
         captcha = data.get('captcha')
         
-        driver = get_chrome_driver()
-        driver.get(ECOURTS_URL)
-        
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_all_elements_located((By.TAG_NAME, "select"))
+        filepath = pdf_manager.download_case_pdf(
+            state, district, complex_name, court_name, date, captcha, raise_errors=True
         )
         
-        # Select all dropdowns
-        state_select = Select(driver.find_element(By.ID, "state_code"))
-        state_select.select_by_visible_text(state)
-        time.sleep(1)
-        
-        district_select = Select(driver.find_element(By.ID, "district_code"))
-        district_select.select_by_visible_text(district)
-        time.sleep(1)
-        
-        complex_select = Select(driver.find_element(By.ID, "court_complex_code"))
-        complex_select.select_by_visible_text(complex_name)
-        time.sleep(1)
-        
-        court_select = Select(driver.find_element(By.ID, "court_name_code"))
-        court_select.select_by_visible_text(court_name)
-        time.sleep(1)
-        
-        # Enter date
-        date_input = driver.find_element(By.ID, "cause_list_date")
-        date_input.clear()
-        date_input.send_keys(date)
-        
-        # Enter captcha
-        captcha_input = driver.find_element(By.ID, "captcha_code")
-        captcha_input.send_keys(captcha)
-        
-        # Submit form
-        submit_btn = driver.find_element(By.ID, "submit_btn")
-        submit_btn.click()
-        
-        # Wait for PDF to load
-        time.sleep(3)
-        
-        # Get PDF from iframe or new window
-        pdf_data = driver.execute_script("""
-            var iframe = document.querySelector('iframe');
-            if (iframe) {
-                return iframe.src;
-            }
-            return null;
-        """)
-        
-        if pdf_data:
-            pdf_response = requests.get(pdf_data)
-            filename = f"{state}_{district}_{court_name}_{date}.pdf"
-            filepath = DOWNLOADS_FOLDER / filename
-            
-            with open(filepath, 'wb') as f:
-                f.write(pdf_response.content)
-            
-            driver.quit()
-            return jsonify({'success': True, 'filename': filename, 'path': str(filepath)})
+        if filepath:
+            return jsonify({'success': True, 'filename': Path(filepath).name, 'path': filepath})
         
-        driver.quit()
         return jsonify({'error': 'PDF not found'}), 500
     
+    except ECourtsError as e:
+        return error_response(e)
+    
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -240,107 +319,139 @@ def download_all():
         date = data.get('date')
         captcha = data.get('captcha')
         
-        # First, get all court names
-        driver = get_chrome_driver()
-        driver.get(ECOURTS_URL)
-        
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_all_elements_located((By.TAG_NAME, "select"))
+        # One browser session for the whole complex; only the court changes between submits
+        download_results = queue_needs_captcha(
+            pdf_manager.download_today_cause_list(state, district, complex_name, date, captcha)
         )
+        if 'error' in download_results:
+            return jsonify({'error': download_results['error']}), 500
+        
+        results = [
+            {'court': f['court'], 'status': 'success', 'filename': Path(f['path']).name}
+            for f in download_results['files']
+        ] + [
+            {'court': e['court'], 'status': 'failed', 'reason': e['reason']}
+            for e in download_results['errors'] if e.get('error_type') != 'captcha_spent'
+        ] + [
+            {'court': job['court'], 'status': 'queued', 'job_id': job['job_id']}
+            for job in download_results.get('captcha_jobs', [])
+        ]
+        
+        return jsonify({'success': True, 'results': results, 'total': download_results['total'], 'downloaded': download_results['successful']})
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/stream/download_all', methods=['GET'])
+def stream_download_all():
+    """Download PDFs for all courts in a complex, streaming per-court progress"""
+    state = request.args.get('state')
+    district = request.args.get('district')
+    complex_name = request.args.get('complex')
+    date = request.args.get('date')
+    captcha = request.args.get('captcha')
+    
+    if not all([state, district, complex_name, date, captcha]):
+        return jsonify({'error': 'Missing required fields'}), 400
+    
+    return stream_progress(
+        lambda progress_callback: queue_needs_captcha(pdf_manager.download_today_cause_list(
+            state, district, complex_name, date, captcha, progress_callback
+        ))
+    )
+
+@app.route('/api/stream/check_cases', methods=['POST'])
+def stream_check_cases():
+    """Check many cases, streaming per-case progress and ending with the report"""
+    data = request.json
+    cases = data.get('cases', [])
+    
+    if not cases:
+        return jsonify({'error': 'No cases provided'}), 400
+    
+    return stream_progress(
+        lambda progress_callback: listing_checker.generate_report(
+            listing_checker.iter_multiple_cases(cases, progress_callback)
+        )
+    )
+
+@app.route('/api/captcha/batch', methods=['POST'])
+def queue_captcha_batch():
+    """Queue court downloads whose captchas the operator solves in the captcha grid"""
+    try:
+        data = request.json
+        state = data.get('state')
+        district = data.get('district')
+        complex_name = data.get('complex')
+        date = data.get('date')
+        courts = data.get('courts')
         
-        state_select = Select(driver.find_element(By.ID, "state_code"))
-        state_select.select_by_visible_text(state)
-        time.sleep(1)
-        
-        district_select = Select(driver.find_element(By.ID, "district_code"))
-        district_select.select_by_visible_text(district)
-        time.sleep(1)
-        
-        complex_select = Select(driver.find_element(By.ID, "court_complex_code"))
-        complex_select.select_by_visible_text(complex_name)
-        time.sleep(2)
-        
-        court_select = Select(driver.find_element(By.ID, "court_name_code"))
-        courts = [option.text for option in court_select.options if option.text != "---Select---"]
-        
-        driver.quit()
-        
-        # Download PDFs for each court
-        results = []
-        for idx, court in enumerate(courts, 1):
-            try:
-                driver = get_chrome_driver()
-                driver.get(ECOURTS_URL)
-                
-                WebDriverWait(driver, 10).until(
-                    EC.presence_of_all_elements_located((By.TAG_NAME, "select"))
-                )
-                
-                state_select = Select(driver.find_element(By.ID, "state_code"))
-                state_select.select_by_visible_text(state)
-                time.sleep(1)
-                
-                district_select = Select(driver.find_element(By.ID, "district_code"))
-                district_select.select_by_visible_text(district)
-                time.sleep(1)
-                
-                complex_select = Select(driver.find_element(By.ID, "court_complex_code"))
-                complex_select.select_by_visible_text(complex_name)
-                time.sleep(1)
-                
-                court_select = Select(driver.find_element(By.ID, "court_name_code"))
-                court_select.select_by_visible_text(court)
-                time.sleep(1)
-                
-                date_input = driver.find_element(By.ID, "cause_list_date")
-                date_input.clear()
-                date_input.send_keys(date)
-                
-                captcha_input = driver.find_element(By.ID, "captcha_code")
-                captcha_input.send_keys(captcha)
-                
-                submit_btn = driver.find_element(By.ID, "submit_btn")
-                submit_btn.click()
-                
-                time.sleep(3)
-                
-                pdf_data = driver.execute_script("""
-                    var iframe = document.querySelector('iframe');
-                    if (iframe) {
-                        return iframe.src;
-                    }
-                    return null;
-                """)
-                
-                if pdf_data:
-                    pdf_response = requests.get(pdf_data)
-                    filename = f"{state}_{district}_{court}_{date}.pdf"
-                    filepath = DOWNLOADS_FOLDER / filename
-                    
-                    with open(filepath, 'wb') as f:
-                        f.write(pdf_response.content)
-                    
-                    results.append({'court': court, 'status': 'success', 'filename': filename})
-                else:
-                    results.append({'court': court, 'status': 'failed', 'reason': 'PDF not found'})
-                
-                driver.quit()
-            
-            except Exception as e:
-                results.append({'court': court, 'status': 'failed', 'reason': str(e)})
+        if not all([state, district, complex_name, date]):
+            return jsonify({'error': 'Missing required fields'}), 400
         
-        return jsonify({'success': True, 'results': results, 'total': len(courts), 'downloaded': len([r for r in results if r['status'] == 'success'])})
+        if not courts:
+            courts = case_manager.get_courts_for_complex(state, district, complex_name)
+        if not courts:
+            return jsonify({'error': 'No courts found'}), 404
+        
+        job_ids = get_captcha_pool().add_jobs([
+            {'state': state, 'district': district, 'complex_name': complex_name,
+             'court_name': court_name, 'date': date}
+            for court_name in courts
+        ])
+        return jsonify({'success': True, 'job_ids': job_ids})
+    
+    except ECourtsError as e:
+        return error_response(e)
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/captcha/jobs', methods=['GET'])
+def get_captcha_jobs():
+    """Get captcha jobs, with images for those awaiting a solution"""
+    if captcha_pool is None:
+        try:
+            check_pool_lock(pdf_manager.download_dir)
+        except CaptchaPoolLockedError as e:
+            return error_response(e)
+        return jsonify({'success': True, 'jobs': [], 'status': {}})
+    return jsonify({'success': True, 'jobs': captcha_pool.get_jobs(), 'status': captcha_pool.get_status()})
+
+@app.route('/api/captcha/solve', methods=['POST'])
+def solve_captchas():
+    """Dispatch solved captchas to the sessions holding them"""
+    try:
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({'error': 'Expected a JSON object'}), 400
+        
+        solutions = data.get('solutions') or [data]
+        if not isinstance(solutions, list) or not all(
+            isinstance(s, dict) and isinstance(s.get('job_id'), str) and isinstance(s.get('captcha'), str)
+            for s in solutions
+        ):
+            return jsonify({'error': 'Each solution needs a job_id and a captcha string'}), 400
+        
+        if captcha_pool is None:
+            check_pool_lock(pdf_manager.download_dir)
+            return jsonify({'error': 'No captcha jobs queued'}), 404
+        
+        accepted = [s['job_id'] for s in solutions if captcha_pool.solve(s['job_id'], s['captcha'])]
+        rejected = [s['job_id'] for s in solutions if s['job_id'] not in accepted]
+        return jsonify({'success': bool(accepted), 'accepted': accepted, 'rejected': rejected})
+    except ECourtsError as e:
+        return error_response(e)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/file/<filename>')
 def download_file(filename):
     """Download a file from the downloads folder"""
     try:
         filepath = DOWNLOADS_FOLDER / filename
         if filepath.exists():
-            return send_file(filepath, as_attachment=True)
+            return send_download(filepath)
         return jsonify({'error': 'File not found'}), 404
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -356,7 +467,15 @@ def search_case_cnr():
         if not cnr:
             return jsonify({'error': 'CNR not provided'}), 400
         
-        case_info = case_manager.search_case('cnr', cnr=cnr)
+        case_info = scrape_flight.do(
+            ('cnr', cnr.strip().upper()),
+            case_manager.search_case, 'cnr', raise_errors=True, cnr=cnr
+        )
+        
+        if case_info and data.get('changes_only'):
+            case_id = case_manager.get_case_id('cnr', cnr=cnr)
+            delta = case_manager.get_case_delta(case_id, case_info)
+            return jsonify({'success': True, 'delta': delta})
         
         if case_info:
             summary = case_manager.get_case_summary(case_info)
@@ -364,6 +483,9 @@ def search_case_cnr():
         else:
             return jsonify({'error': 'Case not found'}), 404
     
+    except ECourtsError as e:
+        return error_response(e)
+    
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -379,19 +501,32 @@ def search_case_details():
         if not all([case_type, case_number, year]):
             return jsonify({'error': 'Missing required fields'}), 400
         
-        case_info = case_manager.search_case(
+        case_info = scrape_flight.do(
+            ('details', case_type, case_number, year),
+            case_manager.search_case,
             'details',
+            raise_errors=True,
             case_type=case_type,
             case_number=case_number,
             year=year
         )
         
+        if case_info and data.get('changes_only'):
+            case_id = case_manager.get_case_id(
+                'details', case_type=case_type, case_number=case_number, year=year
+            )
+            delta = case_manager.get_case_delta(case_id, case_info)
+            return jsonify({'success': True, 'delta': delta})
+        
         if case_info:
             summary = case_manager.get_case_summary(case_info)
             return jsonify({'success': True, 'data': summary})
         else:
             return jsonify({'error': 'Case not found'}), 404
     
+    except ECourtsError as e:
+        return error_response(e)
+    
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -399,8 +534,9 @@ def search_case_details():
 def get_today_listing():
     """Get today's cause list information"""
     try:
-        cause_list_info = case_manager.get_cause_list_info()
-        return jsonify({'success': True, 'data': cause_list_info})
+        cause_list_info = scrape_flight.do(('cause_list_info',), case_manager.get_cause_list_info)
+        ttl = HIERARCHY_CACHE_TTL if cause_list_info.get('states') else 0
+        return cached_json({'success': True, 'data': cause_list_info}, ttl)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -408,8 +544,115 @@ def get_today_listing():
 def get_tomorrow_listing():
     """Get tomorrow's cause list information"""
     try:
-        cause_list_info = case_manager.get_cause_list_info()
-        return jsonify({'success': True, 'data': cause_list_info})
+        cause_list_info = scrape_flight.do(('cause_list_info',), case_manager.get_cause_list_info)
+        ttl = HIERARCHY_CACHE_TTL if cause_list_info.get('states') else 0
+        return cached_json({'success': True, 'data': cause_list_info}, ttl)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/listing/range', methods=['GET'])
+def get_listing_range():
+    """Get watched cases with a hearing in a date range, grouped by court, without scraping"""
+    try:
+        today = datetime.now().date()
+        if request.args.get('from') or request.args.get('to'):
+            start = datetime.strptime(request.args.get('from', ''), '%d-%m-%Y').date()
+            end = datetime.strptime(request.args.get('to', ''), '%d-%m-%Y').date()
+        else:
+            start = today
+            end = today + timedelta(days=int(request.args.get('days', 7)))
+    except ValueError:
+        return jsonify({'error': 'Use from and to in DD-MM-YYYY format, or a number of days'}), 400
+    
+    try:
+        courts = get_watchlist_monitor().get_hearings(start, end)
+        return cached_json({
+            'success': True,
+            'from': start.strftime('%d-%m-%Y'),
+            'to': end.strftime('%d-%m-%Y'),
+            'total': sum(len(entries) for entries in courts.values()),
+            'courts': courts
+        }, 0, public=False)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/listing/batch', methods=['POST'])
+def check_listing_batch():
+    """Check many cases against their courts' cause lists for a date"""
+    try:
+        data = request.json
+        cases = data.get('cases', [])
+        date = data.get('date')
+        captcha = data.get('captcha')
+        
+        if not cases or not all([date, captcha]):
+            return jsonify({'error': 'Missing required fields'}), 400
+        
+        results = listing_checker.check_cases_by_cause_list(cases, date, captcha)
+        report = listing_checker.generate_report(results)
+        
+        # Courts left without a cause list are solved in the captcha grid; resubmit their cases afterwards
+        needs_captcha = dict.fromkeys(
+            tuple(case[field] for field in ('state', 'district', 'complex_name', 'court_name'))
+            for case, result in zip(cases, results) if result.get('error_type') == 'captcha_spent'
+        )
+        queued = queue_needs_captcha({'needs_captcha': [
+            {'state': state, 'district': district, 'complex_name': complex_name,
+             'court_name': court_name, 'date': date}
+            for state, district, complex_name, court_name in needs_captcha
+        ]})
+        return jsonify({'success': True, 'data': report, 'captcha_jobs': queued.get('captcha_jobs', [])})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/watchlist', methods=['GET'])
+def get_watchlist():
+    """Get the last known listing status of every watched case"""
+    try:
+        statuses = get_watchlist_monitor().get_all_statuses()
+        # Changes with every add or remove, so clients revalidate against the ETag each time
+        return cached_json({'success': True, 'cases': statuses}, 0, public=False)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/watchlist', methods=['POST'])
+def add_to_watchlist():
+    """Add a case to the watchlist"""
+    try:
+        data = request.json
+        search_type = data.get('search_type', 'cnr')
+        params = {key: data.get(key) for key in ('cnr', 'case_type', 'case_number', 'year') if data.get(key)}
+        
+        case_id = get_watchlist_monitor().add_case(search_type, **params)
+        
+        if case_id:
+            return jsonify({'success': True, 'case_id': case_id})
+        else:
+            return jsonify({'error': 'Missing required fields'}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/watchlist/<path:case_id>', methods=['GET'])
+def get_watched_case(case_id):
+    """Get the last known listing status of a watched case"""
+    try:
+        status = get_watchlist_monitor().get_status(case_id)
+        
+        if status:
+            return cached_json({'success': True, 'data': status}, 0, public=False)
+        else:
+            return jsonify({'error': 'Case not in watchlist'}), 404
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/watchlist/<path:case_id>', methods=['DELETE'])
+def remove_from_watchlist(case_id):
+    """Remove a case from the watchlist"""
+    try:
+        if get_watchlist_monitor().remove_case(case_id):
+            return jsonify({'success': True})
+        else:
+            return jsonify({'error': 'Case not in watchlist'}), 404
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -417,8 +660,8 @@ def get_tomorrow_listing():
 def get_districts(state):
     """Get districts for a state"""
     try:
-        districts = case_manager.get_districts_for_state(state)
-        return jsonify({'success': True, 'districts': districts})
+        districts = scrape_flight.do(('districts', state), case_manager.get_districts_for_state, state)
+        return cached_json({'success': True, 'districts': districts}, HIERARCHY_CACHE_TTL if districts else 0)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -426,8 +669,11 @@ def get_districts(state):
 def get_courts(state, district, complex_name):
     """Get courts for a complex"""
     try:
-        courts = case_manager.get_courts_for_complex(state, district, complex_name)
-        return jsonify({'success': True, 'courts': courts})
+        courts = scrape_flight.do(
+            ('courts', state, district, complex_name),
+            case_manager.get_courts_for_complex, state, district, complex_name
+        )
+        return cached_json({'success': True, 'courts': courts}, HIERARCHY_CACHE_TTL if courts else 0)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -447,7 +693,7 @@ def download_pdf_api():
             return jsonify({'error': 'Missing required fields'}), 400
         
         filepath = pdf_manager.download_case_pdf(
-            state, district, complex_name, court_name, date, captcha
+            state, district, complex_name, court_name, date, captcha, raise_errors=True
         )
         
         if filepath:
@@ -455,6 +701,9 @@ def download_pdf_api():
         else:
             return jsonify({'error': 'Failed to download PDF'}), 500
     
+    except ECourtsError as e:
+        return error_response(e)
+    
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -472,9 +721,9 @@ def download_causelist_api():
         if not all([state, district, complex_name, date, captcha]):
             return jsonify({'error': 'Missing required fields'}), 400
         
-        results = pdf_manager.download_today_cause_list(
+        results = queue_needs_captcha(pdf_manager.download_today_cause_list(
             state, district, complex_name, date, captcha
-        )
+        ))
         
         return jsonify({'success': True, 'data': results})
     
@@ -486,7 +735,7 @@ def get_results_history():
     """Get history of downloaded files"""
     try:
         history = pdf_manager.get_download_history()
-        return jsonify({'success': True, 'files': history})
+        return cached_json({'success': True, 'files': history}, 0, public=False)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -519,13 +768,49 @@ def export_results():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/results/files', methods=['GET'])
+def list_result_files():
+    """List saved results and reports"""
+    try:
+        return cached_json({'success': True, 'files': output_manager.get_output_files()}, 0, public=False)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/results/files/<filename>', methods=['GET'])
+def get_result_file(filename):
+    """Read a saved result, decompressing it on the fly; ?format=text renders the text view"""
+    try:
+        filepath = output_manager.find_output_file(filename)
+        if filepath is None:
+            return jsonify({'error': 'File not found'}), 404
+        
+        if request.args.get('format') == 'text':
+            response = Response(output_manager.render_text(filepath.name), mimetype='text/plain')
+        else:
+            name = filepath.stem if filepath.suffix in ('.gz', '.zst') else filepath.name
+            mimetype = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+            if filepath.suffix == '.gz' and 'gzip' in request.accept_encodings:
+                # Clients that accept gzip get the stored bytes as they are
+                response = Response(filepath.read_bytes(), mimetype=mimetype)
+                response.headers['Content-Encoding'] = 'gzip'
+            else:
+                response = Response(output_manager.read_output(filepath.name), mimetype=mimetype)
+        
+        response.vary.add('Accept-Encoding')
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+        response.add_etag()
+        return response.make_conditional(request)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/file/<filename>')
 def download_file_api(filename):
     """Download a file"""
     try:
         filepath = DOWNLOADS_FOLDER / filename
         if filepath.exists():
-            return send_file(filepath, as_attachment=True)
+            return send_download(filepath)
         return jsonify({'error': 'File not found'}), 404
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -539,5 +824,12 @@ def health_check():
         'version': '1.0.0'
     })
 
+@app.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    """Get scraper and portal traffic metrics"""
+    data = metrics.get_metrics()
+    data['single_flight'] = scrape_flight.get_stats()
+    return jsonify(data)
+
 if __name__ == '__main__':
     app.run(debug=True, port=5000)
@@ -0,0 +1,188 @@
+"""
+File Serving Benchmark
+Compares throughput of the app's download route against a Python-streamed download with concurrent clients
+"""
+
+import os
+import sys
+import argparse
+import logging
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from flask import Flask, Response
+from werkzeug.serving import make_server
+
+CHUNK_SIZE = 64 * 1024
+BENCH_FILENAME = 'bench_cause_list.pdf'
+
+
+def create_app() -> Flask:
+    """
+    The real web app, plus one Python-streamed route as the baseline
+    
+    /file/<name> is app.py's download route (send_download, in the mode set
+    by ECOURTS_FILE_SERVING); /stream/<name> reads and yields chunks in
+    Python, as a hand-written download view would. Import from the
+    benchmark's working directory, where app.py creates downloads/.
+    """
+    import app as web
+    
+    def stream(filename):
+        filepath = web.DOWNLOADS_FOLDER / filename
+        
+        def generate():
+            with open(filepath, 'rb') as f:
+                while True:
+                    chunk = f.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    yield chunk
+        return Response(generate(), mimetype='application/pdf',
+                        headers={'Content-Length': str(filepath.stat().st_size)})
+    
+    if 'bench_stream' not in web.app.view_functions:
+        web.app.add_url_rule('/stream/<filename>', 'bench_stream', stream)
+    return web.app
+
+
+def show_offload_headers():
+    """Headers the download route returns when a front-end server sends the bytes"""
+    import app as web
+    
+    client = web.app.test_client()
+    for mode in ('x-sendfile', 'x-accel'):
+        web.FILE_SERVING_MODE = mode
+        web.app.config['USE_X_SENDFILE'] = mode == 'x-sendfile'
+        response = client.get(f'/file/{BENCH_FILENAME}')
+        headers = {name: value for name, value in response.headers.items()
+                   if name in ('X-Sendfile', 'X-Accel-Redirect', 'Content-Disposition', 'Content-Length')}
+        print(f"{mode:<11} {response.status_code} body={len(response.data)} bytes {headers}")
+        response.close()
+    
+    web.FILE_SERVING_MODE = 'wsgi'
+    web.app.config['USE_X_SENDFILE'] = False
+
+
+def start_werkzeug(port: int):
+    """Threaded development server; returns a stop function"""
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)
+    server = make_server('127.0.0.1', port, create_app(), threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server.shutdown
+
+
+def start_gunicorn(port: int, workers: int):
+    """gunicorn with sync workers in the current directory; returns a stop function, or None when it is not installed"""
+    if not shutil.which('gunicorn'):
+        return None
+    
+    process = subprocess.Popen(
+        ['gunicorn', '-w', str(workers), '-b', f'127.0.0.1:{port}', '--log-level', 'warning',
+         'bench_file_serving:create_app()'],
+        env=dict(os.environ, ECOURTS_FILE_SERVING='wsgi',
+                 PYTHONPATH=os.pathsep.join([os.path.dirname(os.path.abspath(__file__)), ROOT]))
+    )
+    
+    # Wait for the socket to accept connections
+    for _ in range(50):
+        try:
+            urllib.request.urlopen(f'http://127.0.0.1:{port}/file/{BENCH_FILENAME}', timeout=1).read(1)
+            break
+        except OSError:
+            time.sleep(0.2)
+    
+    def stop():
+        process.terminate()
+        process.wait(timeout=10)
+    return stop
+
+
+def fetch(url: str) -> int:
+    """Download a URL fully and return the bytes received"""
+    received = 0
+    with urllib.request.urlopen(url) as response:
+        while True:
+            chunk = response.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            received += len(chunk)
+    return received
+
+
+def measure(base_url: str, path: str, clients: int, requests: int) -> dict:
+    """
+    Fetch a route with concurrent clients
+    
+    Returns:
+        Wall time and MB/s
+    """
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        total = sum(executor.map(fetch, [f'{base_url}{path}'] * requests))
+    elapsed = time.perf_counter() - started
+    return {
+        'route': path,
+        'seconds': elapsed,
+        'mb_per_second': total / elapsed / (1024 * 1024),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark download serving paths')
+    parser.add_argument('--size-mb', type=int, default=50, help='Size of the served file (default: 50)')
+    parser.add_argument('--clients', type=int, default=8, help='Concurrent clients (default: 8)')
+    parser.add_argument('--requests', type=int, default=32, help='Downloads per route (default: 32)')
+    parser.add_argument('--workers', type=int, default=4, help='gunicorn workers (default: 4)')
+    parser.add_argument('--port', type=int, default=8765, help='Port for the servers (default: 8765)')
+    args = parser.parse_args()
+    
+    # app.py keeps its downloads, results and snapshots relative to the working directory
+    work_dir = tempfile.mkdtemp(prefix='bench-file-serving-')
+    os.chdir(work_dir)
+    os.environ['ECOURTS_FILE_SERVING'] = 'wsgi'
+    os.makedirs('downloads', exist_ok=True)
+    with open(os.path.join('downloads', BENCH_FILENAME), 'wb') as f:
+        block = os.urandom(1024 * 1024)
+        for _ in range(args.size_mb):
+            f.write(block)
+    
+    servers = [('werkzeug', lambda: start_werkzeug(args.port)),
+               ('gunicorn', lambda: start_gunicorn(args.port + 1, args.workers))]
+    
+    try:
+        # Add the baseline route before any request reaches the app
+        create_app()
+        print("Offload modes (the front-end server sends the file):")
+        show_offload_headers()
+        print()
+        
+        print(f"{'Server':<10} {'Route':<28} {'Seconds':>9} {'MB/s':>9}")
+        for offset, (name, start) in enumerate(servers):
+            stop = start()
+            if stop is None:
+                print(f"{name:<10} skipped (not installed)")
+                continue
+            try:
+                base_url = f'http://127.0.0.1:{args.port + offset}'
+                for path in (f'/stream/{BENCH_FILENAME}', f'/file/{BENCH_FILENAME}'):
+                    result = measure(base_url, path, args.clients, args.requests)
+                    print(f"{name:<10} {result['route']:<28} {result['seconds']:>9.2f} "
+                          f"{result['mb_per_second']:>9.1f}")
+            finally:
+                stop()
+    finally:
+        os.chdir(ROOT)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Import Time Benchmark
+Measures cold CLI startup with `python -X importtime` and checks that heavy dependencies stay lazy
+"""
+
+import os
+import sys
+import argparse
+import statistics
+import subprocess
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Loaded only when a browser, HTTP fetch, HTML parse or PDF read actually happens
+LAZY_MODULES = ('selenium', 'webdriver_manager', 'requests', 'bs4', 'pypdf')
+
+
+def import_profile(module: str) -> dict:
+    """
+    Import a module in a fresh interpreter under -X importtime
+    
+    Returns:
+        Cumulative microseconds per imported module and the import's own total
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative_us, name = line.split('|')
+        cumulative[name.strip()] = int(cumulative_us)
+    
+    return {'modules': cumulative, 'total_us': cumulative.get(module, 0)}
+
+
+def help_seconds() -> float:
+    """Wall time of `cli.py --help`, including interpreter startup"""
+    started = time.perf_counter()
+    subprocess.run([sys.executable, 'cli.py', '--help'], cwd=ROOT, capture_output=True, check=True)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark cold CLI import time')
+    parser.add_argument('--module', type=str, default='cli', help='Module to import (default: cli)')
+    parser.add_argument('--runs', type=int, default=5, help='Fresh interpreters to measure (default: 5)')
+    parser.add_argument('--top', type=int, default=10, help='Slowest imports to list (default: 10)')
+    parser.add_argument('--max-ms', type=float, help='Exit non-zero if the median import exceeds this')
+    args = parser.parse_args()
+    
+    profiles = [import_profile(args.module) for _ in range(args.runs)]
+    totals_ms = [profile['total_us'] / 1000 for profile in profiles]
+    help_times = [help_seconds() for _ in range(args.runs)]
+    
+    median_ms = statistics.median(totals_ms)
+    print(f"import {args.module}: median {median_ms:.1f} ms (min {min(totals_ms):.1f}, max {max(totals_ms):.1f})")
+    print(f"cli.py --help: median {statistics.median(help_times) * 1000:.1f} ms wall time")
+    
+    modules = profiles[-1]['modules']
+    print("\nSlowest imports (cumulative ms, last run):")
+    slowest = sorted(((us, name) for name, us in modules.items() if name != args.module), reverse=True)
+    for us, name in slowest[:args.top]:
+        print(f"  {us / 1000:>8.1f}  {name}")
+    
+    eager = [name for name in LAZY_MODULES if name in modules]
+    if eager:
+        print(f"\n[!] Loaded at import time: {', '.join(eager)}")
+    else:
+        print(f"\n[+] None of {', '.join(LAZY_MODULES)} loaded at import time")
+    
+    if eager or (args.max_ms is not None and median_ms > args.max_ms):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+JSON Serialization Benchmark
+Compares encoding large case reports with the stdlib json module against the serialization layer's backends
+"""
+
+import os
+import sys
+import argparse
+import json
+import statistics
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from serialization import dumps_bytes, orjson
+from report_aggregator import ReportAggregator
+
+COURTS = ('Principal District Judge', 'Chief Judicial Magistrate', 'Civil Judge Senior Division',
+          'Additional Sessions Judge', 'Family Court')
+
+
+def make_report(count: int) -> dict:
+    """A generate_report-shaped report over count case summaries"""
+    cases = []
+    for i in range(count):
+        listed = i % 3
+        cases.append({
+            'case_details': {
+                'cnr_number': f'MHAU01{i:010d}',
+                'case_type': 'CR',
+                'case_number': str(i),
+                'petitioner': f'Petitioner {i} and others',
+                'respondent': 'State of Maharashtra',
+                'cause_list_entry': f'{i % 200 + 1}. CR/{i}/2024 Petitioner {i} vs State of Maharashtra',
+            },
+            'listing_status': {
+                'is_listed': listed < 2,
+                'listed_date': '2024-05-01' if listed < 2 else None,
+                'days_until_listing': listed if listed < 2 else None,
+                'status_message': ('Case is listed TODAY', 'Case is listed TOMORROW',
+                                   'Case not listed today or tomorrow')[listed],
+                'serial_number': str(i % 200 + 1),
+                'court_name': COURTS[i % len(COURTS)],
+                'hearing_date': '01-05-2024',
+            },
+            'search_timestamp': '2024-05-01T09:30:00',
+            'search_type': 'cause_list'
+        })
+    return ReportAggregator.from_results(cases).report('2024-05-01T09:30:00')
+
+
+def time_call(func, runs: int) -> float:
+    """Median seconds over runs"""
+    times = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - started)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark JSON encoding of large case reports')
+    parser.add_argument('--cases', type=int, default=100_000, help='Cases in the report (default: 100000)')
+    parser.add_argument('--runs', type=int, default=5, help='Encodings per variant (default: 5)')
+    args = parser.parse_args()
+    
+    report = make_report(args.cases)
+    
+    variants = [
+        ('json.dump indent=2 (before)', lambda: json.dumps(report, indent=2, ensure_ascii=False).encode('utf-8')),
+        ('jsonify default (before)', lambda: json.dumps(report, separators=(',', ':'), sort_keys=True).encode('utf-8')),
+        ('json backend, pretty', lambda: dumps_bytes(report, pretty=True, backend='json')),
+        ('json backend, compact', lambda: dumps_bytes(report, backend='json')),
+    ]
+    if orjson is not None:
+        variants += [
+            ('orjson backend, pretty', lambda: dumps_bytes(report, pretty=True, backend='orjson')),
+            ('orjson backend, compact', lambda: dumps_bytes(report, backend='orjson')),
+        ]
+    else:
+        print("orjson is not installed; only the json backend is measured\n")
+    
+    baseline = None
+    print(f"{'Variant':<30} {'ms':>9} {'MB':>7} {'Speedup':>8}")
+    for name, encode in variants:
+        size = len(encode())
+        seconds = time_call(encode, args.runs)
+        baseline = baseline or seconds
+        print(f"{name:<30} {seconds * 1000:>9.1f} {size / (1024 * 1024):>7.1f} {baseline / seconds:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
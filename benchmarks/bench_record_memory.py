@@ -0,0 +1,111 @@
+"""
+Record Memory Benchmark
+Compares memory held by case results as nested dictionaries against the compact record types
+"""
+
+import os
+import sys
+import argparse
+import gc
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from records import CaseResult, ListingStatus
+
+COURTS = ('Principal District Judge', 'Chief Judicial Magistrate', 'Civil Judge Senior Division',
+          'Additional Sessions Judge', 'Family Court')
+
+
+def case_fields(i: int) -> dict:
+    """
+    case_info fields for one case, built from fresh strings as a parsed page would give them
+    
+    Keys are rebuilt per record so the dictionary baseline does not get
+    interning for free from the compiler.
+    """
+    return {
+        ''.join(['cnr', '_number']): f'MHAU01{i:010d}',
+        ''.join(['case', '_type']): 'CR',
+        ''.join(['case', '_number']): str(i),
+        ''.join(['filing', '_date']): '01-04-2024',
+        ''.join(['petitioner']): f'Petitioner {i}',
+        ''.join(['respondent']): 'State of Maharashtra',
+        ''.join(['case', '_status']): 'Pending',
+    }
+
+
+def listing_fields(i: int) -> dict:
+    return {
+        'is_listed': i % 3 == 0,
+        'listed_date': ''.join(['2024-05-', '01']) if i % 3 == 0 else None,
+        'days_until_listing': 0 if i % 3 == 0 else None,
+        'status_message': ''.join(['Case is listed ', 'TODAY']) if i % 3 == 0 else 'Case not listed today or tomorrow',
+        'serial_number': str(i % 200 + 1),
+        'court_name': ''.join([COURTS[i % len(COURTS)]]),
+        'hearing_date': ''.join(['01-05-', '2024']),
+    }
+
+
+def make_dict(i: int) -> dict:
+    return {
+        'case_details': case_fields(i),
+        'listing_status': listing_fields(i),
+        'search_timestamp': '2024-05-01T09:30:00',
+        'search_type': 'cnr'
+    }
+
+
+def make_record(i: int) -> CaseResult:
+    return CaseResult(
+        case_details=case_fields(i),
+        listing_status=ListingStatus(**listing_fields(i)),
+        search_timestamp='2024-05-01T09:30:00',
+        search_type='cnr'
+    )
+
+
+def measure(factory, count: int) -> dict:
+    """
+    Build count results and keep them alive
+    
+    Returns:
+        Bytes allocated with the results held, bytes still allocated once
+        they are dropped (e.g. interned strings), and build time
+    """
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    results = [factory(i) for i in range(count)]
+    elapsed = time.perf_counter() - started
+    current, _ = tracemalloc.get_traced_memory()
+    
+    assert len(results) == count
+    del results
+    gc.collect()
+    kept, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'bytes': current, 'kept': kept, 'seconds': elapsed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark memory held by case result records')
+    parser.add_argument('--count', type=int, default=1_000_000, help='Results to build (default: 1000000)')
+    args = parser.parse_args()
+    
+    assert make_record(1).to_dict() == make_dict(1), 'Compact record does not match the dictionary form'
+    
+    baseline = measure(make_dict, args.count)
+    compact = measure(make_record, args.count)
+    
+    print(f"{'Form':<12} {'MB':>10} {'Bytes/rec':>10} {'Kept MB':>9} {'Build s':>9}")
+    for name, result in (('dict', baseline), ('CaseResult', compact)):
+        print(f"{name:<12} {result['bytes'] / (1024 * 1024):>10.1f} "
+              f"{result['bytes'] / args.count:>10.0f} {result['kept'] / (1024 * 1024):>9.1f} "
+              f"{result['seconds']:>9.2f}")
+    print(f"\nCompact records use {compact['bytes'] / baseline['bytes']:.0%} of the dictionary memory")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,177 @@
+"""
+Portal Stand-in Module
+Local imitation of the eCourts cause list page for benchmarks
+"""
+
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse
+import argparse
+import threading
+import time
+
+# Page weight modelled on the live portal: banners, logos, fonts and stylesheets
+# dwarf the form, the captcha and the cause list PDF we actually need
+ASSETS = {
+    '/images/banner.jpg': ('image/jpeg', 400_000),
+    '/images/emblem.png': ('image/png', 120_000),
+    '/images/footer_logos.png': ('image/png', 180_000),
+    '/images/favicon.ico': ('image/x-icon', 15_000),
+    '/fonts/opensans.woff2': ('font/woff2', 90_000),
+    '/fonts/fontawesome.woff2': ('font/woff2', 110_000),
+    '/css/bootstrap.css': ('text/css', 160_000),
+    '/css/style.css': ('text/css', 40_000),
+    '/js/app.js': ('application/javascript', 2_000),
+    '/securimage/securimage_show.php': ('image/png', 4_000),
+    '/cause_list.pdf': ('application/pdf', 60_000),
+}
+
+FORM_PAGE = """<!DOCTYPE html>
+<html>
+<head>
+<title>eCourts Services</title>
+<link rel="icon" href="/images/favicon.ico">
+<link rel="stylesheet" href="/css/bootstrap.css">
+<link rel="stylesheet" href="/css/style.css">
+<style>
+@font-face { font-family: OpenSans; src: url(/fonts/opensans.woff2); }
+@font-face { font-family: FontAwesome; src: url(/fonts/fontawesome.woff2); }
+body { font-family: OpenSans, FontAwesome, sans-serif; }
+</style>
+<script src="/js/app.js"></script>
+</head>
+<body>
+<img src="/images/banner.jpg" alt="banner">
+<img src="/images/emblem.png" alt="emblem">
+<form id="cause_list_form" onsubmit="return showCauseList();">
+<select id="state_code"><option>---Select---</option><option>Delhi</option></select>
+<select id="district_code"><option>---Select---</option><option>New Delhi</option></select>
+<select id="court_complex_code"><option>---Select---</option><option>Patiala House Court</option></select>
+<select id="court_name_code"><option>---Select---</option><option>Court No. 1</option></select>
+<input id="cause_list_date" type="text">
+<img id="captcha_image" src="/securimage/securimage_show.php" alt="captcha">
+<input id="captcha_code" type="text">
+<button id="submit_btn" type="submit">Submit</button>
+</form>
+<div id="result"></div>
+<img src="/images/footer_logos.png" alt="partners">
+</body>
+</html>
+"""
+
+APP_SCRIPT = """function showCauseList() {
+  document.getElementById('result').innerHTML = '<iframe src="/cause_list.pdf"></iframe>';
+  return false;
+}
+"""
+
+
+def _asset_body(path: str, size: int) -> bytes:
+    """Deterministic filler of the asset's size"""
+    if path == '/js/app.js':
+        return APP_SCRIPT.encode().ljust(size, b' ')
+    if path == '/cause_list.pdf':
+        return b'%PDF-1.4\n' + b'0' * (size - 9)
+    return bytes(i % 251 for i in range(size))
+
+
+class PortalStandin:
+    """Serves the stand-in portal on a local port and counts what it sends"""
+    
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency: float = 0.05):
+        """
+        Args:
+            host: Interface to bind
+            port: Port to bind, 0 for any free port
+            latency: Seconds added to every response to model a remote portal
+        """
+        self.latency = latency
+        self.bodies = {path: (content_type, _asset_body(path, size))
+                       for path, (content_type, size) in ASSETS.items()}
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.bytes_sent = 0
+        self.server = ThreadingHTTPServer((host, port), self._make_handler())
+        self.thread = None
+    
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/ecourtindia_v6/?p=cause_list/"
+    
+    def _make_handler(self):
+        standin = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                time.sleep(standin.latency)
+                path = urlparse(self.path).path
+                if path.startswith('/ecourtindia_v6'):
+                    content_type, body = 'text/html', FORM_PAGE.encode()
+                elif path in standin.bodies:
+                    content_type, body = standin.bodies[path]
+                else:
+                    self.send_error(404)
+                    return
+                
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('Cache-Control', 'no-store')
+                self.end_headers()
+                self.wfile.write(body)
+                standin.record(len(body))
+            
+            def log_message(self, format, *args):
+                pass
+        
+        return Handler
+    
+    def record(self, size: int):
+        """Count one response"""
+        with self.lock:
+            self.requests += 1
+            self.bytes_sent += size
+    
+    def reset_counters(self):
+        """Zero the request and byte counters"""
+        with self.lock:
+            self.requests = 0
+            self.bytes_sent = 0
+    
+    def start(self):
+        """Serve in a background thread"""
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+    
+    def stop(self):
+        """Shut the server down"""
+        self.server.shutdown()
+        self.server.server_close()
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+
+def main():
+    """Run the stand-in portal until interrupted"""
+    parser = argparse.ArgumentParser(description='Local eCourts portal stand-in')
+    parser.add_argument('--port', type=int, default=8765, help='Port to serve on (default: 8765)')
+    parser.add_argument('--latency', type=float, default=0.05, help='Seconds added per response (default: 0.05)')
+    args = parser.parse_args()
+    
+    standin = PortalStandin(port=args.port, latency=args.latency)
+    print(f"Serving portal stand-in at {standin.url}")
+    try:
+        standin.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        standin.server.server_close()
+
+
+if __name__ == '__main__':
+    main()
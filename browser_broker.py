@@ -0,0 +1,382 @@
+"""
+Browser Broker Module
+Runs a fixed pool of warm browsers in one process and serves scraping jobs over a local socket
+"""
+
+from ecourts_scraper import ECourtsDriver, CauseListScraper, CaseSearchScraper, CauseListDownloader
+from scraper_errors import (
+    ECourtsError, PortalTimeoutError, ElementMissingError, CaptchaRejectedError,
+    PDFNotFoundError, PortalUnavailableError, CircuitOpenError
+)
+from metrics import metrics
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Listener, Client
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Optional, Tuple, Union
+import argparse
+import base64
+import json
+import logging
+import os
+import queue
+import secrets
+import stat
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Address of a running broker as "host:port" or a Unix socket path
+BROKER_ADDRESS_ENV = 'ECOURTS_BROKER'
+BROKER_AUTHKEY_ENV = 'ECOURTS_BROKER_AUTHKEY'
+DEFAULT_BROKER_ADDRESS = '127.0.0.1:6010'
+
+# Without ECOURTS_BROKER_AUTHKEY, brokers, daemons and their clients share a
+# random key generated once per user in this 0600 file
+AUTHKEY_FILE = Path(os.environ.get('XDG_CONFIG_HOME') or Path.home() / '.config') / 'ecourts' / 'authkey'
+
+# Seconds a client waits for a job result
+JOB_TIMEOUT = 600
+
+SCRAPER_CLASSES = {
+    'CauseListScraper': CauseListScraper,
+    'CaseSearchScraper': CaseSearchScraper,
+    'CauseListDownloader': CauseListDownloader,
+}
+
+# Typed errors rebuilt on the client from the error_type sent by the broker
+ERROR_CLASSES = {
+    error_class.error_type: error_class
+    for error_class in (ECourtsError, PortalTimeoutError, ElementMissingError, CaptchaRejectedError,
+                        PDFNotFoundError, PortalUnavailableError, CircuitOpenError)
+}
+
+_configured_address = None
+_configured_pool = None
+
+
+def configure_broker(address: Optional[str]):
+    """Route scrapers opened with open_scraper through the broker at address"""
+    global _configured_address
+    _configured_address = address
+
+
+def configure_pool(pool: Optional['BrowserPool']):
+    """Run scrapers opened with open_scraper on browsers leased from an in-process pool"""
+    global _configured_pool
+    _configured_pool = pool
+
+
+def get_broker_address() -> Optional[str]:
+    """Get the configured broker address, if any"""
+    return _configured_address or os.environ.get(BROKER_ADDRESS_ENV)
+
+
+def parse_address(address: str) -> Union[str, Tuple[str, int]]:
+    """Convert "host:port" to a TCP address; anything else is a Unix socket path"""
+    host, sep, port = address.rpartition(':')
+    if sep and port.isdigit() and '/' not in address:
+        return (host or '127.0.0.1', int(port))
+    return address
+
+
+def ensure_private_dir(path: Path) -> Path:
+    """
+    Create a directory only this user can use, or check an existing one
+    
+    Raises:
+        PermissionError: The directory belongs to another user or is open to others
+    """
+    path.mkdir(mode=0o700, parents=True, exist_ok=True)
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise PermissionError(f"{path} must be a directory owned by this user with mode 0700")
+    return path
+
+
+def get_authkey() -> bytes:
+    """
+    Shared secret for broker and CLI daemon connections
+    
+    ECOURTS_BROKER_AUTHKEY when set (needed when clients run as another user
+    or on another host); otherwise a random per-user key, created on first use.
+    """
+    if os.environ.get(BROKER_AUTHKEY_ENV):
+        return os.environ[BROKER_AUTHKEY_ENV].encode()
+    
+    ensure_private_dir(AUTHKEY_FILE.parent)
+    try:
+        fd = os.open(AUTHKEY_FILE, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        pass
+    else:
+        with os.fdopen(fd, 'w') as f:
+            f.write(secrets.token_hex(32))
+    
+    info = os.lstat(AUTHKEY_FILE)
+    if not stat.S_ISREG(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise PermissionError(f"{AUTHKEY_FILE} must be a file owned by this user with mode 0600")
+    key = AUTHKEY_FILE.read_text().strip()
+    if not key:
+        raise PermissionError(f"{AUTHKEY_FILE} is empty")
+    return key.encode()
+
+
+def send_json(conn, message):
+    """Send a message as JSON over a multiprocessing connection"""
+    conn.send_bytes(json.dumps(message).encode('utf-8'))
+
+
+def recv_json(conn):
+    """Receive a JSON message; conn.recv() would unpickle whatever the peer sends"""
+    return json.loads(conn.recv_bytes().decode('utf-8'))
+
+
+class BrowserPool:
+    """A fixed set of warm browsers lent out one job at a time"""
+    
+    def __init__(self, size: int = 2):
+        self.size = size
+        self.drivers = queue.Queue()
+        
+        for _ in range(size):
+            driver_manager = ECourtsDriver()
+            driver_manager.initialize()
+            self.drivers.put(driver_manager)
+        
+        metrics.set_gauge('browser_pool_size', size)
+        metrics.set_gauge('browser_pool_idle', size)
+        logger.info(f"Browser pool ready with {size} browsers")
+    
+    @contextmanager
+    def lease(self, timeout: Optional[float] = None):
+        """
+        Borrow a browser for one job
+        
+        Args:
+            timeout: Seconds to wait for a free browser, or None to wait indefinitely
+        
+        Yields:
+            ECourtsDriver with a running browser
+        """
+        try:
+            driver_manager = self.drivers.get(timeout=timeout)
+        except queue.Empty:
+            raise PortalUnavailableError("No browser available in pool")
+        
+        metrics.set_gauge('browser_pool_idle', self.drivers.qsize())
+        try:
+            yield driver_manager
+        finally:
+            # Replace browsers that crashed during the job
+            if not driver_manager.is_alive():
+                logger.warning("Replacing dead browser in pool")
+                metrics.increment('browser_pool_replacements_total')
+                try:
+                    driver_manager.quit()
+                except Exception:
+                    pass
+                driver_manager = ECourtsDriver()
+                driver_manager.initialize()
+            
+            self.drivers.put(driver_manager)
+            metrics.set_gauge('browser_pool_idle', self.drivers.qsize())
+    
+    def run_job(self, scraper_name: str, method: str, *args, **kwargs) -> Any:
+        """
+        Run a scraper method on a pooled browser
+        
+        Args:
+            scraper_name: Name of a class in SCRAPER_CLASSES
+            method: Public method of that class
+        
+        Returns:
+            The method's return value
+        """
+        scraper_class = SCRAPER_CLASSES.get(scraper_name)
+        if scraper_class is None or method.startswith('_') or not hasattr(scraper_class, method):
+            raise ECourtsError(f"Unknown scraping job: {scraper_name}.{method}")
+        
+        with self.lease() as driver_manager:
+            with scraper_class(driver_manager=driver_manager) as scraper:
+                return getattr(scraper, method)(*args, **kwargs)
+    
+    def close(self):
+        """Quit every pooled browser"""
+        while not self.drivers.empty():
+            self.drivers.get_nowait().quit()
+        logger.info("Browser pool closed")
+
+
+class BrowserBroker:
+    """Serves scraping jobs from other processes on a pool of warm browsers"""
+    
+    def __init__(self, pool: BrowserPool, address: str = DEFAULT_BROKER_ADDRESS):
+        self.pool = pool
+        self.address = address
+        self.listener = None
+    
+    def serve_forever(self):
+        """Accept client connections until interrupted"""
+        authkey = get_authkey()
+        self.listener = Listener(parse_address(self.address), authkey=authkey)
+        if os.environ.get(BROKER_AUTHKEY_ENV):
+            logger.info(f"Browser broker listening on {self.address}")
+        else:
+            logger.info(f"Browser broker listening on {self.address} with the key in {AUTHKEY_FILE}")
+        
+        try:
+            while True:
+                try:
+                    conn = self.listener.accept()
+                except Exception as e:
+                    logger.error(f"Error accepting broker connection: {e}")
+                    continue
+                threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+        finally:
+            self.listener.close()
+    
+    def _handle(self, conn):
+        """Run jobs sent on one connection"""
+        try:
+            while True:
+                try:
+                    request = recv_json(conn)
+                    scraper_name, method = str(request['scraper']), str(request['method'])
+                    args, kwargs = list(request.get('args', [])), dict(request.get('kwargs', {}))
+                except EOFError:
+                    break
+                except (ValueError, KeyError, TypeError) as e:
+                    logger.warning(f"Malformed broker request: {e}")
+                    break
+                
+                metrics.increment('broker_jobs_total')
+                try:
+                    result = self.pool.run_job(scraper_name, method, *args, **kwargs)
+                    if isinstance(result, bytes):
+                        # PDF contents; JSON has no bytes type
+                        send_json(conn, {'status': 'ok', 'base64': base64.b64encode(result).decode('ascii')})
+                    else:
+                        send_json(conn, {'status': 'ok', 'result': result})
+                except ECourtsError as e:
+                    metrics.increment('broker_job_errors_total')
+                    send_json(conn, {'status': 'error', 'error_type': e.error_type, 'message': str(e)})
+                except Exception as e:
+                    logger.error(f"Broker job {scraper_name}.{method} failed: {e}")
+                    metrics.increment('broker_job_errors_total')
+                    send_json(conn, {'status': 'error', 'error_type': 'error', 'message': str(e)})
+        except (OSError, EOFError) as e:
+            logger.warning(f"Broker client disconnected: {e}")
+        finally:
+            conn.close()
+
+
+class BrokerClient:
+    """Sends scraping jobs to a browser broker"""
+    
+    def __init__(self, address: Optional[str] = None):
+        self.address = address or get_broker_address() or DEFAULT_BROKER_ADDRESS
+    
+    def call(self, scraper_name: str, method: str, *args, **kwargs) -> Any:
+        """
+        Run a scraper method in the broker
+        
+        Returns:
+            The method's return value
+        
+        Raises:
+            ECourtsError: The job's typed error, or PortalUnavailableError if the broker is unreachable
+        """
+        try:
+            conn = Client(parse_address(self.address), authkey=get_authkey())
+        except (OSError, AuthenticationError) as e:
+            raise PortalUnavailableError(f"Browser broker unavailable at {self.address}: {e}")
+        
+        try:
+            send_json(conn, {'scraper': scraper_name, 'method': method, 'args': args, 'kwargs': kwargs})
+            if not conn.poll(JOB_TIMEOUT):
+                raise PortalUnavailableError(f"Browser broker job {scraper_name}.{method} timed out")
+            response = recv_json(conn)
+        except TypeError as e:
+            raise ECourtsError(f"Arguments to {scraper_name}.{method} cannot be sent to the broker: {e}")
+        except (EOFError, OSError, ValueError) as e:
+            raise PortalUnavailableError(f"Browser broker connection lost: {e}")
+        finally:
+            conn.close()
+        
+        if response.get('status') == 'error':
+            raise ERROR_CLASSES.get(response.get('error_type'), ECourtsError)(response.get('message', ''))
+        if 'base64' in response:
+            return base64.b64decode(response['base64'])
+        return response.get('result')
+
+
+@contextmanager
+def _pooled_scraper(pool: BrowserPool, scraper_class):
+    """Hold one pooled browser for the whole with-block"""
+    with pool.lease() as driver_manager:
+        with scraper_class(driver_manager=driver_manager) as scraper:
+            yield scraper
+
+
+class RemoteScraper:
+    """Stand-in for a scraper whose methods run in the browser broker"""
+    
+    def __init__(self, scraper_name: str, client: BrokerClient):
+        self.scraper_name = scraper_name
+        self.client = client
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+    
+    def __getattr__(self, method: str):
+        if method.startswith('_'):
+            raise AttributeError(method)
+        
+        def remote_method(*args, **kwargs):
+            return self.client.call(self.scraper_name, method, *args, **kwargs)
+        
+        return remote_method
+
+
+def open_scraper(scraper_class):
+    """
+    Open a scraper, served by the in-process pool or browser broker when one is configured
+    
+    Args:
+        scraper_class: CauseListScraper, CaseSearchScraper or CauseListDownloader
+    
+    Returns:
+        Context manager yielding an object with the scraper's methods
+    """
+    if _configured_pool is not None:
+        return _pooled_scraper(_configured_pool, scraper_class)
+    
+    address = get_broker_address()
+    if address:
+        return RemoteScraper(scraper_class.__name__, BrokerClient(address))
+    return scraper_class()
+
+
+def main():
+    """Run the browser broker"""
+    parser = argparse.ArgumentParser(description='eCourts browser broker')
+    parser.add_argument('--browsers', type=int, default=2, help='Number of warm browsers (default: 2)')
+    parser.add_argument('--address', type=str, default=os.environ.get(BROKER_ADDRESS_ENV, DEFAULT_BROKER_ADDRESS),
+                        help=f'host:port or Unix socket path (default: {DEFAULT_BROKER_ADDRESS})')
+    args = parser.parse_args()
+    
+    pool = BrowserPool(args.browsers)
+    try:
+        BrowserBroker(pool, args.address).serve_forever()
+    except KeyboardInterrupt:
+        print("\n[!] Broker stopped")
+    finally:
+        pool.close()
+
+
+if __name__ == '__main__':
+    main()
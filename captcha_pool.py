@@ -0,0 +1,322 @@
+"""
+Captcha Pool Module
+Keeps pooled browser sessions loaded with captchas so an operator can solve them in batches
+
+Jobs and the browsers holding their captchas live in the memory of the
+process that started the pool, so the pool must be served by one process.
+The first process to start it takes a lock in the download directory;
+others on the same machine get CaptchaPoolLockedError. Run the web app
+with a single (threaded) worker process when using the captcha grid.
+"""
+
+from ecourts_scraper import CauseListDownloader
+from browser_broker import BrowserPool
+from pdf_manager import PDFDownloadManager
+from scraper_errors import ECourtsError, CaptchaRejectedError, classify_error
+from metrics import metrics
+from collections import OrderedDict
+from typing import Dict, List, Optional
+from datetime import datetime
+from pathlib import Path
+import logging
+import os
+import queue
+import threading
+import time
+import uuid
+
+try:
+    import fcntl
+except ImportError:  # Windows, where the pool is not locked
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+CAPTCHA_POOL_SIZE = int(os.environ.get('CAPTCHA_POOL_SIZE', 3))
+
+# Seconds a loaded captcha is trusted before the form is reloaded with a fresh one
+CAPTCHA_TTL = 240
+
+# Rejected solutions and unsolved reloads allowed per job before it fails
+MAX_CAPTCHA_ATTEMPTS = 3
+MAX_CAPTCHA_RELOADS = 5
+
+# Finished jobs kept for the operator's view
+MAX_FINISHED_JOBS = 200
+
+JOB_FIELDS = ('state', 'district', 'complex_name', 'court_name', 'date')
+
+# Lock file in the download directory held by the process serving the pool
+CAPTCHA_POOL_LOCK = 'captcha_pool.lock'
+
+
+class CaptchaPoolLockedError(ECourtsError):
+    """The captcha pool is served by another process"""
+    
+    error_type = 'captcha_pool_locked'
+
+
+def _claim_pool_lock(lock_path: Path):
+    """
+    Claim the captcha pool for this process
+    
+    Returns:
+        The open lock file, held until it is closed (None where locks are unsupported)
+    """
+    if fcntl is None:
+        return None
+    
+    lock_file = open(lock_path, 'a+')
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        lock_file.seek(0)
+        owner = lock_file.read().strip() or 'another process'
+        lock_file.close()
+        raise CaptchaPoolLockedError(
+            f"The captcha pool is served by process {owner}; run the app with a single worker process"
+        )
+    
+    lock_file.truncate(0)
+    lock_file.write(str(os.getpid()))
+    lock_file.flush()
+    return lock_file
+
+
+def check_pool_lock(download_dir: str):
+    """Raise CaptchaPoolLockedError if another process serves the captcha pool"""
+    lock_file = _claim_pool_lock(Path(download_dir) / CAPTCHA_POOL_LOCK)
+    if lock_file:
+        lock_file.close()
+
+
+class CaptchaJob:
+    """One court download waiting on, or driven by, an operator's captcha solution"""
+    
+    def __init__(self, court: Dict[str, str]):
+        self.job_id = uuid.uuid4().hex[:12]
+        self.court = {field: court[field] for field in JOB_FIELDS}
+        self.status = 'queued'
+        self.captcha = None
+        self.loaded_at = None
+        self.solution = None
+        self.solved = threading.Event()
+        self.attempts = 0
+        self.reloads = 0
+        self.message = None
+        self.error_type = None
+        self.path = None
+        self.created_at = datetime.now().isoformat()
+    
+    @property
+    def finished(self) -> bool:
+        return self.status in ('downloaded', 'failed')
+    
+    def to_dict(self) -> Dict:
+        """Job state for the API; the captcha image is only included while it awaits a solution"""
+        return dict(
+            self.court,
+            job_id=self.job_id,
+            status=self.status,
+            captcha=self.captcha if self.status == 'ready' else None,
+            expires_in=round(max(0, CAPTCHA_TTL - (time.monotonic() - self.loaded_at)))
+            if self.status == 'ready' else None,
+            attempts=self.attempts,
+            message=self.message,
+            error_type=self.error_type,
+            filename=os.path.basename(self.path) if self.path else None,
+            created_at=self.created_at
+        )
+
+
+class CaptchaPool:
+    """
+    Serves queued court downloads from warm browser sessions, one captcha at a time per session
+    
+    Each session thread loads the next queued court's form and captcha as
+    soon as it is free, waits for the operator's solution, submits it on
+    the same page and saves the PDF. Only one process may run a pool, see
+    the module docstring.
+    """
+    
+    def __init__(self, size: int = CAPTCHA_POOL_SIZE, pdf_manager: Optional[PDFDownloadManager] = None):
+        self.size = size
+        self.pdf_manager = pdf_manager or PDFDownloadManager()
+        self.lock_file = _claim_pool_lock(self.pdf_manager.download_dir / CAPTCHA_POOL_LOCK)
+        self.browser_pool = BrowserPool(size)
+        self.jobs: Dict[str, CaptchaJob] = OrderedDict()
+        self.pending = queue.Queue()
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.sessions = [
+            threading.Thread(target=self._session_loop, name=f'captcha-session-{i}', daemon=True)
+            for i in range(size)
+        ]
+        for session in self.sessions:
+            session.start()
+        logger.info(f"Captcha pool ready with {size} sessions")
+    
+    def add_jobs(self, courts: List[Dict[str, str]]) -> List[str]:
+        """
+        Queue court downloads
+        
+        Args:
+            courts: Dictionaries with state, district, complex_name, court_name and date
+        
+        Returns:
+            Job IDs in queue order
+        """
+        jobs = [CaptchaJob(court) for court in courts]
+        with self.lock:
+            for job in jobs:
+                self.jobs[job.job_id] = job
+            self._prune_finished()
+        
+        for job in jobs:
+            self.pending.put(job)
+        metrics.increment('captcha_jobs_total', len(jobs))
+        return [job.job_id for job in jobs]
+    
+    def solve(self, job_id: str, captcha: str) -> bool:
+        """
+        Hand an operator's solution to the session holding the job's captcha
+        
+        Returns:
+            False if the job is unknown or not waiting on a captcha
+        """
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is None or job.status != 'ready' or not captcha:
+                return False
+            job.solution = captcha.strip()
+            job.status = 'submitting'
+        
+        job.solved.set()
+        metrics.increment('captcha_solutions_total')
+        return True
+    
+    def get_jobs(self) -> List[Dict]:
+        """All known jobs, oldest first"""
+        with self.lock:
+            return [job.to_dict() for job in self.jobs.values()]
+    
+    def get_status(self) -> Dict[str, int]:
+        """Number of jobs in each status"""
+        counts = {}
+        with self.lock:
+            for job in self.jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+        return dict(counts, sessions=self.size)
+    
+    def close(self):
+        """Stop the sessions and quit their browsers"""
+        self.stop_event.set()
+        with self.lock:
+            for job in self.jobs.values():
+                job.solved.set()
+        for _ in self.sessions:
+            self.pending.put(None)
+        for session in self.sessions:
+            session.join(timeout=30)
+        self.browser_pool.close()
+        if self.lock_file:
+            self.lock_file.close()
+    
+    def _prune_finished(self):
+        """Forget the oldest finished jobs beyond MAX_FINISHED_JOBS"""
+        finished = [job_id for job_id, job in self.jobs.items() if job.finished]
+        for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self.jobs[job_id]
+    
+    def _session_loop(self):
+        """Work through queued jobs on one leased browser"""
+        while not self.stop_event.is_set():
+            job = self.pending.get()
+            if job is None:
+                break
+            
+            try:
+                with self.browser_pool.lease() as driver_manager:
+                    with CauseListDownloader(driver_manager=driver_manager) as downloader:
+                        self._run_job(downloader, job)
+            except Exception as e:
+                self._fail(job, classify_error(e))
+    
+    def _run_job(self, downloader: CauseListDownloader, job: CaptchaJob):
+        """Load the job's form, wait for its solution and download, reloading on expiry or rejection"""
+        court = job.court
+        
+        while not self.stop_event.is_set():
+            with self.lock:
+                job.status = 'loading'
+                job.solution = None
+            captcha = downloader.load_form(
+                court['state'], court['district'], court['complex_name'], court['court_name'], court['date']
+            )
+            with self.lock:
+                job.captcha = captcha
+                job.loaded_at = time.monotonic()
+                job.solved.clear()
+                job.status = 'ready'
+            
+            if not job.solved.wait(CAPTCHA_TTL):
+                with self.lock:
+                    # solve() may have accepted a solution just as the wait timed out
+                    expired = job.solution is None
+                    if expired:
+                        job.status = 'loading'
+            else:
+                expired = False
+            
+            if expired:
+                with self.lock:
+                    job.reloads += 1
+                    exhausted = job.reloads >= MAX_CAPTCHA_RELOADS
+                    if not exhausted:
+                        job.message = 'Captcha expired, loaded a new one'
+                metrics.increment('captcha_reloads_total')
+                if exhausted:
+                    self._fail(job, ECourtsError("Captcha was not solved in time"), 'expired')
+                    return
+                continue
+            
+            if self.stop_event.is_set():
+                break
+            
+            try:
+                pdf_content = downloader.submit_captcha(job.solution)
+            except CaptchaRejectedError as e:
+                with self.lock:
+                    job.attempts += 1
+                    exhausted = job.attempts >= MAX_CAPTCHA_ATTEMPTS
+                    if not exhausted:
+                        job.message = 'Captcha rejected, try the new one'
+                metrics.increment('captcha_rejections_total')
+                if exhausted:
+                    self._fail(job, e)
+                    return
+                continue
+            
+            filepath = self.pdf_manager.get_pdf_path(
+                court['state'], court['district'], court['court_name'], court['date']
+            )
+            with open(filepath, 'wb') as f:
+                f.write(pdf_content)
+            
+            with self.lock:
+                job.path = str(filepath)
+                job.message = None
+                job.status = 'downloaded'
+            metrics.increment('captcha_jobs_downloaded_total')
+            logger.info(f"Captcha job {job.job_id} downloaded {filepath}")
+            return
+        
+        self._fail(job, ECourtsError("Captcha pool stopped"))
+    
+    def _fail(self, job: CaptchaJob, error: ECourtsError, error_type: Optional[str] = None):
+        with self.lock:
+            job.status = 'failed'
+            job.message = str(error)
+            job.error_type = error_type or error.error_type
+        metrics.increment('captcha_jobs_failed_total')
+        logger.error(f"Captcha job {job.job_id} for {job.court['court_name']} failed ({job.error_type}): {error}")
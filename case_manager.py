@@ -3,36 +3,54 @@ Case Manager Module
 Handles case search, listing checks, and result processing
 """
 
-from ecourts_scraper import CaseSearchScraper, CauseListScraper
+from ecourts_scraper import CaptchaSource, CaseSearchScraper, CauseListScraper
+from browser_broker import open_scraper
+from pdf_manager import PDFDownloadManager
+from snapshot_store import SnapshotStore
+from scraper_errors import ECourtsError
+from records import CaseResult, ListingStatus, intern_value
+from report_aggregator import ReportAggregator
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 import logging
+import re
+import time
 
 logger = logging.getLogger(__name__)
 
+CNR_PATTERN = re.compile(r'\b[A-Z]{4}\d{12}\b')
+CASE_NUMBER_PATTERN = re.compile(r'(\d+)\s*/\s*(\d{4})')
+SERIAL_PATTERN = re.compile(r'^(\d+)[.)]?\s')
+
 
 class CaseManager:
     """Manages case search and listing operations"""
     
-    def __init__(self):
+    def __init__(self, snapshot_store: Optional[SnapshotStore] = None):
         self.case_scraper = None
         self.cause_list_scraper = None
+        self.snapshot_store = snapshot_store
+        self.consumer_stores: Dict[str, SnapshotStore] = {}
     
-    def search_case(self, search_type: str, **kwargs) -> Optional[Dict]:
+    def search_case(self, search_type: str, raise_errors: bool = False, **kwargs) -> Optional[Dict]:
         """
         Search for a case
         
         Args:
             search_type: 'cnr' or 'details'
+            raise_errors: Raise typed scraping errors instead of returning None
             **kwargs: 
                 For CNR: cnr
                 For details: case_type, case_number, year
         
         Returns:
             Dictionary with case information and listing status
+        
+        Raises:
+            ECourtsError: On scraping failure, if raise_errors is set
         """
         try:
-            with CaseSearchScraper() as scraper:
+            with open_scraper(CaseSearchScraper) as scraper:
                 if search_type == 'cnr':
                     cnr = kwargs.get('cnr')
                     if not cnr:
@@ -61,10 +79,69 @@ class CaseManager:
                 
                 return result
         
+        except ECourtsError as e:
+            logger.error(f"Error searching case ({e.error_type}): {e}")
+            if raise_errors:
+                raise
+            return None
+        
         except Exception as e:
             logger.error(f"Error searching case: {e}")
+            if raise_errors:
+                raise ECourtsError(str(e)) from e
             return None
     
+    @staticmethod
+    def get_case_id(search_type: str, **kwargs) -> Optional[str]:
+        """
+        Build a stable identifier for a case from its search parameters
+        
+        Args:
+            search_type: 'cnr' or 'details'
+            **kwargs: Search parameters as accepted by search_case
+        
+        Returns:
+            Case identifier or None if parameters are incomplete
+        """
+        if search_type == 'cnr':
+            cnr = kwargs.get('cnr')
+            return str(cnr).strip().upper() if cnr else None
+        
+        if search_type == 'details':
+            parts = [kwargs.get('case_type'), kwargs.get('case_number'), kwargs.get('year')]
+            if all(parts):
+                return '/'.join(str(part).strip() for part in parts)
+        
+        return None
+    
+    def get_case_delta(self, case_id: str, case_info: Dict, consumer: Optional[str] = None) -> Dict:
+        """
+        Compare a search result against the case's last snapshot
+        
+        Args:
+            case_id: Case identifier from get_case_id
+            case_info: Case information dictionary from search_case
+            consumer: Keep a separate snapshot under this name (e.g. 'watchlist'),
+                      so its refreshes don't use up the changes searches report
+        
+        Returns:
+            Dictionary with changed fields, new hearing date and serial number
+        """
+        if self.snapshot_store is None:
+            self.snapshot_store = SnapshotStore()
+        
+        store = self.snapshot_store
+        if consumer:
+            store = self.consumer_stores.get(consumer)
+            if store is None:
+                store = self.consumer_stores[consumer] = SnapshotStore(self.snapshot_store.snapshot_dir / consumer)
+        
+        delta = store.diff(case_id, case_info)
+        if delta['changed']:
+            delta['listing_status'] = self.check_listing_status(case_info)
+        
+        return delta
+    
     def check_listing_status(self, case_info: Dict) -> Dict:
         """
         Check if case is listed today or tomorrow
@@ -75,36 +152,32 @@ class CaseManager:
         Returns:
             Dictionary with listing status details
         """
-        status = {
-            'is_listed': False,
-            'listed_date': None,
-            'days_until_listing': None,
-            'status_message': 'Case not listed today or tomorrow'
-        }
+        return self.get_listing_record(case_info).to_dict()
+    
+    def get_listing_record(self, case_info: Dict) -> ListingStatus:
+        """
+        Check if case is listed today or tomorrow, as a compact record
+        
+        Args:
+            case_info: Case information dictionary
+        
+        Returns:
+            ListingStatus record that reads like the check_listing_status dictionary
+        """
+        status = ListingStatus()
         
         try:
             if case_info.get('listed_today'):
-                status['is_listed'] = True
-                status['listed_date'] = datetime.now().date().isoformat()
-                status['days_until_listing'] = 0
-                status['status_message'] = 'Case is listed TODAY'
+                status = ListingStatus(True, datetime.now().date().isoformat(), 0, 'Case is listed TODAY')
             
             elif case_info.get('listed_tomorrow'):
-                status['is_listed'] = True
                 tomorrow = datetime.now().date() + timedelta(days=1)
-                status['listed_date'] = tomorrow.isoformat()
-                status['days_until_listing'] = 1
-                status['status_message'] = 'Case is listed TOMORROW'
+                status = ListingStatus(True, tomorrow.isoformat(), 1, 'Case is listed TOMORROW')
             
             # Add additional details if available
-            if case_info.get('serial_number'):
-                status['serial_number'] = case_info['serial_number']
-            
-            if case_info.get('court_name'):
-                status['court_name'] = case_info['court_name']
-            
-            if case_info.get('hearing_date'):
-                status['hearing_date'] = case_info['hearing_date']
+            status.serial_number = case_info.get('serial_number') or None
+            status.court_name = intern_value(case_info.get('court_name') or None)
+            status.hearing_date = intern_value(case_info.get('hearing_date') or None)
         
         except Exception as e:
             logger.error(f"Error checking listing status: {e}")
@@ -121,14 +194,24 @@ class CaseManager:
         Returns:
             Dictionary with formatted case summary
         """
-        summary = {
-            'case_details': case_info.get('case_info', {}),
-            'listing_status': self.check_listing_status(case_info),
-            'search_timestamp': case_info.get('search_timestamp'),
-            'search_type': case_info.get('search_type')
-        }
+        return self.get_case_record(case_info).to_dict()
+    
+    def get_case_record(self, case_info: Dict) -> CaseResult:
+        """
+        Generate a case summary as a compact record
+        
+        Args:
+            case_info: Case information dictionary
         
-        return summary
+        Returns:
+            CaseResult record that reads like the get_case_summary dictionary
+        """
+        return CaseResult(
+            case_details=case_info.get('case_info', {}),
+            listing_status=self.get_listing_record(case_info),
+            search_timestamp=case_info.get('search_timestamp'),
+            search_type=case_info.get('search_type')
+        )
     
     def get_cause_list_info(self) -> Dict:
         """
@@ -138,7 +221,7 @@ class CaseManager:
             Dictionary with states, districts, and courts
         """
         try:
-            with CauseListScraper() as scraper:
+            with open_scraper(CauseListScraper) as scraper:
                 states = scraper.get_states()
                 
                 cause_list_info = {
@@ -157,7 +240,7 @@ class CaseManager:
     def get_districts_for_state(self, state: str) -> List[str]:
         """Get districts for a specific state"""
         try:
-            with CauseListScraper() as scraper:
+            with open_scraper(CauseListScraper) as scraper:
                 districts = scraper.get_districts(state)
                 logger.info(f"Retrieved {len(districts)} districts for {state}")
                 return districts
@@ -165,10 +248,21 @@ class CaseManager:
             logger.error(f"Error getting districts: {e}")
             return []
     
+    def get_complexes_for_district(self, state: str, district: str) -> List[str]:
+        """Get court complexes for a specific district"""
+        try:
+            with open_scraper(CauseListScraper) as scraper:
+                complexes = scraper.get_court_complexes(state, district)
+                logger.info(f"Retrieved {len(complexes)} court complexes for {district}")
+                return complexes
+        except Exception as e:
+            logger.error(f"Error getting court complexes: {e}")
+            return []
+    
     def get_courts_for_complex(self, state: str, district: str, complex_name: str) -> List[str]:
         """Get courts for a specific complex"""
         try:
-            with CauseListScraper() as scraper:
+            with open_scraper(CauseListScraper) as scraper:
                 courts = scraper.get_courts(state, district, complex_name)
                 logger.info(f"Retrieved {len(courts)} courts")
                 return courts
@@ -182,73 +276,263 @@ class CaseListingChecker:
     
     def __init__(self):
         self.case_manager = CaseManager()
+        self.pdf_manager = None
     
-    def check_multiple_cases(self, cases: List[Dict]) -> List[Dict]:
+    def check_multiple_cases(self, cases: List[Dict],
+                             progress_callback: Optional[Callable[[str, Dict], None]] = None,
+                             compact: bool = False) -> List[Union[Dict, CaseResult]]:
         """
         Check listing status for multiple cases
         
         Args:
             cases: List of case dictionaries with search parameters
+            progress_callback: Called as progress_callback(event, data) with
+                               'started', 'checked' and 'failed' events per case
+            compact: Return CaseResult records instead of dictionaries, for
+                     large batches held in memory
         
         Returns:
             List of case results with listing status
         """
-        results = []
+        return list(self.iter_multiple_cases(cases, progress_callback, compact))
+    
+    def iter_multiple_cases(self, cases: Iterable[Dict],
+                            progress_callback: Optional[Callable[[str, Dict], None]] = None,
+                            compact: bool = False) -> Iterator[Union[Dict, CaseResult]]:
+        """
+        Check listing status for cases one at a time, yielding each result as it is ready
         
-        for case in cases:
+        cases may be any iterable, including an unbounded stream; progress
+        events then carry no total or ETA.
+        
+        Args:
+            cases: Iterable of case dictionaries with search parameters
+            progress_callback: As for check_multiple_cases
+            compact: Yield CaseResult records instead of dictionaries
+        """
+        total = len(cases) if hasattr(cases, '__len__') else None
+        started_at = time.monotonic()
+        
+        for idx, case in enumerate(cases, 1):
             search_type = case.get('search_type', 'cnr')
             
-            if search_type == 'cnr':
-                case_info = self.case_manager.search_case('cnr', cnr=case.get('cnr'))
-            else:
-                case_info = self.case_manager.search_case(
-                    'details',
-                    case_type=case.get('case_type'),
-                    case_number=case.get('case_number'),
-                    year=case.get('year')
-                )
+            if progress_callback:
+                progress_callback('started', {'index': idx, 'total': total, 'search_params': case})
             
-            if case_info:
-                summary = self.case_manager.get_case_summary(case_info)
-                results.append(summary)
+            try:
+                if search_type == 'cnr':
+                    case_info = self.case_manager.search_case('cnr', raise_errors=True, cnr=case.get('cnr'))
+                else:
+                    case_info = self.case_manager.search_case(
+                        'details',
+                        raise_errors=True,
+                        case_type=case.get('case_type'),
+                        case_number=case.get('case_number'),
+                        year=case.get('year')
+                    )
+            except ECourtsError as e:
+                case_info = None
+                record = CaseResult.from_error(str(e), case, e.error_type)
             else:
-                results.append({
-                    'error': 'Failed to retrieve case information',
-                    'search_params': case
+                if case_info:
+                    record = self.case_manager.get_case_record(case_info)
+                else:
+                    record = CaseResult.from_error('Failed to retrieve case information', case)
+            
+            result = record.to_dict()
+            
+            if progress_callback:
+                elapsed = time.monotonic() - started_at
+                progress_callback('failed' if 'error' in result else 'checked', {
+                    'index': idx,
+                    'total': total,
+                    'result': result,
+                    'elapsed_seconds': round(elapsed, 1),
+                    'eta_seconds': round(elapsed / idx * (total - idx), 1) if total is not None else None
                 })
+            
+            yield record if compact else result
+    
+    def check_cases_by_cause_list(self, cases: List[Dict], date: str, captcha: CaptchaSource,
+                                  compact: bool = False) -> List[Union[Dict, CaseResult]]:
+        """
+        Check listing status for multiple cases by joining them against cause lists
+        
+        Cases are grouped by court, each court's cause list for the date is
+        downloaded (or reused from the download directory) once, and every
+        case in that court is matched against it in a single pass.
+        
+        A captcha code answers one submit, so with a code rather than a
+        callable only the first missing cause list is downloaded; cases in
+        the other courts come back with error_type 'captcha_spent' and can
+        be checked again once their cause lists are downloaded.
+        
+        Args:
+            cases: List of case dictionaries with search parameters plus
+                   state, district, complex_name and court_name
+            date: Cause list date in DD-MM-YYYY format
+            captcha: Captcha code, or a callable solving each captcha shown
+            compact: Return CaseResult records instead of dictionaries
+        
+        Returns:
+            List of case results with listing status, in input order
+        """
+        if self.pdf_manager is None:
+            self.pdf_manager = PDFDownloadManager()
+        
+        results = [None] * len(cases)
+        courts = {}
+        
+        for idx, case in enumerate(cases):
+            court_key = tuple(case.get(field) for field in ('state', 'district', 'complex_name', 'court_name'))
+            if not all(court_key):
+                results[idx] = CaseResult.from_error('Court not specified for case', case)
+                continue
+            courts.setdefault(court_key, []).append(idx)
+        
+        logger.info(f"Checking {len(cases)} cases against {len(courts)} cause lists")
+        
+        # Download the missing cause lists on one session, sorted so courts of a complex share the form
+        missing = sorted(
+            court_key for court_key in courts
+            if not self.pdf_manager.get_pdf_path(court_key[0], court_key[1], court_key[3], date).exists()
+        )
+        failures = {}
+        
+        def record(event: str, data: Dict):
+            if event == 'failed':
+                failures[missing[data['index'] - 1]] = data
+        
+        if missing:
+            self.pdf_manager.download_multiple_pdfs([
+                {'state': state, 'district': district, 'complex_name': complex_name,
+                 'court_name': court_name, 'date': date, 'captcha': captcha}
+                for state, district, complex_name, court_name in missing
+            ], record)
+        
+        for court_key, indices in courts.items():
+            state, district, complex_name, court_name = court_key
+            filepath = self.pdf_manager.get_pdf_path(state, district, court_name, date)
+            
+            if court_key in failures or not filepath.exists():
+                failure = failures.get(court_key, {})
+                for idx in indices:
+                    results[idx] = CaseResult.from_error(
+                        f"Failed to retrieve cause list: {failure.get('reason', 'no PDF')}",
+                        cases[idx], failure.get('error_type')
+                    )
+                continue
+            
+            try:
+                matches = self._match_cause_list(
+                    [cases[idx] for idx in indices],
+                    self.pdf_manager.iter_pdf_lines(str(filepath))
+                )
+            except Exception as e:
+                logger.error(f"Error reading cause list {filepath}: {e}")
+                for idx in indices:
+                    results[idx] = CaseResult.from_error(f'Failed to read cause list: {e}', cases[idx])
+                continue
+            
+            for position, idx in enumerate(indices):
+                case_info = self._build_listing_case_info(
+                    cases[idx], court_name, date, matches.get(position)
+                )
+                results[idx] = self.case_manager.get_case_record(case_info)
         
-        return results
+        return results if compact else [record.to_dict() for record in results]
     
-    def generate_report(self, results: List[Dict]) -> Dict:
+    def _match_cause_list(self, cases: List[Dict], lines) -> Dict[int, Tuple[Optional[str], str]]:
         """
-        Generate a report from case checking results
+        Match cases against cause list lines in a single pass
         
         Args:
-            results: List of case results
+            cases: Cases listed in one court
+            lines: Iterable of cause list text lines
         
         Returns:
-            Dictionary with report summary
-        """
-        report = {
-            'total_cases_checked': len(results),
-            'cases_listed_today': 0,
-            'cases_listed_tomorrow': 0,
-            'cases_not_listed': 0,
-            'errors': 0,
-            'cases': results,
-            'generated_at': datetime.now().isoformat()
+            Dictionary mapping case position to (serial number, matched line)
+        """
+        by_cnr = {}
+        by_number = {}
+        
+        for position, case in enumerate(cases):
+            if case.get('search_type', 'cnr') == 'cnr':
+                cnr = re.sub(r'[^A-Z0-9]', '', str(case.get('cnr', '')).upper())
+                if cnr:
+                    by_cnr[cnr] = position
+            elif case.get('case_number') and case.get('year'):
+                key = (str(case['case_number']).strip().lstrip('0'), str(case['year']).strip())
+                by_number.setdefault(key, []).append(position)
+        
+        matches = {}
+        serial = None
+        
+        for line in lines:
+            line_upper = line.upper()
+            
+            serial_match = SERIAL_PATTERN.match(line_upper)
+            if serial_match:
+                serial = serial_match.group(1)
+            
+            for cnr in CNR_PATTERN.findall(line_upper):
+                if cnr in by_cnr:
+                    matches.setdefault(by_cnr[cnr], (serial, line))
+            
+            for number, year in CASE_NUMBER_PATTERN.findall(line_upper):
+                for position in by_number.get((number.lstrip('0'), year), []):
+                    # Number and year repeat across case types ("CS 12/2023", "OS 12/2023")
+                    case_type = str(cases[position].get('case_type') or '').strip().upper()
+                    if case_type and not re.search(rf'(?<![A-Z0-9]){re.escape(case_type)}(?![A-Z0-9])', line_upper):
+                        continue
+                    matches.setdefault(position, (serial, line))
+        
+        return matches
+    
+    def _build_listing_case_info(self, case: Dict, court_name: str, date: str,
+                                 match: Optional[Tuple[Optional[str], str]]) -> Dict:
+        """Build a case info dictionary from a cause list match"""
+        case_details = {key: value for key, value in case.items() if key != 'captcha'}
+        case_info = {
+            'case_info': case_details,
+            'listed_today': False,
+            'listed_tomorrow': False,
+            'serial_number': None,
+            'court_name': court_name,
+            'hearing_date': None,
+            'search_timestamp': datetime.now().isoformat(),
+            'search_type': 'cause_list'
         }
         
-        for result in results:
-            if 'error' in result:
-                report['errors'] += 1
-            else:
-                listing_status = result.get('listing_status', {})
-                if listing_status.get('days_until_listing') == 0:
-                    report['cases_listed_today'] += 1
-                elif listing_status.get('days_until_listing') == 1:
-                    report['cases_listed_tomorrow'] += 1
-                else:
-                    report['cases_not_listed'] += 1
+        if match:
+            serial, line = match
+            case_details['cause_list_entry'] = line
+            case_info['serial_number'] = serial
+            case_info['hearing_date'] = date
+            
+            try:
+                listed_date = datetime.strptime(date, '%d-%m-%Y').date()
+                today = datetime.now().date()
+                case_info['listed_today'] = listed_date == today
+                case_info['listed_tomorrow'] = listed_date == today + timedelta(days=1)
+            except ValueError:
+                logger.warning(f"Invalid cause list date: {date}")
         
-        return report
+        return case_info
+    
+    def generate_report(self, results: Iterable[Union[Dict, CaseResult]], keep_cases: bool = True) -> Dict:
+        """
+        Generate a report from case checking results
+        
+        Results are counted in one pass as they are consumed, so results may
+        be the iter_multiple_cases generator itself.
+        
+        Args:
+            results: Iterable of case results, as dictionaries or CaseResult records
+            keep_cases: Include the results under 'cases'; turn off for
+                        unbounded streams so they are not held in memory
+        
+        Returns:
+            Dictionary with report summary and per-court/per-status breakdowns
+        """
+        return ReportAggregator.from_results(results, keep_cases).report()
@@ -0,0 +1,242 @@
+"""
+Cause List Parser Module
+Parses downloaded cause list PDFs into structured JSONL rows
+"""
+
+from pdf_manager import PDFDownloadManager
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import argparse
+import json
+import logging
+import os
+import re
+
+logger = logging.getLogger(__name__)
+
+# A numbered entry: serial, then the case reference, e.g. "12. CS DJ/123/2023 ..." or "2. 45/2020 ..."
+ROW_START_PATTERN = re.compile(r'^(\d{1,5})[.)]?\s+(.*)$')
+# Case types are upper case, so party names ("Mohan 45/2020") are not read as one; some lists omit the type
+CASE_REF_PATTERN = re.compile(
+    r'(?:(?P<case_type>[A-Z][A-Z0-9.()&\- ]{0,40}?)\s*[/\-]?\s*)?'
+    r'(?P<number>\d{1,7})\s*/\s*(?P<year>(?:19|20)\d{2})\b'
+)
+CNR_PATTERN = re.compile(r'\b[A-Z]{4}\d{12}\b')
+VERSUS_PATTERN = re.compile(r'\s+(?:VS\.?|V/S\.?|V\.|VERSUS)\s+', re.IGNORECASE)
+ADVOCATE_PATTERN = re.compile(r'\b(?:ADV(?:OCATE)?S?\.?|COUNSEL)\s*[:.\-]?\s+', re.IGNORECASE)
+INLINE_STAGE_PATTERN = re.compile(r'\b(?:STAGE|PURPOSE)\s*[:\-]\s*(.+)$', re.IGNORECASE)
+COURT_HEADER_PATTERN = re.compile(r'\bCOURT\b.*\b(?:NO\.?|JUDGE|MAGISTRATE)\b', re.IGNORECASE)
+COLUMN_HEADER_PATTERN = re.compile(r'\b(?:SR\.?\s*NO|S\.\s*NO|CASE\s*NO|PARTY\s*NAME)\b', re.IGNORECASE)
+
+# Words that mark a heading line as the hearing stage of the entries below it
+STAGE_KEYWORDS = (
+    'HEARING', 'ARGUMENT', 'EVIDENCE', 'ORDER', 'JUDGMENT', 'JUDGEMENT', 'APPEARANCE', 'ADMISSION',
+    'CHARGE', 'DEFENCE', 'BAIL', 'PLEA', 'SUMMONS', 'NOTICE', 'COMPLIANCE', 'REPLY', 'MISC', 'FRESH',
+)
+
+# Files parsed in parallel by default
+DEFAULT_PARSE_WORKERS = os.cpu_count() or 2
+
+
+def parse_pdf_filename(filepath: str) -> Dict[str, Optional[str]]:
+    """Recover state, district, court and date from a PDFDownloadManager file name"""
+    stem = Path(filepath).stem
+    rest, _, date = stem.rpartition('_')
+    parts = rest.split('_', 2)
+    if len(parts) < 3 or not re.match(r'^\d{2}-\d{2}-\d{4}$', date):
+        return {'state': None, 'district': None, 'court': None, 'date': None}
+    return {'state': parts[0], 'district': parts[1], 'court': parts[2], 'date': date}
+
+
+class CauseListParser:
+    """Turns cause list text lines into one row per listed case"""
+    
+    def __init__(self, court: Optional[str] = None, date: Optional[str] = None):
+        self.court = court
+        self.date = date
+        self.stage = None
+    
+    def is_stage_heading(self, line: str) -> bool:
+        """Headings are short upper-case lines naming a hearing stage"""
+        return (
+            len(line) <= 80 and line.isupper() and not VERSUS_PATTERN.search(line)
+            and any(keyword in line for keyword in STAGE_KEYWORDS)
+        )
+    
+    def parse_lines(self, lines: Iterable[Tuple[int, str]]) -> Iterator[Dict]:
+        """
+        Parse (page number, line) pairs into rows
+        
+        Entries may run over several lines; a row is emitted once the next
+        entry or heading starts, so only one entry is held at a time.
+        """
+        row = None
+        
+        for page, line in lines:
+            start = ROW_START_PATTERN.match(line)
+            case_ref = CASE_REF_PATTERN.search(start.group(2)) if start else None
+            
+            if start and case_ref:
+                if row:
+                    yield self._build_row(row)
+                prefix, text = start.group(2)[:case_ref.start()], start.group(2)[case_ref.end():].strip(' ,-')
+                if case_ref.group('case_type') is None and prefix.strip():
+                    # Without a case type, text before the number is part of the entry, not its type
+                    prefix, text = '', f"{prefix.strip()} {text}".strip()
+                row = {
+                    'serial': start.group(1),
+                    'case_ref': case_ref,
+                    'text': [text],
+                    'prefix': prefix,
+                    'page': page,
+                    'stage': self.stage
+                }
+            elif self.is_stage_heading(line):
+                if row:
+                    yield self._build_row(row)
+                    row = None
+                self.stage = line.strip(' :-')
+            elif row is None:
+                # Text before the first entry: court heading, judge, column titles
+                if self.court is None and COURT_HEADER_PATTERN.search(line):
+                    self.court = line
+            elif not COLUMN_HEADER_PATTERN.search(line):
+                row['text'].append(line)
+        
+        if row:
+            yield self._build_row(row)
+    
+    def _build_row(self, row: Dict) -> Dict:
+        """Split an entry's text into parties, advocate and stage"""
+        case_ref = row['case_ref']
+        text = ' '.join(part for part in row['text'] if part)
+        stage = row['stage']
+        
+        cnr_match = CNR_PATTERN.search(text.upper())
+        if cnr_match:
+            text = f"{text[:cnr_match.start()]} {text[cnr_match.end():]}".strip()
+        
+        stage_match = INLINE_STAGE_PATTERN.search(text)
+        if stage_match:
+            stage = stage_match.group(1).strip()
+            text = text[:stage_match.start()].strip()
+        
+        advocate = None
+        advocate_match = ADVOCATE_PATTERN.search(text)
+        if advocate_match:
+            advocate = text[advocate_match.end():].strip(' ,-') or None
+            text = text[:advocate_match.start()].strip(' ,-')
+        
+        parties = VERSUS_PATTERN.split(text, maxsplit=1)
+        
+        # Mixed-case types ("Crl.A") start before the match; rejoin them as written
+        case_type = ' '.join((row['prefix'] + (case_ref.group('case_type') or '')).split()).strip(' /-')
+        number = f"{case_ref.group('number')}/{case_ref.group('year')}"
+        return {
+            'serial': row['serial'],
+            'case_number': f"{case_type}/{number}" if case_type else number,
+            'case_type': case_type or None,
+            'number': case_ref.group('number'),
+            'year': case_ref.group('year'),
+            'cnr': cnr_match.group(0) if cnr_match else None,
+            'petitioner': parties[0].strip() or None,
+            'respondent': parties[1].strip() if len(parties) > 1 else None,
+            'advocate': advocate,
+            'stage': stage,
+            'court': self.court,
+            'date': self.date,
+            'page': row['page']
+        }
+
+
+def iter_cause_list_rows(filepath: str, pdf_manager: Optional[PDFDownloadManager] = None) -> Iterator[Dict]:
+    """
+    Parse a downloaded cause list PDF lazily, one page at a time
+    
+    Yields:
+        Row dictionaries with serial, case number, parties, advocate, stage and court
+    """
+    # Reading needs no download directory, so don't create a manager just for this
+    iter_pdf_pages = pdf_manager.iter_pdf_pages if pdf_manager else PDFDownloadManager.iter_pdf_pages
+    meta = parse_pdf_filename(filepath)
+    parser = CauseListParser(court=meta['court'], date=meta['date'])
+    
+    lines = ((page, line) for page, page_lines in iter_pdf_pages(filepath) for line in page_lines)
+    for row in parser.parse_lines(lines):
+        row['state'] = meta['state']
+        row['district'] = meta['district']
+        row['source'] = Path(filepath).name
+        yield row
+
+
+def parse_to_jsonl(filepath: str, output_dir: str = 'parsed') -> Dict:
+    """
+    Parse one PDF into a JSONL file next to the others in output_dir
+    
+    Returns:
+        Summary with the source, output path, row count and any error
+    """
+    output_path = Path(output_dir) / f"{Path(filepath).stem}.jsonl"
+    tmp_path = output_path.with_suffix('.tmp')
+    rows = 0
+    
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for row in iter_cause_list_rows(filepath):
+                f.write(json.dumps(row, ensure_ascii=False) + '\n')
+                rows += 1
+        tmp_path.replace(output_path)
+        return {'source': str(filepath), 'output': str(output_path), 'rows': rows, 'error': None}
+    
+    except Exception as e:
+        tmp_path.unlink(missing_ok=True)
+        return {'source': str(filepath), 'output': None, 'rows': rows, 'error': str(e)}
+
+
+def parse_files(filepaths: List[str], output_dir: str = 'parsed',
+                workers: int = DEFAULT_PARSE_WORKERS) -> List[Dict]:
+    """
+    Parse many PDFs in a process pool, one JSONL file per PDF
+    
+    Returns:
+        Per-file summaries in completion order
+    """
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    summaries = []
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(parse_to_jsonl, str(filepath), output_dir) for filepath in filepaths]
+        for future in as_completed(futures):
+            summary = future.result()
+            if summary['error']:
+                logger.error(f"Failed to parse {summary['source']}: {summary['error']}")
+            else:
+                logger.info(f"Parsed {summary['rows']} rows from {summary['source']}")
+            summaries.append(summary)
+    
+    return summaries
+
+
+def main():
+    """Parse downloaded cause list PDFs into JSONL"""
+    parser = argparse.ArgumentParser(description='Parse cause list PDFs into JSONL rows')
+    parser.add_argument('paths', nargs='*', default=['downloads'], help='PDF files or directories (default: downloads)')
+    parser.add_argument('--output-dir', type=str, default='parsed', help='Directory for JSONL files (default: parsed)')
+    parser.add_argument('--workers', type=int, default=DEFAULT_PARSE_WORKERS,
+                        help=f'Parallel parser processes (default: {DEFAULT_PARSE_WORKERS})')
+    args = parser.parse_args()
+    
+    filepaths = []
+    for path in map(Path, args.paths):
+        filepaths.extend(sorted(path.glob('*.pdf')) if path.is_dir() else [path])
+    
+    summaries = parse_files(filepaths, args.output_dir, args.workers)
+    failed = [s for s in summaries if s['error']]
+    print(f"[+] Parsed {sum(s['rows'] for s in summaries)} rows from {len(summaries) - len(failed)} files")
+    if failed:
+        print(f"[!] Failed: {len(failed)} files")
+
+
+if __name__ == '__main__':
+    main()
@@ -6,11 +6,17 @@ Provides CLI options for case search, listing checks, and PDF downloads
 import argparse
 import sys
 import logging
-from datetime import datetime
-from typing import Optional
+from datetime import date, datetime, timedelta
+from typing import List, Optional
 from case_manager import CaseManager, CaseListingChecker
-from pdf_manager import PDFDownloadManager
+from ecourts_scraper import CaptchaSource, prompt_captcha
+from pdf_manager import PDFDownloadManager, get_date_range
 from output_manager import OutputManager
+from watchlist import WatchlistMonitor
+from hearing_index import HearingIndex, get_index_path
+from harvest import HarvestJob
+from browser_broker import configure_broker
+from cli_daemon import CliDaemon, forward_command, start_daemon, stop_daemon, get_daemon_socket
 
 # Setup logging
 logging.basicConfig(
@@ -28,13 +34,27 @@ class ECourtsCliApp:
         self.listing_checker = CaseListingChecker()
         self.pdf_manager = PDFDownloadManager()
         self.output_manager = OutputManager()
+        self.watchlist_monitor = None
     
-    def search_case_by_cnr(self, cnr: str, output_format: str = 'console') -> bool:
+    def _get_watchlist_monitor(self) -> WatchlistMonitor:
+        """Create the watchlist monitor on first use"""
+        if self.watchlist_monitor is None:
+            self.watchlist_monitor = WatchlistMonitor(
+                case_manager=self.case_manager, index=HearingIndex(get_index_path(self.output_manager.output_dir))
+            )
+        return self.watchlist_monitor
+    
+    def search_case_by_cnr(self, cnr: str, output_format: str = 'console',
+                          changes_only: bool = False) -> bool:
         """Search for a case using CNR"""
         try:
             print(f"\n[*] Searching for case: {cnr}")
             case_info = self.case_manager.search_case('cnr', cnr=cnr)
             
+            if case_info and changes_only:
+                case_id = self.case_manager.get_case_id('cnr', cnr=cnr)
+                return self._emit_case_delta(case_id, case_info, f"case_{cnr}_delta", output_format)
+            
             if case_info:
                 summary = self.case_manager.get_case_summary(case_info)
                 self._display_case_summary(summary)
@@ -53,7 +73,7 @@ class ECourtsCliApp:
             return False
     
     def search_case_by_details(self, case_type: str, case_number: str, year: str,
-                              output_format: str = 'console') -> bool:
+                              output_format: str = 'console', changes_only: bool = False) -> bool:
         """Search for a case using case type, number, and year"""
         try:
             print(f"\n[*] Searching for case: {case_type} {case_number}/{year}")
@@ -64,6 +84,13 @@ class ECourtsCliApp:
                 year=year
             )
             
+            if case_info and changes_only:
+                case_id = self.case_manager.get_case_id(
+                    'details', case_type=case_type, case_number=case_number, year=year
+                )
+                filename = f"case_{case_type}_{case_number}_{year}_delta"
+                return self._emit_case_delta(case_id, case_info, filename, output_format)
+            
             if case_info:
                 summary = self.case_manager.get_case_summary(case_info)
                 self._display_case_summary(summary)
@@ -125,15 +152,23 @@ class ECourtsCliApp:
             return False
     
     def download_cause_list(self, state: str, district: str, complex_name: str,
-                           date: str, captcha: str, output_format: str = 'console') -> bool:
-        """Download cause list for a specific court complex"""
+                           dates: List[str], captcha: CaptchaSource, output_format: str = 'console') -> bool:
+        """Download cause lists for a specific court complex on one or more dates"""
         try:
             print(f"\n[*] Downloading cause list for {complex_name}, {district}, {state}")
-            print(f"[*] Date: {date}")
             
-            results = self.pdf_manager.download_today_cause_list(
-                state, district, complex_name, date, captcha
-            )
+            if len(dates) == 1:
+                date = dates[0]
+                print(f"[*] Date: {date}")
+                results = self.pdf_manager.download_today_cause_list(
+                    state, district, complex_name, date, captcha
+                )
+            else:
+                date = f"{dates[0]}_to_{dates[-1]}"
+                print(f"[*] Dates: {dates[0]} to {dates[-1]} ({len(dates)} days)")
+                results = self.pdf_manager.download_date_range(
+                    state, district, complex_name, dates, captcha
+                )
             
             if 'error' in results:
                 print(f"[!] Error: {results['error']}")
@@ -141,6 +176,9 @@ class ECourtsCliApp:
             
             print(f"[+] Downloaded: {results['successful']} PDFs")
             print(f"[!] Failed: {results['failed']} PDFs")
+            if results.get('needs_captcha'):
+                print(f"[!] {len(results['needs_captcha'])} PDFs need a new captcha; "
+                      f"run without --captcha to be prompted for each one")
             
             if results.get('archive'):
                 print(f"[+] Archive created: {results['archive']}")
@@ -156,6 +194,136 @@ class ECourtsCliApp:
             print(f"[!] Error: {e}")
             return False
     
+    def harvest_cause_lists(self, snapshot_path: str, date: str, captcha: CaptchaSource) -> bool:
+        """Download every court's cause list for a date, resuming from the last checkpoint"""
+        try:
+            print(f"\n[*] Harvesting cause lists for {date} from {snapshot_path}")
+            
+            def show_progress(event: str, data: dict):
+                if event in ('downloaded', 'failed'):
+                    print(f"[{'+' if event == 'downloaded' else '!'}] {data['court']}: {event}")
+            
+            job = HarvestJob(snapshot_path, date, captcha, pdf_manager=self.pdf_manager)
+            manifest = job.run(show_progress)
+            session = manifest['session']
+            
+            print(f"[+] Downloaded: {manifest['downloaded']}/{manifest['total_courts']} courts")
+            print(f"[!] Failed: {manifest['failed']} {manifest['failures_by_type']}")
+            print(f"[*] Remaining: {manifest['remaining']}")
+            print(f"[*] This run: {session['courts_per_minute']} courts/min, "
+                  f"{session['bytes_per_minute'] / 1024:.1f} KB/min")
+            print(f"[+] Manifest: {job.manifest_path}")
+            return True
+        
+        except KeyboardInterrupt:
+            print("\n[!] Harvest stopped; run the same command again to resume")
+            return False
+        except Exception as e:
+            logger.error(f"Error harvesting cause lists: {e}")
+            print(f"[!] Error: {e}")
+            return False
+    
+    def _emit_case_delta(self, case_id: str, case_info: dict, filename: str,
+                         output_format: str) -> bool:
+        """Display and save only what changed since the last search of a case"""
+        delta = self.case_manager.get_case_delta(case_id, case_info)
+        
+        if not delta['changed']:
+            print(f"[+] No changes since {delta['previous_saved_at']}")
+            return True
+        
+        self._display_case_delta(delta)
+        
+        if output_format != 'console':
+            self.output_manager.save_result(delta, filename, output_format)
+        
+        return True
+    
+    def watch_case(self, search_type: str, **params) -> bool:
+        """Add a case to the watchlist"""
+        try:
+            case_id = self._get_watchlist_monitor().add_case(search_type, **params)
+            
+            if case_id:
+                print(f"[+] Watching case: {case_id}")
+                return True
+            else:
+                print("[!] Failed to watch case: incomplete search parameters")
+                return False
+        
+        except Exception as e:
+            logger.error(f"Error watching case: {e}")
+            print(f"[!] Error: {e}")
+            return False
+    
+    def unwatch_case(self, case_id: str) -> bool:
+        """Remove a case from the watchlist"""
+        try:
+            if self._get_watchlist_monitor().remove_case(case_id):
+                print(f"[+] Stopped watching case: {case_id}")
+                return True
+            else:
+                print(f"[!] Case not in watchlist: {case_id}")
+                return False
+        
+        except Exception as e:
+            logger.error(f"Error removing watched case: {e}")
+            print(f"[!] Error: {e}")
+            return False
+    
+    def show_watchlist(self, output_format: str = 'console') -> bool:
+        """Show the last known listing status of every watched case"""
+        try:
+            statuses = self._get_watchlist_monitor().get_all_statuses()
+            print(f"\n[*] Watched cases: {len(statuses)}")
+            
+            for status in statuses:
+                summary = status.get('summary') or {}
+                listing_status = summary.get('listing_status', {})
+                message = listing_status.get('status_message') or status.get('last_error') or 'Not checked yet'
+                hearing_date = listing_status.get('hearing_date') or '-'
+                print(f"{status['case_id']}: {message} (hearing: {hearing_date}, next check: {status['next_check']})")
+            
+            if output_format != 'console':
+                self.output_manager.save_result({'watchlist': statuses}, 'watchlist_status', output_format)
+            
+            return True
+        
+        except Exception as e:
+            logger.error(f"Error showing watchlist: {e}")
+            print(f"[!] Error: {e}")
+            return False
+    
+    def show_hearings(self, start: date, end: date, output_format: str = 'console') -> bool:
+        """Show watched cases with a hearing between two dates, grouped by court, without scraping"""
+        try:
+            courts = self._get_watchlist_monitor().get_hearings(start, end)
+            total = sum(len(entries) for entries in courts.values())
+            print(f"\n[*] Hearings from {start.strftime('%d-%m-%Y')} to {end.strftime('%d-%m-%Y')}: "
+                  f"{total} cases in {len(courts)} courts")
+            
+            for court_name, entries in sorted(courts.items()):
+                print(f"\n{court_name}")
+                for entry in entries:
+                    print(f"  {entry['hearing_date']}  #{entry['serial_number'] or '-'}  {entry['case_id']}")
+            
+            if output_format != 'console':
+                filename = f"hearings_{start.strftime('%d_%m_%Y')}_to_{end.strftime('%d_%m_%Y')}"
+                self.output_manager.save_result({'total': total, 'courts': courts}, filename, output_format)
+            
+            return True
+        
+        except Exception as e:
+            logger.error(f"Error showing hearings: {e}")
+            print(f"[!] Error: {e}")
+            return False
+    
+    def run_watchlist_monitor(self) -> bool:
+        """Refresh watched cases on their schedule until interrupted"""
+        print("\n[*] Watchlist monitor running (Ctrl+C to stop)")
+        self._get_watchlist_monitor().run()
+        return True
+    
     def _display_case_summary(self, summary: dict):
         """Display case summary in console"""
         print("\n" + "="*60)
@@ -183,6 +351,31 @@ class ECourtsCliApp:
             print(f"Hearing Date: {listing_status['hearing_date']}")
         
         print("="*60 + "\n")
+    
+    
+    def _display_case_delta(self, delta: dict):
+        """Display case changes in console"""
+        print("\n" + "="*60)
+        print("NEW CASE" if delta['is_new'] else "CASE CHANGES")
+        print("="*60)
+        
+        for key, change in delta['fields_changed'].items():
+            if delta['is_new']:
+                print(f"{key}: {change['new']}")
+            else:
+                print(f"{key}: {change['old']} -> {change['new']}")
+        
+        for field, label in (('hearing_date', 'Hearing Date'), ('serial_number', 'Serial Number'),
+                             ('court_name', 'Court Name')):
+            if f'new_{field}' in delta:
+                print(f"{label}: {delta[f'previous_{field}']} -> {delta[f'new_{field}']}")
+        
+        listing_status = delta.get('listing_status', {})
+        if listing_status:
+            print("\n" + "-"*60)
+            print(f"Status: {listing_status.get('status_message')}")
+        
+        print("="*60 + "\n")
 
 
 def create_parser() -> argparse.ArgumentParser:
@@ -207,8 +400,29 @@ Examples:
   # Download cause list
   python cli.py --causelist --state "Delhi" --district "New Delhi" --complex "High Court" --date "01-01-2024" --captcha "ABC123"
   
+  # Download a week of cause lists, selecting each court once and prompting for each captcha
+  python cli.py --causelist --state "Delhi" --district "New Delhi" --complex "High Court" --from "01-01-2024" --to "07-01-2024"
+  
+  # Harvest every court in a hierarchy snapshot (python court_hierarchy.py), prompting for each captcha; rerun to resume
+  python cli.py --harvest --snapshot court_hierarchy.json --date "01-01-2024"
+  
   # Save output as JSON
   python cli.py --cnr "ABCD0123456789012345" --output json
+  
+  # Run scrapes on a shared browser broker (start it with: python browser_broker.py)
+  python cli.py --cnr "ABCD0123456789012345" --broker 127.0.0.1:6010
+  
+  # Watch a case and refresh watched cases on their schedule
+  python cli.py --watch --cnr "ABCD0123456789012345"
+  python cli.py --monitor
+  
+  # Watched cases with hearings this week, grouped by court (no scraping)
+  python cli.py --upcoming 7
+  python cli.py --listed --from "01-01-2024" --to "07-01-2024"
+  
+  # Keep browsers and caches warm in a background daemon; later commands run in it
+  python cli.py --daemon
+  python cli.py --stop-daemon
         """
     )
     
@@ -230,34 +444,155 @@ Examples:
     download_group.add_argument('--state', type=str, help='State name')
     download_group.add_argument('--district', type=str, help='District name')
     download_group.add_argument('--complex', type=str, help='Court complex name')
-    download_group.add_argument('--date', type=str, help='Date in DD-MM-YYYY format')
-    download_group.add_argument('--captcha', type=str, help='Captcha code')
+    download_group.add_argument('--date', type=str,
+                               help='Date in DD-MM-YYYY format (for --causelist, --from and --to take precedence)')
+    download_group.add_argument('--from', dest='from_date', type=str, help='First date of a range for --causelist')
+    download_group.add_argument('--to', dest='to_date', type=str, help='Last date of a range for --causelist')
+    download_group.add_argument('--captcha', type=str,
+                               help='Captcha code; a code only answers one download, so omit it with '
+                                    '--causelist or --harvest to be prompted for each captcha')
+    download_group.add_argument('--harvest', action='store_true',
+                               help='Download every court in --snapshot for --date, resuming from its checkpoint')
+    download_group.add_argument('--snapshot', type=str, default='court_hierarchy.json',
+                               help='Court hierarchy snapshot for --harvest (default: court_hierarchy.json)')
+    
+    # Watchlist options
+    watchlist_group = parser.add_argument_group('Watchlist Options')
+    watchlist_group.add_argument('--watch', action='store_true', help='Add the case given by --cnr or case details to the watchlist')
+    watchlist_group.add_argument('--unwatch', type=str, metavar='CASE_ID', help='Remove a case from the watchlist')
+    watchlist_group.add_argument('--watchlist', action='store_true', help='Show the last known status of watched cases')
+    watchlist_group.add_argument('--monitor', action='store_true', help='Refresh watched cases on a hearing-date-aware schedule')
+    watchlist_group.add_argument('--upcoming', type=int, metavar='DAYS',
+                                help='Show watched cases with a hearing in the next DAYS days, grouped by court')
+    watchlist_group.add_argument('--listed', action='store_true',
+                                help='Show watched cases with a hearing from --from to --to, grouped by court')
     
     # Output options
     output_group = parser.add_argument_group('Output Options')
     output_group.add_argument('--output', type=str, choices=['console', 'json', 'text'],
                              default='console', help='Output format (default: console)')
+    output_group.add_argument('--broker', type=str, metavar='ADDRESS',
+                             help='Run scrapes on the browser broker at host:port or Unix socket path (never in the daemon)')
+    output_group.add_argument('--changes-only', action='store_true',
+                             help='Only output what changed since the last search of the case')
+    
+    # Daemon options
+    daemon_group = parser.add_argument_group('Daemon Options')
+    daemon_group.add_argument('--daemon', action='store_true',
+                             help=f'Start a background daemon on {get_daemon_socket()} that runs later commands')
+    daemon_group.add_argument('--foreground', action='store_true', help='Run --daemon in this process')
+    daemon_group.add_argument('--browsers', type=int, default=1, help='Warm browsers held by --daemon (default: 1)')
+    daemon_group.add_argument('--stop-daemon', action='store_true', help='Stop the running daemon')
+    daemon_group.add_argument('--no-daemon', action='store_true', help='Run this command here even if a daemon is running')
     
     return parser
 
 
-def main():
-    """Main entry point"""
-    parser = create_parser()
-    args = parser.parse_args()
+def prompts_for_captcha(argv: List[str]) -> bool:
+    """Cause list downloads and harvests without --captcha prompt on this terminal, so they can't run in the daemon"""
+    return ('--causelist' in argv or '--harvest' in argv) and not any(arg.split('=', 1)[0] == '--captcha' for arg in argv)
+
+
+def run_daemon(args) -> int:
+    """Start, or with --foreground run, the CLI daemon"""
+    if not args.foreground:
+        pid = start_daemon(__file__, args.browsers)
+        if pid is None:
+            print("[!] CLI daemon failed to start, see cli_daemon.log")
+            return 1
+        print(f"[+] CLI daemon {pid} running on {get_daemon_socket()}")
+        return 0
     
     app = ECourtsCliApp()
+    try:
+        CliDaemon(lambda argv: run_command(argv, app), browsers=args.browsers).serve_forever()
+    except KeyboardInterrupt:
+        print("\n[!] CLI daemon stopped")
+    return 0
+
+
+def run_command(argv: List[str], app: Optional[ECourtsCliApp] = None) -> int:
+    """
+    Run one CLI command
+    
+    Args:
+        argv: Command line arguments, without the program name
+        app: Application to run it on; the daemon passes its long-lived one
+    
+    Returns:
+        Exit code
+    """
+    parser = create_parser()
+    args = parser.parse_args(argv)
+    
+    if args.daemon:
+        return run_daemon(args)
+    
+    if args.stop_daemon:
+        if stop_daemon():
+            print("[+] CLI daemon stopped")
+            return 0
+        print("[!] No CLI daemon running")
+        return 1
+    
+    if args.broker:
+        if app is not None:
+            # The daemon's browsers serve every client, so a broker is only set for a local run
+            print("[!] Error: --broker only applies to commands run with --no-daemon")
+            return 1
+        configure_broker(args.broker)
+    
+    app = app or ECourtsCliApp()
     success = False
     
     try:
+        # Handle watchlist commands
+        if args.watch:
+            if args.cnr:
+                success = app.watch_case('cnr', cnr=args.cnr)
+            elif args.case_type and args.case_number and args.year:
+                success = app.watch_case(
+                    'details', case_type=args.case_type, case_number=args.case_number, year=args.year
+                )
+            else:
+                print("[!] Error: --watch requires --cnr or --case-type, --case-number and --year")
+                return 1
+        
+        elif args.unwatch:
+            success = app.unwatch_case(args.unwatch)
+        
+        elif args.watchlist:
+            success = app.show_watchlist(args.output)
+        
+        elif args.monitor:
+            success = app.run_watchlist_monitor()
+        
+        elif args.upcoming is not None:
+            today = datetime.now().date()
+            success = app.show_hearings(today, today + timedelta(days=args.upcoming), args.output)
+        
+        elif args.listed:
+            if not (args.from_date and args.to_date):
+                print("[!] Error: --listed requires --from and --to")
+                return 1
+            
+            try:
+                start = datetime.strptime(args.from_date, '%d-%m-%Y').date()
+                end = datetime.strptime(args.to_date, '%d-%m-%Y').date()
+            except ValueError as e:
+                print(f"[!] Error: {e}")
+                return 1
+            
+            success = app.show_hearings(start, end, args.output)
+        
         # Handle search by CNR
-        if args.cnr:
-            success = app.search_case_by_cnr(args.cnr, args.output)
+        elif args.cnr:
+            success = app.search_case_by_cnr(args.cnr, args.output, args.changes_only)
         
         # Handle search by case details
         elif args.case_type and args.case_number and args.year:
             success = app.search_case_by_details(
-                args.case_type, args.case_number, args.year, args.output
+                args.case_type, args.case_number, args.year, args.output, args.changes_only
             )
         
         # Handle today's listing
@@ -268,29 +603,77 @@ def main():
         elif args.tomorrow:
             success = app.check_tomorrow_listing(args.output)
         
+        # Handle nationwide harvest
+        elif args.harvest:
+            if not args.date:
+                print("[!] Error: --harvest requires --date")
+                return 1
+            
+            captcha = args.captcha
+            if not captcha:
+                if args.broker or not sys.stdin.isatty():
+                    print("[!] Error: --harvest needs --captcha unless run from a terminal without --broker")
+                    return 1
+                captcha = prompt_captcha
+            
+            success = app.harvest_cause_lists(args.snapshot, args.date, captcha)
+        
         # Handle cause list download
         elif args.causelist:
-            if not all([args.state, args.district, args.complex, args.date, args.captcha]):
-                print("[!] Error: --causelist requires --state, --district, --complex, --date, and --captcha")
-                sys.exit(1)
+            if bool(args.from_date) != bool(args.to_date):
+                print("[!] Error: --from and --to must be given together")
+                return 1
+            
+            has_dates = args.date or args.from_date
+            if not all([args.state, args.district, args.complex, has_dates]):
+                print("[!] Error: --causelist requires --state, --district, --complex and --date (or --from and --to)")
+                return 1
+            
+            captcha = args.captcha
+            if not captcha:
+                if args.broker or not sys.stdin.isatty():
+                    print("[!] Error: --causelist needs --captcha unless run from a terminal without --broker")
+                    return 1
+                captcha = prompt_captcha
+            
+            # A range wins over --date
+            if args.from_date:
+                if args.date:
+                    print(f"[*] Downloading --from {args.from_date} --to {args.to_date}; ignoring --date {args.date}")
+                try:
+                    dates = get_date_range(args.from_date, args.to_date)
+                except ValueError as e:
+                    print(f"[!] Error: {e}")
+                    return 1
+            else:
+                dates = [args.date]
             
             success = app.download_cause_list(
-                args.state, args.district, args.complex, args.date, args.captcha, args.output
+                args.state, args.district, args.complex, dates, captcha, args.output
             )
         
         else:
             parser.print_help()
-            sys.exit(0)
+            return 0
         
-        sys.exit(0 if success else 1)
+        return 0 if success else 1
     
     except KeyboardInterrupt:
         print("\n[!] Operation cancelled by user")
-        sys.exit(1)
+        return 1
     except Exception as e:
         logger.error(f"Unexpected error: {e}")
         print(f"[!] Unexpected error: {e}")
-        sys.exit(1)
+        return 1
+
+
+def main():
+    """Main entry point; runs the command in the CLI daemon when one is running"""
+    argv = sys.argv[1:]
+    exit_code = None if prompts_for_captcha(argv) else forward_command(argv)
+    if exit_code is None:
+        exit_code = run_command(argv)
+    sys.exit(exit_code)
 
 
 if __name__ == '__main__':
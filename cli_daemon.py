@@ -0,0 +1,319 @@
+"""
+CLI Daemon Module
+Keeps warm browsers and caches in one background process and runs forwarded CLI commands over a Unix socket
+"""
+
+from browser_broker import BrowserPool, configure_pool, ensure_private_dir, get_authkey, recv_json, send_json
+from metrics import metrics
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Listener, Client
+from pathlib import Path
+from typing import Callable, List, Optional
+import logging
+import os
+import stat
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# The socket lives in a directory only this user can enter: $XDG_RUNTIME_DIR/ecourts,
+# or a private directory in the shared temp dir, created before the socket is bound
+DAEMON_SOCKET_ENV = 'ECOURTS_CLI_SOCKET'
+RUNTIME_DIR = (Path(os.environ['XDG_RUNTIME_DIR']) / 'ecourts' if os.environ.get('XDG_RUNTIME_DIR')
+               else Path(tempfile.gettempdir()) / f'ecourts-{os.getuid()}')
+DEFAULT_DAEMON_SOCKET = str(RUNTIME_DIR / 'cli.sock')
+
+# Seconds a starting daemon has to open its socket
+DAEMON_START_TIMEOUT = 120
+
+# Commands that always run in the invoking process; --broker would reroute
+# the scrapes of every command the daemon runs, not just this one
+LOCAL_ONLY_FLAGS = ('--daemon', '--stop-daemon', '--no-daemon', '--monitor', '--broker')
+
+
+def get_daemon_socket() -> str:
+    return os.environ.get(DAEMON_SOCKET_ENV, DEFAULT_DAEMON_SOCKET)
+
+
+def connect(address: str):
+    """
+    Connect to a daemon socket owned by this user
+    
+    Returns:
+        The connection, or None when the socket is missing, belongs to
+        someone else or the daemon does not accept this user's key
+    """
+    try:
+        info = os.stat(address)
+    except OSError:
+        return None
+    if info.st_uid != os.getuid() or not stat.S_ISSOCK(info.st_mode):
+        logger.warning(f"Ignoring {address}: not a socket owned by this user")
+        return None
+    
+    try:
+        return Client(address, family='AF_UNIX', authkey=get_authkey())
+    except (OSError, AuthenticationError):
+        return None
+
+
+class _ConnectionWriter:
+    """File-like object that forwards writes to a client as ["stdout"|"stderr", text] messages"""
+    
+    def __init__(self, conn, stream: str):
+        self.conn = conn
+        self.stream = stream
+    
+    def write(self, text: str) -> int:
+        if text:
+            send_json(self.conn, [self.stream, text])
+        return len(text)
+    
+    def flush(self):
+        pass
+
+
+class _ThreadOutput:
+    """
+    Stand-in for sys.stdout/sys.stderr that routes each thread's output
+    
+    Threads serving a client write to that client's connection; every other
+    thread (logging set up at startup, the pool) keeps the daemon's own stream.
+    """
+    
+    def __init__(self, default):
+        self.default = default
+        self.local = threading.local()
+    
+    def redirect(self, target):
+        self.local.target = target
+    
+    def _target(self):
+        return getattr(self.local, 'target', None) or self.default
+    
+    def write(self, text: str) -> int:
+        return self._target().write(text)
+    
+    def flush(self):
+        self._target().flush()
+    
+    def __getattr__(self, name):
+        return getattr(self.default, name)
+
+
+class CliDaemon:
+    """
+    Runs forwarded CLI commands in one long-lived process
+    
+    Commands share one application object and the process-wide stdout,
+    stderr and logging handlers, so they run one at a time; clients that
+    connect meanwhile wait for the running command to finish.
+    """
+    
+    def __init__(self, run_command: Callable[[List[str]], int], address: Optional[str] = None,
+                 browsers: int = 1):
+        """
+        Args:
+            run_command: Runs a CLI argument list in this process and returns its exit code
+            address: Unix socket path
+            browsers: Warm browsers kept for scrapes
+        """
+        self.run_command = run_command
+        self.address = address or get_daemon_socket()
+        self.browsers = browsers
+        self.pool = None
+        self.listener = None
+        self.stop_event = threading.Event()
+        self.command_lock = threading.Lock()
+    
+    def serve_forever(self):
+        """Open the socket and serve commands until stopped"""
+        ensure_private_dir(Path(self.address).parent)
+        if os.path.exists(self.address):
+            if is_daemon_running(self.address):
+                raise RuntimeError(f"A CLI daemon is already running on {self.address}")
+            os.unlink(self.address)
+        
+        self.pool = BrowserPool(self.browsers)
+        configure_pool(self.pool)
+        
+        stdout, stderr = _ThreadOutput(sys.stdout), _ThreadOutput(sys.stderr)
+        sys.stdout, sys.stderr = stdout, stderr
+        
+        # Handlers set up at import hold the real stderr; log lines of a command go to its client too
+        log_handlers = [handler for handler in logging.getLogger().handlers
+                        if isinstance(handler, logging.StreamHandler) and handler.stream is stderr.default]
+        for handler in log_handlers:
+            handler.setStream(stderr)
+        
+        self.listener = Listener(self.address, family='AF_UNIX', authkey=get_authkey())
+        os.chmod(self.address, 0o600)
+        logger.info(f"CLI daemon {os.getpid()} listening on {self.address} in {os.getcwd()}")
+        
+        try:
+            while not self.stop_event.is_set():
+                try:
+                    conn = self.listener.accept()
+                except OSError:
+                    if self.stop_event.is_set():
+                        break
+                    raise
+                except Exception as e:
+                    logger.error(f"Error accepting CLI connection: {e}")
+                    continue
+                if self.stop_event.is_set():
+                    conn.close()
+                    break
+                threading.Thread(target=self._handle, args=(conn, stdout, stderr), daemon=True).start()
+        finally:
+            self.listener.close()
+            configure_pool(None)
+            self.pool.close()
+            for handler in log_handlers:
+                handler.setStream(stderr.default)
+            sys.stdout, sys.stderr = stdout.default, stderr.default
+            if os.path.exists(self.address):
+                os.unlink(self.address)
+            logger.info("CLI daemon stopped")
+    
+    def stop(self):
+        self.stop_event.set()
+        # Wake the accept() call so the serve loop sees the stop request
+        conn = connect(self.address)
+        if conn is not None:
+            conn.close()
+    
+    def _handle(self, conn, stdout: _ThreadOutput, stderr: _ThreadOutput):
+        """Run one forwarded command, streaming its output back"""
+        try:
+            try:
+                request = recv_json(conn)
+            except EOFError:
+                return
+            
+            if not isinstance(request, dict):
+                logger.warning("Ignoring malformed CLI request")
+                return
+            
+            if request.get('command') == 'stop':
+                send_json(conn, ['exit', 0])
+                self.stop()
+                return
+            
+            argv = request.get('argv')
+            if not isinstance(argv, list) or not all(isinstance(arg, str) for arg in argv):
+                logger.warning("Ignoring malformed CLI request")
+                return
+            
+            # Relative output paths must mean the same directory to the client and the daemon
+            if request.get('cwd') != os.getcwd():
+                send_json(conn, ['fallback', f"daemon runs in {os.getcwd()}"])
+                return
+            
+            with self.command_lock:
+                metrics.increment('cli_daemon_commands_total')
+                stdout.redirect(_ConnectionWriter(conn, 'stdout'))
+                stderr.redirect(_ConnectionWriter(conn, 'stderr'))
+                try:
+                    exit_code = self.run_command(argv)
+                except SystemExit as e:
+                    # argparse errors and --help exit through SystemExit
+                    exit_code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+                except Exception as e:
+                    logger.error(f"CLI daemon command failed: {e}")
+                    print(f"[!] Unexpected error: {e}")
+                    exit_code = 1
+                finally:
+                    stdout.redirect(None)
+                    stderr.redirect(None)
+            
+            send_json(conn, ['exit', exit_code])
+        except (EOFError, OSError, ValueError) as e:
+            logger.warning(f"CLI client disconnected: {e}")
+        finally:
+            conn.close()
+
+
+def is_daemon_running(address: Optional[str] = None) -> bool:
+    """Check whether a daemon accepts connections on the socket"""
+    conn = connect(address or get_daemon_socket())
+    if conn is None:
+        return False
+    conn.close()
+    return True
+
+
+def forward_command(argv: List[str], address: Optional[str] = None) -> Optional[int]:
+    """
+    Run a CLI command in the daemon, writing its output here
+    
+    Returns:
+        The command's exit code, or None if no daemon could run it
+    """
+    if any(arg.split('=', 1)[0] in LOCAL_ONLY_FLAGS for arg in argv):
+        return None
+    
+    conn = connect(address or get_daemon_socket())
+    if conn is None:
+        return None
+    
+    streams = {'stdout': sys.stdout, 'stderr': sys.stderr}
+    try:
+        send_json(conn, {'argv': argv, 'cwd': os.getcwd()})
+        while True:
+            kind, payload = recv_json(conn)
+            if kind == 'exit':
+                return payload
+            if kind == 'fallback':
+                logger.debug(f"Running locally: {payload}")
+                return None
+            streams[kind].write(payload)
+            streams[kind].flush()
+    except (EOFError, OSError, ValueError, KeyError) as e:
+        print(f"[!] Lost connection to CLI daemon: {e}", file=sys.stderr)
+        return 1
+    finally:
+        conn.close()
+
+
+def start_daemon(script: str, browsers: int = 1, log_path: str = 'cli_daemon.log') -> Optional[int]:
+    """
+    Start a detached daemon running `script --daemon --foreground`
+    
+    Returns:
+        The daemon's PID once its socket accepts connections, or None if it failed to start
+    """
+    with open(log_path, 'a') as log:
+        process = subprocess.Popen(
+            [sys.executable, script, '--daemon', '--foreground', '--browsers', str(browsers)],
+            stdin=subprocess.DEVNULL, stdout=log, stderr=log, start_new_session=True
+        )
+    
+    deadline = time.monotonic() + DAEMON_START_TIMEOUT
+    while time.monotonic() < deadline:
+        if is_daemon_running():
+            return process.pid
+        if process.poll() is not None:
+            return None
+        time.sleep(0.2)
+    return None
+
+
+def stop_daemon(address: Optional[str] = None) -> bool:
+    """Ask a running daemon to shut down"""
+    conn = connect(address or get_daemon_socket())
+    if conn is None:
+        return False
+    
+    try:
+        send_json(conn, {'command': 'stop'})
+        recv_json(conn)
+        return True
+    except (EOFError, OSError, ValueError):
+        return False
+    finally:
+        conn.close()
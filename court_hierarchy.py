@@ -0,0 +1,125 @@
+"""
+Court Hierarchy Module
+Handles snapshots of the state, district, complex and court hierarchy for bulk crawls
+"""
+
+from ecourts_scraper import CauseListScraper
+from browser_broker import open_scraper
+from scraper_errors import ECourtsError
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+from datetime import datetime
+from itertools import zip_longest
+import argparse
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SNAPSHOT_PATH = 'court_hierarchy.json'
+
+
+def build_snapshot(states: Optional[List[str]] = None) -> Dict:
+    """
+    Walk the portal's dropdowns and record every court
+    
+    Args:
+        states: Limit the walk to these states (default: all)
+    
+    Returns:
+        Snapshot dictionary: {'built_at', 'states': {state: {district: {complex: [courts]}}}}
+    """
+    hierarchy = {}
+    
+    with open_scraper(CauseListScraper) as scraper:
+        for state in states or scraper.get_states():
+            hierarchy[state] = {}
+            
+            for district in scraper.get_districts(state):
+                hierarchy[state][district] = {}
+                
+                for complex_name in scraper.get_court_complexes(state, district):
+                    try:
+                        courts = scraper.get_courts(state, district, complex_name)
+                    except ECourtsError as e:
+                        # One unreachable complex should not abort a walk of thousands
+                        logger.error(f"Skipping courts of {complex_name}, {district} ({e.error_type}): {e}")
+                        courts = []
+                    hierarchy[state][district][complex_name] = courts
+            
+            mapped = sum(len(courts) for complexes in hierarchy[state].values() for courts in complexes.values())
+            logger.info(f"Mapped {mapped} courts in {state}")
+    
+    return {'built_at': datetime.now().isoformat(), 'states': hierarchy}
+
+
+def save_snapshot(snapshot: Dict, path: str = DEFAULT_SNAPSHOT_PATH):
+    """Write a hierarchy snapshot to disk atomically"""
+    path = Path(path)
+    tmp_path = path.with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(snapshot, f, indent=2, ensure_ascii=False)
+    tmp_path.replace(path)
+    logger.info(f"Saved court hierarchy ({count_courts(snapshot)} courts) to {path}")
+
+
+def load_snapshot(path: str = DEFAULT_SNAPSHOT_PATH) -> Dict:
+    """Load a hierarchy snapshot written by save_snapshot"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def iter_courts(snapshot: Dict) -> Iterator[Dict[str, str]]:
+    """
+    Iterate over every court in a snapshot
+    
+    Yields:
+        Dictionaries with state, district, complex_name and court_name
+    """
+    for state, districts in snapshot['states'].items():
+        for district, complexes in districts.items():
+            for complex_name, courts in complexes.items():
+                for court_name in courts:
+                    yield {
+                        'state': state,
+                        'district': district,
+                        'complex_name': complex_name,
+                        'court_name': court_name
+                    }
+
+
+def count_courts(snapshot: Dict) -> int:
+    """Number of courts in a snapshot"""
+    return sum(1 for _ in iter_courts(snapshot))
+
+
+def interleave_by_state(courts: List[Dict[str, str]]) -> List[Dict[str, str]]:
+    """
+    Reorder courts round-robin across states
+    
+    Consecutive requests then land on different state servers instead of
+    hammering one state's courts back to back.
+    """
+    by_state = {}
+    for court in courts:
+        by_state.setdefault(court['state'], []).append(court)
+    
+    return [court for batch in zip_longest(*by_state.values()) for court in batch if court is not None]
+
+
+def main():
+    """Build a court hierarchy snapshot"""
+    parser = argparse.ArgumentParser(description='Snapshot the eCourts court hierarchy')
+    parser.add_argument('--output', type=str, default=DEFAULT_SNAPSHOT_PATH,
+                        help=f'Snapshot file (default: {DEFAULT_SNAPSHOT_PATH})')
+    parser.add_argument('--state', action='append', dest='states', metavar='STATE',
+                        help='Only map this state (repeatable)')
+    args = parser.parse_args()
+    
+    snapshot = build_snapshot(args.states)
+    save_snapshot(snapshot, args.output)
+    print(f"[+] {count_courts(snapshot)} courts saved to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,249 @@
+"""
+Distributed Crawl Module
+Splits a cause list harvest into queued court tasks served to worker nodes
+"""
+
+from ecourts_scraper import CauseListDownloader, command_captcha_solver, prompt_captcha
+from pdf_manager import PDFDownloadManager
+from court_hierarchy import load_snapshot, iter_courts, interleave_by_state, DEFAULT_SNAPSHOT_PATH
+from work_queue import open_work_queue, DEFAULT_LEASE_SECONDS
+from scraper_errors import ECourtsError, CaptchaRejectedError, classify_error
+from metrics import metrics
+from typing import Callable, Dict, Optional
+import argparse
+import logging
+import os
+import socket
+import sys
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Seconds between coordinator sweeps for expired leases
+REQUEUE_INTERVAL = 30
+
+# Seconds an idle worker waits before asking for work again
+IDLE_POLL_INTERVAL = 10
+
+# Rejected captchas in a row after which a worker stops, its solver likely broken
+MAX_CONSECUTIVE_REJECTIONS = 3
+
+
+def get_task_id(date: str, court: Dict[str, str]) -> str:
+    """Stable task ID so re-planning the same date never duplicates work"""
+    return '/'.join([date, court['state'], court['district'], court['complex_name'], court['court_name']])
+
+
+class CrawlCoordinator:
+    """Plans court tasks for a date and re-queues work from dead workers"""
+    
+    def __init__(self, work_queue):
+        self.work_queue = work_queue
+    
+    def plan(self, snapshot: Dict, date: str) -> int:
+        """
+        Queue one task per court in a hierarchy snapshot
+        
+        Tasks carry no captcha: the portal shows a new one after every
+        submit, so each worker solves the captchas of its own session.
+        
+        Args:
+            snapshot: Court hierarchy snapshot
+            date: Date in DD-MM-YYYY format
+        
+        Returns:
+            Number of new tasks queued
+        """
+        courts = interleave_by_state(list(iter_courts(snapshot)))
+        tasks = [(get_task_id(date, court), dict(court, date=date)) for court in courts]
+        added = self.work_queue.enqueue(tasks)
+        logger.info(f"Queued {added} of {len(tasks)} court tasks for {date}")
+        return added
+    
+    def run(self, stop_event: Optional[threading.Event] = None, interval: float = REQUEUE_INTERVAL) -> Dict:
+        """
+        Re-queue expired leases until every task is done or failed
+        
+        Returns:
+            Final queue statistics
+        """
+        stop_event = stop_event or threading.Event()
+        
+        while not stop_event.is_set():
+            self.work_queue.requeue_expired()
+            stats = self.work_queue.get_stats()
+            tasks = stats['tasks']
+            logger.info(f"Crawl progress: {tasks['done']} done, {tasks['failed']} failed, "
+                        f"{tasks['leased']} in progress, {tasks['pending']} pending, "
+                        f"{len(stats['workers'])} workers")
+            
+            if tasks['pending'] == 0 and tasks['leased'] == 0:
+                break
+            stop_event.wait(interval)
+        
+        return self.work_queue.get_stats()
+
+
+class CrawlWorker:
+    """Pulls court tasks from the queue and downloads them on one long-lived browser"""
+    
+    def __init__(self, work_queue, captcha_solver: Callable[[str], str], worker_id: Optional[str] = None,
+                 pdf_manager: Optional[PDFDownloadManager] = None,
+                 lease_seconds: float = DEFAULT_LEASE_SECONDS):
+        """
+        Args:
+            work_queue: Queue shared with the coordinator
+            captcha_solver: Solves each captcha image shown on this worker's browser
+            worker_id: Name in queue statistics (default: host and process ID)
+            pdf_manager: Decides where cause lists are saved
+            lease_seconds: Seconds the worker holds a task between heartbeats
+        """
+        self.work_queue = work_queue
+        self.captcha_solver = captcha_solver
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.pdf_manager = pdf_manager or PDFDownloadManager()
+        self.lease_seconds = lease_seconds
+        self.current_task = None
+        self.stop_event = threading.Event()
+    
+    def _heartbeat_loop(self):
+        """Keep the worker registered and its lease alive while a download runs"""
+        while not self.stop_event.wait(self.lease_seconds / 3):
+            try:
+                if not self.work_queue.heartbeat(self.worker_id, self.current_task, self.lease_seconds):
+                    logger.warning(f"Lease on {self.current_task} lost to another worker")
+            except Exception as e:
+                logger.error(f"Heartbeat failed: {e}")
+    
+    def process_task(self, downloader, task: Dict) -> Dict:
+        """
+        Download one court's cause list, solving a fresh captcha for each submit
+        
+        Returns:
+            Result with the saved path, size and host
+        """
+        pdf_content = downloader.download_cause_list(
+            task['state'], task['district'], task['complex_name'],
+            task['court_name'], task['date'], self.captcha_solver
+        )
+        
+        filepath = self.pdf_manager.get_pdf_path(task['state'], task['district'], task['court_name'], task['date'])
+        with open(filepath, 'wb') as f:
+            f.write(pdf_content)
+        
+        return {'path': str(filepath), 'bytes': len(pdf_content), 'host': socket.gethostname()}
+    
+    def run(self, exit_when_idle: bool = True) -> Dict[str, int]:
+        """
+        Work through queued tasks
+        
+        Args:
+            exit_when_idle: Stop when the queue has nothing pending instead of polling
+        
+        Returns:
+            Counts of completed and failed tasks
+        """
+        counts = {'completed': 0, 'failed': 0, 'requeued': 0}
+        rejections = 0
+        heartbeat = threading.Thread(target=self._heartbeat_loop, daemon=True)
+        heartbeat.start()
+        logger.info(f"Crawl worker {self.worker_id} started")
+        
+        try:
+            with CauseListDownloader() as downloader:
+                while not self.stop_event.is_set():
+                    leased = self.work_queue.lease(self.worker_id, self.lease_seconds)
+                    if leased is None:
+                        if exit_when_idle:
+                            break
+                        self.stop_event.wait(IDLE_POLL_INTERVAL)
+                        continue
+                    
+                    task_id, task = leased
+                    self.current_task = task_id
+                    try:
+                        result = self.process_task(downloader, task)
+                        rejections = 0
+                        if self.work_queue.complete(self.worker_id, task_id, result):
+                            counts['completed'] += 1
+                            metrics.increment('crawl_tasks_completed_total')
+                    except Exception as e:
+                        error = classify_error(e)
+                        logger.error(f"Task {task_id} failed ({error.error_type}): {error}")
+                        metrics.increment('crawl_tasks_failed_total')
+                        
+                        # A rejected captcha says nothing about the court; the next
+                        # lease solves a new one
+                        rejected = isinstance(error, CaptchaRejectedError)
+                        if self.work_queue.fail(self.worker_id, task_id, str(error),
+                                                error.error_type, retry=error.retryable or rejected):
+                            counts['requeued'] += 1
+                        else:
+                            counts['failed'] += 1
+                        
+                        rejections = rejections + 1 if rejected else 0
+                        if rejections >= MAX_CONSECUTIVE_REJECTIONS:
+                            logger.error(f"{rejections} captchas rejected in a row, stopping worker")
+                            break
+                    finally:
+                        self.current_task = None
+        finally:
+            self.stop_event.set()
+            heartbeat.join()
+        
+        logger.info(f"Crawl worker {self.worker_id} finished: {counts}")
+        return counts
+
+
+def main():
+    """Run a crawl coordinator, worker or status check"""
+    parser = argparse.ArgumentParser(description='Distributed eCourts cause list crawl')
+    parser.add_argument('role', choices=['coordinator', 'worker', 'status'])
+    parser.add_argument('--queue', type=str, default='crawl_queue.db',
+                        help='SQLite database path or redis:// URL shared by all nodes (default: crawl_queue.db)')
+    parser.add_argument('--snapshot', type=str, default=DEFAULT_SNAPSHOT_PATH,
+                        help=f'Court hierarchy snapshot for the coordinator (default: {DEFAULT_SNAPSHOT_PATH})')
+    parser.add_argument('--date', type=str, help='Date in DD-MM-YYYY format (coordinator)')
+    parser.add_argument('--captcha-command', type=str,
+                        help='Command reading a captcha PNG on stdin and printing its code (worker; '
+                             'default: prompt on this terminal)')
+    parser.add_argument('--lease', type=float, default=DEFAULT_LEASE_SECONDS,
+                        help=f'Seconds a worker holds a task (default: {DEFAULT_LEASE_SECONDS})')
+    parser.add_argument('--keep-polling', action='store_true', help='Worker waits for new tasks instead of exiting')
+    args = parser.parse_args()
+    
+    work_queue = open_work_queue(args.queue)
+    
+    try:
+        if args.role == 'coordinator':
+            if not args.date:
+                parser.error('coordinator requires --date')
+            coordinator = CrawlCoordinator(work_queue)
+            coordinator.plan(load_snapshot(args.snapshot), args.date)
+            stats = coordinator.run()
+        elif args.role == 'worker':
+            if args.captcha_command:
+                captcha_solver = command_captcha_solver(args.captcha_command)
+            elif sys.stdin.isatty():
+                captcha_solver = prompt_captcha
+            else:
+                parser.error('worker without a terminal requires --captcha-command')
+            worker = CrawlWorker(work_queue, captcha_solver, lease_seconds=args.lease)
+            worker.run(exit_when_idle=not args.keep_polling)
+            stats = work_queue.get_stats()
+        else:
+            stats = work_queue.get_stats()
+        
+        print(f"[*] Tasks: {stats['tasks']}")
+        for worker_id, worker in stats['workers'].items():
+            print(f"    {worker_id}: last seen {time.time() - worker['last_heartbeat']:.0f}s ago")
+    
+    except ECourtsError as e:
+        print(f"[!] Error ({e.error_type}): {e}")
+    except KeyboardInterrupt:
+        print("\n[!] Crawl interrupted; leased tasks will be re-queued when their leases expire")
+
+
+if __name__ == '__main__':
+    main()
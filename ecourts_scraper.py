@@ -3,19 +3,62 @@ eCourts Web Scraper Module
 Handles all web scraping operations for the eCourts website
 """
 
-import requests
-from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import Select, WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
 import time
 import base64
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple, Union
+import importlib
 import logging
+import os
+import shlex
+import signal
+import subprocess
+from metrics import metrics
+from rate_limiter import portal_traffic
+from resilience import call_with_retry, with_retry, portal_breaker
+from scraper_errors import (
+    CaptchaRejectedError, PDFNotFoundError, PortalUnavailableError, classify_error
+)
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# Selenium, webdriver_manager, requests and BeautifulSoup are imported where
+# they are first used, so importing this module (e.g. for `cli.py --help` or
+# cache-only answers) does not load them
+if TYPE_CHECKING:
+    import requests
+
+
+# The Selenium helpers used across the scrapers are module-level stand-ins
+# that import on first attribute access or call
+class _LazyImport:
+    """Stands in for a module, or a name imported from it, importing it on first use"""
+    
+    def __init__(self, module: str, name: Optional[str] = None):
+        self._module = module
+        self._name = name
+        self._target = None
+    
+    def _load(self):
+        if self._target is None:
+            module = importlib.import_module(self._module)
+            self._target = getattr(module, self._name) if self._name else module
+        return self._target
+    
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+    
+    def __call__(self, *args, **kwargs):
+        return self._load()(*args, **kwargs)
+
+
+By = _LazyImport('selenium.webdriver.common.by', 'By')
+Select = _LazyImport('selenium.webdriver.support.ui', 'Select')
+WebDriverWait = _LazyImport('selenium.webdriver.support.ui', 'WebDriverWait')
+EC = _LazyImport('selenium.webdriver.support.expected_conditions')
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -24,15 +67,197 @@ logger = logging.getLogger(__name__)
 ECOURTS_URL = "https://services.ecourts.gov.in/ecourtindia_v6/?p=cause_list/"
 CASE_SEARCH_URL = "https://services.ecourts.gov.in/ecourtindia_v6/?p=case_status"
 
+REQUEST_TIMEOUT = 30
+
+# Page titles served by the portal or its proxies when it is overloaded or blocking us
+ERROR_PAGE_MARKERS = ('Bad Gateway', 'Service Unavailable', 'Gateway Time-out', 'Too Many Requests', 'Access Denied')
+
+# Messages shown by the portal when the captcha code is wrong
+CAPTCHA_ERROR_MARKERS = ('invalid captcha', 'captcha mismatch', 'enter valid captcha')
+
+# Resource blocking applied to every browser ('full' disables it)
+RESOURCE_PROFILE_ENV = 'ECOURTS_RESOURCE_PROFILE'
+DEFAULT_RESOURCE_PROFILE = 'scrape'
+
+# URL patterns blocked at the network layer for each profile. Chrome's
+# Network.setBlockedURLs only takes a blocklist, so the scrape profile blocks
+# by file type and known third-party hosts; the captcha (a PHP endpoint), the
+# form's own scripts and the cause list iframe never match these patterns.
+RESOURCE_PROFILES = {
+    'full': [],
+    'scrape': [
+        # Images other than the captcha
+        '*.png', '*.jpg', '*.jpeg', '*.gif', '*.svg', '*.ico', '*.webp', '*.bmp',
+        # Fonts and stylesheets
+        '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot', '*.css',
+        # Media
+        '*.mp4', '*.webm', '*.mp3',
+        # Third-party analytics and widgets
+        '*google-analytics.com*', '*googletagmanager.com*', '*fonts.googleapis.com*',
+        '*fonts.gstatic.com*', '*facebook.net*', '*twitter.com*', '*youtube.com*',
+    ],
+}
+
+# A captcha code, or a callable that solves the captcha image currently shown
+CaptchaSource = Union[str, Callable[[str], str]]
+
+
+def _captcha_png(captcha_image: str) -> bytes:
+    """PNG bytes of a captcha image data URL"""
+    return base64.b64decode(captcha_image.partition(',')[2])
+
+
+def prompt_captcha(captcha_image: str) -> str:
+    """Save the captcha shown on the form and read its code from the terminal"""
+    path = os.path.abspath('captcha.png')
+    with open(path, 'wb') as f:
+        f.write(_captcha_png(captcha_image))
+    return input(f"[?] Captcha saved to {path}, enter its code: ").strip()
+
+
+def command_captcha_solver(command: str, timeout: float = 120) -> Callable[[str], str]:
+    """
+    Solve each captcha with an external command
+    
+    The command gets the captcha PNG on stdin and prints its code on stdout.
+    """
+    def solve(captcha_image: str) -> str:
+        completed = subprocess.run(shlex.split(command), input=_captcha_png(captcha_image),
+                                   capture_output=True, timeout=timeout, check=True)
+        return completed.stdout.decode('utf-8', 'replace').strip()
+    return solve
+
+# Restart a browser after this many navigations or above this resident memory,
+# checking memory every MEMORY_CHECK_INTERVAL navigations
+MAX_PAGES_PER_BROWSER = 200
+MAX_BROWSER_RSS_MB = 1500
+MEMORY_CHECK_INTERVAL = 10
+
+
+def _process_tree(root_pid: int) -> List[int]:
+    """PIDs of a process and all its descendants"""
+    if psutil:
+        try:
+            root = psutil.Process(root_pid)
+            return [root_pid] + [child.pid for child in root.children(recursive=True)]
+        except psutil.Error:
+            return []
+    
+    # Without psutil, walk parent links in /proc (Linux only)
+    children = {}
+    for entry in os.listdir('/proc') if os.path.isdir('/proc') else []:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                # The command name may contain spaces; fields resume after its closing parenthesis
+                ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+    
+    if not os.path.exists(f'/proc/{root_pid}'):
+        return []
+    
+    pids, pending = [], [root_pid]
+    while pending:
+        pid = pending.pop()
+        pids.append(pid)
+        pending.extend(children.get(pid, []))
+    return pids
+
+
+def _process_rss(pid: int) -> int:
+    """Resident memory of one process in bytes, 0 if it is gone"""
+    if psutil:
+        try:
+            return psutil.Process(pid).memory_info().rss
+        except psutil.Error:
+            return 0
+    try:
+        with open(f'/proc/{pid}/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, IndexError, ValueError):
+        return 0
+
+
+def _is_browser_process(pid: int) -> bool:
+    """Check a PID still belongs to chromedriver or Chrome, not a process that reused it"""
+    if psutil:
+        try:
+            return 'chrom' in psutil.Process(pid).name().lower()
+        except psutil.Error:
+            return False
+    try:
+        with open(f'/proc/{pid}/comm') as f:
+            return 'chrom' in f.read().lower()
+    except OSError:
+        return False
+
+
+def reap_processes(pids: List[int]) -> int:
+    """
+    Kill browser processes that outlived their session and collect their exit status
+    
+    Args:
+        pids: chromedriver and Chrome PIDs recorded while the session was running
+    
+    Returns:
+        Number of processes that had to be killed or reaped
+    """
+    reaped = 0
+    for pid in pids:
+        if _is_browser_process(pid):
+            try:
+                os.kill(pid, signal.SIGKILL)
+                reaped += 1
+            except (ProcessLookupError, PermissionError):
+                pass
+        
+        # chromedriver is our child; without a wait it lingers as a zombie
+        try:
+            if os.waitpid(pid, os.WNOHANG)[0] == pid:
+                reaped += 1
+        except ChildProcessError:
+            pass
+    
+    if reaped:
+        logger.warning(f"Reaped {reaped} leftover browser processes")
+        metrics.increment('browser_processes_reaped_total', reaped)
+    return reaped
+
+
+def portal_get(url: str) -> 'requests.Response':
+    """Fetch a portal resource through the shared rate limiter"""
+    import requests
+    with portal_traffic.request('fetch') as outcome:
+        response = requests.get(url, timeout=REQUEST_TIMEOUT)
+        if response.status_code == 429 or response.status_code >= 500:
+            outcome['success'] = False
+            raise PortalUnavailableError(f"Portal returned HTTP {response.status_code} for {url}")
+        return response
+
 
 class ECourtsDriver:
     """Manages Selenium WebDriver for eCourts interactions"""
     
-    def __init__(self):
+    def __init__(self, resource_profile: Optional[str] = None,
+                 max_pages: int = MAX_PAGES_PER_BROWSER, max_rss_mb: int = MAX_BROWSER_RSS_MB):
         self.driver = None
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self.pages_served = 0
+        self.rss_mb = 0.0
+        self.process_pids: List[int] = []
+        self.resource_profile = resource_profile or os.environ.get(RESOURCE_PROFILE_ENV, DEFAULT_RESOURCE_PROFILE)
+        if self.resource_profile not in RESOURCE_PROFILES:
+            raise ValueError(f"Unknown resource profile: {self.resource_profile}")
     
     def initialize(self):
         """Initialize Chrome WebDriver with appropriate options"""
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service
+        from webdriver_manager.chrome import ChromeDriverManager
         options = webdriver.ChromeOptions()
         options.add_argument('--start-maximized')
         options.add_argument('--disable-blink-features=AutomationControlled')
@@ -42,26 +267,124 @@ class ECourtsDriver:
         
         service = Service(ChromeDriverManager().install())
         self.driver = webdriver.Chrome(service=service, options=options)
+        self.pages_served = 0
+        self.process_pids = self.get_process_pids()
+        self.apply_resource_profile()
         logger.info("WebDriver initialized successfully")
     
+    def apply_resource_profile(self):
+        """Block the profile's resource URLs for every page this browser loads"""
+        blocked_urls = RESOURCE_PROFILES[self.resource_profile]
+        if not blocked_urls:
+            return
+        
+        try:
+            self.driver.execute_cdp_cmd('Network.enable', {})
+            self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': blocked_urls})
+            logger.info(f"Blocking {len(blocked_urls)} resource patterns ({self.resource_profile} profile)")
+        except Exception as e:
+            # Blocking only saves bandwidth, so scrape without it rather than fail
+            logger.warning(f"Could not apply resource profile {self.resource_profile}: {e}")
+    
     def quit(self):
-        """Close the WebDriver"""
+        """Close the WebDriver and reap any of its processes left running"""
         if self.driver:
-            self.driver.quit()
+            # Chrome may have started renderers since the last check
+            pids = set(self.process_pids) | set(self.get_process_pids())
+            try:
+                self.driver.quit()
+            except Exception as e:
+                logger.warning(f"Error closing WebDriver: {e}")
+            self.driver = None
+            self.process_pids = []
+            reap_processes(sorted(pids))
             logger.info("WebDriver closed")
     
+    def get_process_pids(self) -> List[int]:
+        """PIDs of chromedriver and the Chrome processes it started"""
+        try:
+            return _process_tree(self.driver.service.process.pid)
+        except AttributeError:
+            return []
+    
+    def get_memory_mb(self) -> float:
+        """Resident memory of chromedriver and all its Chrome processes in MB"""
+        self.process_pids = self.get_process_pids() or self.process_pids
+        self.rss_mb = sum(_process_rss(pid) for pid in self.process_pids) / (1024 * 1024)
+        metrics.set_gauge('browser_rss_mb', round(self.rss_mb, 1))
+        return self.rss_mb
+    
+    def needs_recycle(self) -> Optional[str]:
+        """Reason the browser should be restarted before the next navigation, if any"""
+        if self.pages_served >= self.max_pages:
+            return 'pages'
+        if self.pages_served and self.pages_served % MEMORY_CHECK_INTERVAL == 0:
+            if self.get_memory_mb() >= self.max_rss_mb:
+                return 'memory'
+        return None
+    
+    def recycle(self, reason: str):
+        """Replace the browser with a fresh one"""
+        logger.info(f"Recycling browser after {self.pages_served} pages "
+                    f"({self.rss_mb:.0f} MB, reason: {reason})")
+        metrics.increment('browser_recycles_total')
+        metrics.increment(f'browser_recycles_{reason}_total')
+        self.quit()
+        self.initialize()
+    
+    def is_alive(self) -> bool:
+        """Check whether the browser session still responds"""
+        if not self.driver:
+            return False
+        try:
+            self.driver.current_url
+            return True
+        except Exception:
+            return False
+    
     def get(self, url: str):
         """Navigate to a URL"""
-        self.driver.get(url)
+        # Every scrape starts with a navigation, so recycling here never interrupts one
+        reason = self.needs_recycle()
+        if reason:
+            self.recycle(reason)
+        
+        with portal_traffic.request('navigate') as outcome:
+            self.pages_served += 1
+            self.driver.get(url)
+            if self.is_error_page():
+                outcome['success'] = False
+                raise PortalUnavailableError(f"Portal error page: {self.driver.title}")
         logger.info(f"Navigated to {url}")
     
-    def wait_for_element(self, by: By, value: str, timeout: int = 10):
+    def submit(self, element, settle: float = 3):
+        """Click a form's submit button and give the portal time to respond"""
+        with portal_traffic.request('submit') as outcome:
+            # A submit loads a page too; forms reused across submits never call get()
+            self.pages_served += 1
+            element.click()
+            time.sleep(settle)
+            if self.is_error_page():
+                outcome['success'] = False
+                raise PortalUnavailableError(f"Portal error page: {self.driver.title}")
+    
+    def is_error_page(self) -> bool:
+        """Check whether the portal answered with an error page"""
+        title = self.driver.title or ''
+        return any(marker in title for marker in ERROR_PAGE_MARKERS)
+    
+    def is_captcha_rejected(self) -> bool:
+        """Check whether the portal rejected the submitted captcha"""
+        page_text = self.driver.find_element(By.TAG_NAME, "body").text.lower()
+        return any(marker in page_text for marker in CAPTCHA_ERROR_MARKERS)
+    
+    def wait_for_element(self, by: str, value: str, timeout: int = 10):
         """Wait for an element to be present"""
         return WebDriverWait(self.driver, timeout).until(
             EC.presence_of_element_located((by, value))
         )
     
-    def wait_for_elements(self, by: By, value: str, timeout: int = 10):
+    def wait_for_elements(self, by: str, value: str, timeout: int = 10):
         """Wait for elements to be present"""
         return WebDriverWait(self.driver, timeout).until(
             EC.presence_of_all_elements_located((by, value))
@@ -71,15 +394,21 @@ class ECourtsDriver:
 class ECourtsScraperBase:
     """Base class for eCourts scraping operations"""
     
-    def __init__(self):
-        self.driver_manager = ECourtsDriver()
+    def __init__(self, driver_manager: Optional[ECourtsDriver] = None):
+        # A driver passed in is already running and owned by the caller (e.g. a browser pool)
+        self.owns_driver = driver_manager is None
+        self.driver_manager = driver_manager or ECourtsDriver()
     
     def __enter__(self):
-        self.driver_manager.initialize()
+        # Don't pay for a browser launch while the portal is known to be down
+        portal_breaker.raise_if_open()
+        if self.owns_driver:
+            self.driver_manager.initialize()
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.driver_manager.quit()
+        if self.owns_driver:
+            self.driver_manager.quit()
     
     @property
     def driver(self):
@@ -89,6 +418,7 @@ class ECourtsScraperBase:
 class CauseListScraper(ECourtsScraperBase):
     """Scrapes cause lists from eCourts"""
     
+    @with_retry
     def get_states(self) -> List[str]:
         """Fetch list of states"""
         try:
@@ -101,8 +431,9 @@ class CauseListScraper(ECourtsScraperBase):
             return states
         except Exception as e:
             logger.error(f"Error fetching states: {e}")
-            return []
+            raise classify_error(e) from e
     
+    @with_retry
     def get_districts(self, state: str) -> List[str]:
         """Fetch districts for a given state"""
         try:
@@ -119,8 +450,9 @@ class CauseListScraper(ECourtsScraperBase):
             return districts
         except Exception as e:
             logger.error(f"Error fetching districts: {e}")
-            return []
+            raise classify_error(e) from e
     
+    @with_retry
     def get_court_complexes(self, state: str, district: str) -> List[str]:
         """Fetch court complexes for a given state and district"""
         try:
@@ -141,8 +473,9 @@ class CauseListScraper(ECourtsScraperBase):
             return complexes
         except Exception as e:
             logger.error(f"Error fetching court complexes: {e}")
-            return []
+            raise classify_error(e) from e
     
+    @with_retry
     def get_courts(self, state: str, district: str, complex_name: str) -> List[str]:
         """Fetch court names for a given complex"""
         try:
@@ -167,8 +500,9 @@ class CauseListScraper(ECourtsScraperBase):
             return courts
         except Exception as e:
             logger.error(f"Error fetching courts: {e}")
-            return []
+            raise classify_error(e) from e
     
+    @with_retry
     def get_captcha(self) -> Optional[str]:
         """Fetch captcha image as base64"""
         try:
@@ -181,16 +515,17 @@ class CauseListScraper(ECourtsScraperBase):
             if captcha_src.startswith('data:'):
                 return captcha_src
             else:
-                response = requests.get(captcha_src)
+                response = portal_get(captcha_src)
                 return f"data:image/png;base64,{base64.b64encode(response.content).decode()}"
         except Exception as e:
             logger.error(f"Error fetching captcha: {e}")
-            return None
+            raise classify_error(e) from e
 
 
 class CaseSearchScraper(ECourtsScraperBase):
     """Scrapes case information from eCourts"""
     
+    @with_retry
     def search_case_by_cnr(self, cnr: str) -> Optional[Dict]:
         """Search for a case using CNR (Case Number Reference)"""
         try:
@@ -203,9 +538,7 @@ class CaseSearchScraper(ECourtsScraperBase):
             
             # Submit form
             submit_btn = self.driver.find_element(By.ID, "submit_btn")
-            submit_btn.click()
-            
-            time.sleep(3)
+            self.driver_manager.submit(submit_btn)
             
             # Parse results
             result = self._parse_case_results()
@@ -213,8 +546,9 @@ class CaseSearchScraper(ECourtsScraperBase):
             return result
         except Exception as e:
             logger.error(f"Error searching case by CNR: {e}")
-            return None
+            raise classify_error(e) from e
     
+    @with_retry
     def search_case_by_details(self, case_type: str, case_number: str, year: str) -> Optional[Dict]:
         """Search for a case using case type, number, and year"""
         try:
@@ -238,9 +572,7 @@ class CaseSearchScraper(ECourtsScraperBase):
             
             # Submit form
             submit_btn = self.driver.find_element(By.ID, "submit_btn")
-            submit_btn.click()
-            
-            time.sleep(3)
+            self.driver_manager.submit(submit_btn)
             
             # Parse results
             result = self._parse_case_results()
@@ -248,10 +580,11 @@ class CaseSearchScraper(ECourtsScraperBase):
             return result
         except Exception as e:
             logger.error(f"Error searching case by details: {e}")
-            return None
+            raise classify_error(e) from e
     
     def _parse_case_results(self) -> Dict:
         """Parse case search results from the page"""
+        from bs4 import BeautifulSoup
         try:
             page_source = self.driver.page_source
             soup = BeautifulSoup(page_source, 'html.parser')
@@ -314,64 +647,207 @@ class CaseSearchScraper(ECourtsScraperBase):
 class CauseListDownloader(ECourtsScraperBase):
     """Downloads cause lists from eCourts"""
     
+    # Select element IDs for each level of the court hierarchy
+    FORM_FIELDS = {
+        'state': 'state_code',
+        'district': 'district_code',
+        'complex_name': 'court_complex_code',
+        'court_name': 'court_name_code',
+    }
+    
+    def __init__(self, driver_manager: Optional[ECourtsDriver] = None):
+        super().__init__(driver_manager)
+        # Court and date of the form currently filled in, for error messages
+        self.form = {}
+    
     def download_cause_list(self, state: str, district: str, complex_name: str, 
-                           court_name: str, date: str, captcha: str) -> Optional[bytes]:
-        """Download cause list PDF for a specific court"""
+                           court_name: str, date: str, captcha: CaptchaSource) -> Optional[bytes]:
+        """
+        Download cause list PDF for a specific court
+        
+        When the page still holds the form for this court's complex from the
+        previous download, only the court and date are changed before
+        resubmitting.
+        
+        Only a callable captcha is retried: a failed attempt leaves the page
+        showing a new captcha, which a typed code cannot answer.
+        
+        Args:
+            captcha: Captcha code, or a callable given the captcha currently
+                     shown (as a data URL) that returns its code; use a
+                     callable when the portal issues a new captcha per submit
+        """
+        return call_with_retry(
+            self._download_cause_list, state, district, complex_name, court_name, date, captcha,
+            policies=None if callable(captcha) else {}
+        )
+    
+    def _download_cause_list(self, state: str, district: str, complex_name: str,
+                             court_name: str, date: str, captcha: CaptchaSource) -> Optional[bytes]:
         try:
-            self.driver_manager.get(ECOURTS_URL)
-            self.driver_manager.wait_for_elements(By.TAG_NAME, "select")
-            
-            # Select state
-            state_select = Select(self.driver.find_element(By.ID, "state_code"))
-            state_select.select_by_visible_text(state)
-            time.sleep(1)
-            
-            # Select district
-            district_select = Select(self.driver.find_element(By.ID, "district_code"))
-            district_select.select_by_visible_text(district)
-            time.sleep(1)
-            
-            # Select complex
-            complex_select = Select(self.driver.find_element(By.ID, "court_complex_code"))
-            complex_select.select_by_visible_text(complex_name)
-            time.sleep(1)
-            
-            # Select court
-            court_select = Select(self.driver.find_element(By.ID, "court_name_code"))
-            court_select.select_by_visible_text(court_name)
-            time.sleep(1)
-            
-            # Enter date
-            date_input = self.driver.find_element(By.ID, "cause_list_date")
-            date_input.clear()
-            date_input.send_keys(date)
-            
-            # Enter captcha
-            captcha_input = self.driver.find_element(By.ID, "captcha_code")
-            captcha_input.send_keys(captcha)
-            
-            # Submit form
-            submit_btn = self.driver.find_element(By.ID, "submit_btn")
-            submit_btn.click()
-            
-            time.sleep(3)
-            
-            # Get PDF from iframe
-            pdf_url = self.driver.execute_script("""
-                var iframe = document.querySelector('iframe');
-                if (iframe) {
-                    return iframe.src;
-                }
-                return null;
-            """)
-            
-            if pdf_url:
-                response = requests.get(pdf_url)
-                logger.info(f"Downloaded cause list for {court_name} on {date}")
-                return response.content
-            
-            logger.warning(f"PDF not found for {court_name}")
-            return None
+            self._prepare_form(state, district, complex_name, court_name, date)
+            return self._submit_form(captcha(self.get_current_captcha()) if callable(captcha) else captcha)
         except Exception as e:
+            # The page is in an unknown state; the next attempt starts from a fresh load
+            self.form = {}
             logger.error(f"Error downloading cause list: {e}")
-            return None
+            raise classify_error(e) from e
+    
+    @with_retry
+    def load_form(self, state: str, district: str, complex_name: str,
+                  court_name: str, date: str) -> str:
+        """
+        Fill in the cause list form for a court, leaving only the captcha
+        
+        Returns:
+            The captcha shown on the loaded form, as a data URL
+        """
+        try:
+            self._fill_form(state, district, complex_name, court_name, date)
+            return self.get_current_captcha()
+        except Exception as e:
+            logger.error(f"Error loading cause list form: {e}")
+            raise classify_error(e) from e
+    
+    def get_current_captcha(self) -> str:
+        """
+        Capture the captcha shown on the current page as a data URL
+        
+        The image is read from the rendered page rather than fetched again,
+        since every fetch of the captcha URL issues a new code.
+        """
+        captcha_img = self.driver_manager.wait_for_element(By.ID, "captcha_image")
+        return f"data:image/png;base64,{captcha_img.screenshot_as_base64}"
+    
+    def submit_captcha(self, captcha: str) -> bytes:
+        """
+        Submit the form loaded by load_form with the solved captcha
+        
+        Not retried: a submitted captcha is spent, so a failure needs a fresh load_form.
+        
+        Returns:
+            PDF content
+        """
+        try:
+            return self._submit_form(captcha)
+        except Exception as e:
+            logger.error(f"Error submitting cause list form: {e}")
+            raise classify_error(e) from e
+    
+    def _prepare_form(self, state: str, district: str, complex_name: str, court_name: str, date: str):
+        """Reuse the loaded form when it is on the same complex, otherwise load and fill it"""
+        # Only a fresh load may recycle the browser, so don't reuse a form on one that is due
+        if (self.driver_manager.needs_recycle()
+                or not self._form_matches(state=state, district=district, complex_name=complex_name)):
+            self._fill_form(state, district, complex_name, court_name, date)
+            return
+        
+        # The portal may have reset the court select after the last submit
+        if not self._form_matches(court_name=court_name):
+            self._select_court(court_name)
+            metrics.increment('cause_list_court_switches_total')
+        self._set_date(date)
+        metrics.increment('cause_list_form_reuses_total')
+    
+    def _form_matches(self, **selection: str) -> bool:
+        """
+        Check that the page still shows the form last filled in with these selections
+        
+        The portal may reset the form or navigate away after a submit, so the
+        selects on the page are checked, not just what was last chosen.
+        """
+        if not self.form or any(self.form.get(key) != value for key, value in selection.items()):
+            return False
+        
+        try:
+            for key, value in selection.items():
+                selected = Select(self.driver.find_element(By.ID, self.FORM_FIELDS[key])).first_selected_option
+                if selected.text != value:
+                    return False
+            return True
+        except Exception:
+            return False
+    
+    def _select_court(self, court_name: str):
+        """Change only the court on the loaded form"""
+        court_select = Select(self.driver.find_element(By.ID, "court_name_code"))
+        court_select.select_by_visible_text(court_name)
+        time.sleep(1)
+        self.form['court_name'] = court_name
+    
+    def _set_date(self, date: str):
+        """Change only the date on the loaded form"""
+        date_input = self.driver.find_element(By.ID, "cause_list_date")
+        date_input.clear()
+        date_input.send_keys(date)
+        self.form['date'] = date
+    
+    def _fill_form(self, state: str, district: str, complex_name: str, court_name: str, date: str):
+        """Load the cause list page and select the court and date"""
+        self.driver_manager.get(ECOURTS_URL)
+        self.driver_manager.wait_for_elements(By.TAG_NAME, "select")
+        
+        # Select state
+        state_select = Select(self.driver.find_element(By.ID, "state_code"))
+        state_select.select_by_visible_text(state)
+        time.sleep(1)
+        
+        # Select district
+        district_select = Select(self.driver.find_element(By.ID, "district_code"))
+        district_select.select_by_visible_text(district)
+        time.sleep(1)
+        
+        # Select complex
+        complex_select = Select(self.driver.find_element(By.ID, "court_complex_code"))
+        complex_select.select_by_visible_text(complex_name)
+        time.sleep(1)
+        
+        # Select court
+        court_select = Select(self.driver.find_element(By.ID, "court_name_code"))
+        court_select.select_by_visible_text(court_name)
+        time.sleep(1)
+        
+        # Enter date
+        date_input = self.driver.find_element(By.ID, "cause_list_date")
+        date_input.clear()
+        date_input.send_keys(date)
+        
+        self.form = {
+            'state': state, 'district': district, 'complex_name': complex_name,
+            'court_name': court_name, 'date': date
+        }
+    
+    def _submit_form(self, captcha: str) -> bytes:
+        """Enter the captcha, submit the filled form and fetch the resulting PDF"""
+        court_name, date = self.form.get('court_name'), self.form.get('date')
+        
+        # Enter captcha
+        captcha_input = self.driver.find_element(By.ID, "captcha_code")
+        captcha_input.clear()
+        captcha_input.send_keys(captcha)
+        
+        # Submit form
+        submit_btn = self.driver.find_element(By.ID, "submit_btn")
+        self.driver_manager.submit(submit_btn)
+        
+        if self.driver_manager.is_captcha_rejected():
+            raise CaptchaRejectedError(f"Captcha rejected for {court_name} on {date}")
+        
+        # Get PDF from iframe
+        pdf_url = self.driver.execute_script("""
+            var iframe = document.querySelector('iframe');
+            if (iframe) {
+                return iframe.src;
+            }
+            return null;
+        """)
+        
+        if not pdf_url:
+            raise PDFNotFoundError(f"PDF not found for {court_name} on {date}")
+        
+        response = portal_get(pdf_url)
+        if response.status_code == 404 or not response.content:
+            raise PDFNotFoundError(f"PDF not found for {court_name} on {date}")
+        
+        logger.info(f"Downloaded cause list for {court_name} on {date}")
+        return response.content
@@ -0,0 +1,190 @@
+"""
+Harvest Module
+Handles checkpointed, resumable cause list harvests across every court in a hierarchy snapshot
+"""
+
+from ecourts_scraper import CaptchaSource
+from pdf_manager import PDFDownloadManager
+from court_hierarchy import load_snapshot, iter_courts, interleave_by_state
+from distributed_crawl import get_task_id
+from metrics import metrics
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from datetime import datetime
+import json
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# Courts downloaded between manifest updates
+HARVEST_BATCH_SIZE = 50
+
+# Failures that will not change on retry for the same date
+FINAL_ERROR_TYPES = ('pdf_absent',)
+
+# Failures of the captcha rather than the court; not recorded against the court
+CAPTCHA_ERROR_TYPES = ('captcha_rejected', 'captcha_spent')
+
+
+class HarvestJob:
+    """
+    Downloads every court's cause list for a date, resuming from its checkpoint
+    
+    The portal shows a new captcha after every submit, so a harvest needs a
+    callable captcha source solving each one; a typed code downloads one court.
+    """
+    
+    def __init__(self, snapshot_path: str, date: str, captcha: CaptchaSource,
+                 harvest_dir: str = 'harvests', pdf_manager: Optional[PDFDownloadManager] = None,
+                 batch_size: int = HARVEST_BATCH_SIZE):
+        self.snapshot_path = snapshot_path
+        self.date = date
+        self.captcha = captcha
+        self.batch_size = batch_size
+        self.pdf_manager = pdf_manager or PDFDownloadManager()
+        self.job_dir = Path(harvest_dir) / date
+        self.job_dir.mkdir(parents=True, exist_ok=True)
+        self.checkpoint_path = self.job_dir / 'checkpoint.jsonl'
+        self.manifest_path = self.job_dir / 'manifest.json'
+    
+    def load_checkpoint(self) -> Dict[str, Dict]:
+        """Latest recorded outcome of each court, keyed by task ID"""
+        outcomes = {}
+        if not self.checkpoint_path.exists():
+            return outcomes
+        
+        with open(self.checkpoint_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A line cut short by a crash; the court is simply retried
+                    continue
+                outcomes[record['task_id']] = record
+        return outcomes
+    
+    def get_remaining(self, courts: List[Dict], outcomes: Dict[str, Dict]) -> List[Dict]:
+        """Courts without a download or a final failure in the checkpoint"""
+        remaining = []
+        for court in courts:
+            outcome = outcomes.get(get_task_id(self.date, court))
+            if outcome and (outcome['status'] == 'downloaded' or outcome.get('error_type') in FINAL_ERROR_TYPES):
+                continue
+            remaining.append(court)
+        return remaining
+    
+    def run(self, progress_callback: Optional[Callable[[str, Dict], None]] = None) -> Dict:
+        """
+        Harvest the remaining courts, checkpointing each outcome as it happens
+        
+        Args:
+            progress_callback: Receives download events, see PDFDownloadManager.download_multiple_pdfs
+        
+        Returns:
+            The harvest manifest
+        """
+        courts = interleave_by_state(list(iter_courts(load_snapshot(self.snapshot_path))))
+        outcomes = self.load_checkpoint()
+        remaining = self.get_remaining(courts, outcomes)
+        
+        logger.info(f"Harvest {self.date}: {len(courts)} courts, {len(courts) - len(remaining)} already done, "
+                    f"{len(remaining)} to go")
+        
+        session = {'started_at': datetime.now().isoformat(), 'courts': 0, 'bytes': 0}
+        started = time.monotonic()
+        
+        try:
+            with open(self.checkpoint_path, 'a', encoding='utf-8') as checkpoint:
+                for start in range(0, len(remaining), self.batch_size):
+                    batch = remaining[start:start + self.batch_size]
+                    
+                    def record(event: str, data: Dict):
+                        # Courts skipped for a used-up captcha were never tried
+                        if event in ('downloaded', 'failed') and data.get('error_type') != 'captcha_spent':
+                            court = batch[data['index'] - 1]
+                            outcome = {
+                                'task_id': get_task_id(self.date, court),
+                                'state': court['state'],
+                                'status': event,
+                                'path': data.get('path'),
+                                'bytes': data.get('bytes', 0),
+                                'error': data.get('reason'),
+                                'error_type': data.get('error_type') if event == 'failed' else None,
+                                'finished_at': datetime.now().isoformat()
+                            }
+                            checkpoint.write(json.dumps(outcome, ensure_ascii=False) + '\n')
+                            checkpoint.flush()
+                            outcomes[outcome['task_id']] = outcome
+                            session['courts'] += 1
+                            session['bytes'] += outcome['bytes']
+                            metrics.increment(f'harvest_courts_{event}_total')
+                        if progress_callback:
+                            progress_callback(event, data)
+                    
+                    downloads = [dict(court, date=self.date, captcha=self.captcha) for court in batch]
+                    results = self.pdf_manager.download_multiple_pdfs(downloads, record)
+                    self.write_manifest(courts, outcomes, session, time.monotonic() - started)
+                    
+                    # A typed code downloads one court; the rest of the harvest needs new ones
+                    if not callable(self.captcha) and any(error.get('error_type') in CAPTCHA_ERROR_TYPES
+                                                          for error in results['errors']):
+                        logger.error("Captcha rejected or used up; resume the harvest with a new captcha")
+                        break
+        finally:
+            manifest = self.write_manifest(courts, outcomes, session, time.monotonic() - started)
+        
+        return manifest
+    
+    def write_manifest(self, courts: List[Dict], outcomes: Dict[str, Dict],
+                       session: Dict, elapsed: float) -> Dict:
+        """
+        Write the harvest summary with totals and this session's throughput
+        
+        Returns:
+            The manifest dictionary
+        """
+        downloaded = [o for o in outcomes.values() if o['status'] == 'downloaded']
+        failed = [o for o in outcomes.values() if o['status'] == 'failed']
+        
+        failures_by_type = {}
+        for outcome in failed:
+            error_type = outcome.get('error_type') or 'error'
+            failures_by_type[error_type] = failures_by_type.get(error_type, 0) + 1
+        
+        by_state = {}
+        for court in courts:
+            state = by_state.setdefault(court['state'], {'courts': 0, 'downloaded': 0, 'failed': 0})
+            state['courts'] += 1
+            outcome = outcomes.get(get_task_id(self.date, court))
+            if outcome:
+                state[outcome['status']] += 1
+        
+        minutes = elapsed / 60
+        manifest = {
+            'date': self.date,
+            'snapshot': str(self.snapshot_path),
+            'updated_at': datetime.now().isoformat(),
+            'total_courts': len(courts),
+            'downloaded': len(downloaded),
+            'failed': len(failed),
+            # Retryable failures are retried on resume, so they still count as remaining
+            'remaining': len(self.get_remaining(courts, outcomes)),
+            'total_bytes': sum(o.get('bytes') or 0 for o in downloaded),
+            'failures_by_type': failures_by_type,
+            'by_state': by_state,
+            'session': {
+                'started_at': session['started_at'],
+                'elapsed_seconds': round(elapsed, 1),
+                'courts_processed': session['courts'],
+                'bytes_downloaded': session['bytes'],
+                'courts_per_minute': round(session['courts'] / minutes, 2) if minutes else 0,
+                'bytes_per_minute': round(session['bytes'] / minutes) if minutes else 0
+            }
+        }
+        
+        tmp_path = self.manifest_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+        tmp_path.replace(self.manifest_path)
+        return manifest
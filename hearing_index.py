@@ -0,0 +1,179 @@
+"""
+Hearing Index Module
+Keeps watched cases ordered by hearing date for range queries without scraping
+"""
+
+from bisect import bisect_left, insort
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from datetime import date, datetime, timedelta
+import json
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_PATH = 'hearing_index.json'
+
+
+def get_index_path(output_dir: str) -> Path:
+    """Index file under an output directory, in a subdirectory its result listings and cleanup skip"""
+    return Path(output_dir) / 'index' / DEFAULT_INDEX_PATH
+
+
+def parse_hearing_date(hearing_date: Optional[str]) -> Optional[date]:
+    """Parse a DD-MM-YYYY hearing date, or None if missing or malformed"""
+    try:
+        return datetime.strptime(hearing_date, '%d-%m-%Y').date()
+    except (TypeError, ValueError):
+        return None
+
+
+def _serial_key(serial_number: Optional[str]) -> int:
+    """Order serial numbers numerically, unknown ones first"""
+    return int(serial_number) if str(serial_number or '').isdigit() else 0
+
+
+class HearingIndex:
+    """
+    Watched cases sorted by (hearing date, case ID), persisted to a JSON file
+    
+    Range queries bisect the sorted keys, so they cost O(log n) plus the
+    size of the answer. Only cases with a known hearing date are indexed.
+    """
+    
+    def __init__(self, path: str = DEFAULT_INDEX_PATH):
+        self.path = Path(path)
+        self.lock = threading.RLock()
+        self.mtime = None
+        self.keys: List[Tuple[str, str]] = []
+        self.entries: Dict[str, Dict] = {}
+        self._load()
+    
+    def _load(self):
+        """Load index entries from disk and sort them"""
+        self.keys, self.entries = [], {}
+        if not self.path.exists():
+            return
+        
+        try:
+            self.mtime = self.path.stat().st_mtime
+            with open(self.path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        except Exception as e:
+            logger.error(f"Error loading hearing index: {e}")
+            return
+        
+        self.entries = {entry['case_id']: entry for entry in entries}
+        self.keys = sorted((entry['date'], entry['case_id']) for entry in entries)
+    
+    def _reload_if_changed(self):
+        """Pick up changes written by another process, such as a running monitor"""
+        try:
+            if self.path.exists() and self.path.stat().st_mtime != self.mtime:
+                self._load()
+        except OSError:
+            pass
+    
+    @property
+    def exists(self) -> bool:
+        return self.path.exists()
+    
+    def save(self):
+        """Write index entries to disk atomically, in date order"""
+        with self.lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump([self.entries[case_id] for _, case_id in self.keys], f, indent=2, ensure_ascii=False)
+            tmp_path.replace(self.path)
+            self.mtime = self.path.stat().st_mtime
+    
+    def _discard(self, case_id: str):
+        entry = self.entries.pop(case_id, None)
+        if entry:
+            key = (entry['date'], case_id)
+            position = bisect_left(self.keys, key)
+            if position < len(self.keys) and self.keys[position] == key:
+                del self.keys[position]
+    
+    def _insert(self, case_id: str, result: Dict) -> bool:
+        hearing = parse_hearing_date(result.get('hearing_date'))
+        if hearing is None:
+            return False
+        
+        entry = {
+            'case_id': case_id,
+            'date': hearing.isoformat(),
+            'hearing_date': result['hearing_date'],
+            'court_name': result.get('court_name'),
+            'serial_number': result.get('serial_number')
+        }
+        self.entries[case_id] = entry
+        insort(self.keys, (entry['date'], case_id))
+        return True
+    
+    def update(self, case_id: str, result: Optional[Dict]):
+        """
+        Index a case's latest search result, replacing its previous hearing
+        
+        Args:
+            case_id: Watched case identifier
+            result: Search result with hearing_date, court_name and serial_number
+        """
+        with self.lock:
+            self._reload_if_changed()
+            previous = self.entries.get(case_id)
+            self._discard(case_id)
+            if result:
+                self._insert(case_id, result)
+            if self.entries.get(case_id) != previous:
+                self.save()
+    
+    def remove(self, case_id: str) -> bool:
+        """Drop a case from the index"""
+        with self.lock:
+            self._reload_if_changed()
+            if case_id not in self.entries:
+                return False
+            self._discard(case_id)
+            self.save()
+            return True
+    
+    def rebuild(self, watchlist_entries: List[Dict]):
+        """Replace the index with the last results of watchlist entries"""
+        with self.lock:
+            self.keys, self.entries = [], {}
+            for entry in watchlist_entries:
+                if entry.get('last_result'):
+                    self._insert(entry['case_id'], entry['last_result'])
+            self.save()
+            logger.info(f"Hearing index rebuilt with {len(self.keys)} of {len(watchlist_entries)} cases")
+    
+    def query(self, start: date, end: date) -> List[Dict]:
+        """
+        Cases with a hearing from start to end inclusive
+        
+        Returns:
+            Index entries in hearing date order
+        """
+        with self.lock:
+            self._reload_if_changed()
+            low = bisect_left(self.keys, (start.isoformat(), ''))
+            high = bisect_left(self.keys, ((end + timedelta(days=1)).isoformat(), ''))
+            return [dict(self.entries[case_id]) for _, case_id in self.keys[low:high]]
+    
+    def query_by_court(self, start: date, end: date) -> Dict[str, List[Dict]]:
+        """
+        Cases with a hearing from start to end inclusive, grouped by court
+        
+        Returns:
+            Court name to entries ordered by hearing date, then serial number
+        """
+        courts = {}
+        for entry in self.query(start, end):
+            courts.setdefault(entry['court_name'] or 'Unknown court', []).append(entry)
+        
+        for entries in courts.values():
+            entries.sort(key=lambda e: (e['date'], _serial_key(e['serial_number'])))
+        return courts
@@ -0,0 +1,44 @@
+"""
+Metrics Module
+Handles in-process counters and gauges for scraping and portal traffic
+"""
+
+from typing import Dict, Any
+from datetime import datetime
+import threading
+
+
+class MetricsRegistry:
+    """Thread-safe registry of named counters and gauges"""
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = {}
+        self.gauges = {}
+    
+    def increment(self, name: str, value: float = 1):
+        """Increase a counter"""
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+    
+    def set_gauge(self, name: str, value: float):
+        """Set a gauge to its current value"""
+        with self.lock:
+            self.gauges[name] = value
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get a snapshot of all metrics
+        
+        Returns:
+            Dictionary with counters, gauges and snapshot timestamp
+        """
+        with self.lock:
+            return {
+                'counters': dict(self.counters),
+                'gauges': dict(self.gauges),
+                'timestamp': datetime.now().isoformat()
+            }
+
+
+metrics = MetricsRegistry()
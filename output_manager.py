@@ -1,22 +1,53 @@
 """
 Output Manager Module
-Handles saving results to JSON and text files
+Handles saving results to JSON and text files, optionally compressed
 """
 
-import json
+from collections.abc import Mapping
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, BinaryIO, Iterable, Optional
 from datetime import datetime
+from serialization import dumps_bytes, loads
+from report_aggregator import ReportAggregator
+import gzip
+import io
 import logging
+import os
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
 
 logger = logging.getLogger(__name__)
 
+# 'none', 'gzip' or 'zstd' (needs the zstandard package)
+RESULT_COMPRESSION_ENV = 'ECOURTS_RESULT_COMPRESSION'
+COMPRESSION_SUFFIXES = {'gzip': '.gz', 'zstd': '.zst'}
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+
 
 class OutputManager:
     """Manages output to files in various formats"""
     
-    def __init__(self, output_dir: str = 'results'):
+    def __init__(self, output_dir: str = 'results', pretty_json: bool = True,
+                 compression: Optional[str] = None):
+        """
+        Args:
+            output_dir: Directory results are written to
+            pretty_json: Indent JSON files for reading; False writes compact JSON for machine consumers
+            compression: 'none', 'gzip' or 'zstd' (default: ECOURTS_RESULT_COMPRESSION, else 'none')
+        """
         self.output_dir = Path(output_dir)
+        self.pretty_json = pretty_json
+        self.compression = compression or os.environ.get(RESULT_COMPRESSION_ENV, 'none')
+        if self.compression == 'zstd' and zstandard is None:
+            logger.warning("zstandard is not installed, compressing results with gzip")
+            self.compression = 'gzip'
+        elif self.compression not in ('none', *COMPRESSION_SUFFIXES):
+            logger.warning(f"Unknown result compression {self.compression!r}, writing uncompressed")
+            self.compression = 'none'
         self.output_dir.mkdir(exist_ok=True)
         logger.info(f"Output directory: {self.output_dir}")
     
@@ -45,12 +76,46 @@ class OutputManager:
             logger.error(f"Error saving result: {e}")
             return None
     
+    def _output_path(self, filename: str) -> Path:
+        """Path for a new output file, with the compression suffix added"""
+        return self.output_dir / f"{filename}{COMPRESSION_SUFFIXES.get(self.compression, '')}"
+    
+    def _open_output(self, filepath: Path, size: int = -1) -> BinaryIO:
+        """
+        Open an output file for binary writing, compressing as it is written
+        
+        Args:
+            filepath: File to write
+            size: Uncompressed size if known, recorded in the zstd frame header for _content_size
+        """
+        if self.compression == 'gzip':
+            return gzip.open(filepath, 'wb', compresslevel=GZIP_LEVEL)
+        if self.compression == 'zstd':
+            compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL, write_content_size=True)
+            return compressor.stream_writer(open(filepath, 'wb'), size=size)
+        return open(filepath, 'wb')
+    
+    def _write_output(self, filepath: Path, content: bytes):
+        """Write a whole output file, compressed"""
+        with self._open_output(filepath, len(content)) as f:
+            f.write(content)
+    
+    @staticmethod
+    def _open_input(filepath: Path) -> BinaryIO:
+        """Open an output file for binary reading, decompressing by its suffix"""
+        if filepath.suffix == '.gz':
+            return gzip.open(filepath, 'rb')
+        if filepath.suffix == '.zst':
+            if zstandard is None:
+                raise RuntimeError(f"zstandard is needed to read {filepath.name}")
+            return zstandard.ZstdDecompressor().stream_reader(open(filepath, 'rb'))
+        return open(filepath, 'rb')
+    
     def _save_json(self, data: Dict[str, Any], filename: str) -> str:
         """Save data as JSON file"""
-        filepath = self.output_dir / f"{filename}.json"
+        filepath = self._output_path(f"{filename}.json")
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        self._write_output(filepath, dumps_bytes(data, pretty=self.pretty_json))
         
         logger.info(f"Saved JSON: {filepath}")
         print(f"[+] Results saved to: {filepath}")
@@ -58,28 +123,27 @@ class OutputManager:
     
     def _save_text(self, data: Dict[str, Any], filename: str) -> str:
         """Save data as text file"""
-        filepath = self.output_dir / f"{filename}.txt"
+        filepath = self._output_path(f"{filename}.txt")
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(self._format_text(data))
+        self._write_output(filepath, self._format_text(data).encode('utf-8'))
         
         logger.info(f"Saved text: {filepath}")
         print(f"[+] Results saved to: {filepath}")
         return str(filepath)
     
-    def _format_text(self, data: Dict[str, Any], indent: int = 0) -> str:
-        """Format dictionary as readable text"""
+    def _format_text(self, data: Mapping, indent: int = 0) -> str:
+        """Format dictionary (or dictionary-like record) as readable text"""
         lines = []
         prefix = "  " * indent
         
         for key, value in data.items():
-            if isinstance(value, dict):
+            if isinstance(value, Mapping):
                 lines.append(f"{prefix}{key}:")
                 lines.append(self._format_text(value, indent + 1))
             elif isinstance(value, list):
                 lines.append(f"{prefix}{key}:")
                 for item in value:
-                    if isinstance(item, dict):
+                    if isinstance(item, Mapping):
                         lines.append(self._format_text(item, indent + 1))
                     else:
                         lines.append(f"{prefix}  - {item}")
@@ -88,33 +152,30 @@ class OutputManager:
         
         return "\n".join(lines)
     
-    def save_case_report(self, cases: list, filename: str = 'case_report') -> Optional[str]:
+    def save_case_report(self, cases: Iterable[Mapping], filename: str = 'case_report') -> Optional[str]:
         """
         Save a report of multiple cases
         
         Args:
-            cases: List of case results
+            cases: Case results, or a generator yielding them (counted in one pass)
             filename: Base filename
         
         Returns:
             Path to saved file
         """
         try:
+            aggregator = ReportAggregator.from_results(cases)
             report = {
                 'generated_at': datetime.now().isoformat(),
-                'total_cases': len(cases),
-                'cases_listed_today': sum(1 for c in cases if c.get('listing_status', {}).get('days_until_listing') == 0),
-                'cases_listed_tomorrow': sum(1 for c in cases if c.get('listing_status', {}).get('days_until_listing') == 1),
-                'cases': cases
+                'total_cases': aggregator.total,
+                'cases_listed_today': aggregator.listed_today,
+                'cases_listed_tomorrow': aggregator.listed_tomorrow,
+                'by_court': aggregator.by_court,
+                'cases': aggregator.cases
             }
             
-            # Save as JSON
-            json_path = self._save_json(report, filename)
-            
-            # Also save as text
-            text_path = self._save_text(report, f"{filename}_text")
-            
-            return json_path
+            # Only JSON is stored; render_text gives the text view on read
+            return self._save_json(report, filename)
         
         except Exception as e:
             logger.error(f"Error saving case report: {e}")
@@ -143,13 +204,8 @@ class OutputManager:
                 'archive': results.get('archive')
             }
             
-            # Save as JSON
-            json_path = self._save_json(report, filename)
-            
-            # Also save as text
-            text_path = self._save_text(report, f"{filename}_text")
-            
-            return json_path
+            # Only JSON is stored; render_text gives the text view on read
+            return self._save_json(report, filename)
         
         except Exception as e:
             logger.error(f"Error saving download report: {e}")
@@ -169,7 +225,7 @@ class OutputManager:
         try:
             import csv
             
-            filepath = self.output_dir / f"{filename}.csv"
+            filepath = self._output_path(f"{filename}.csv")
             
             if not cases:
                 logger.warning("No cases to export")
@@ -185,17 +241,20 @@ class OutputManager:
             
             headers = sorted(list(headers))
             
-            with open(filepath, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=headers)
-                writer.writeheader()
-                
-                for case in cases:
-                    row = {}
-                    if 'case_details' in case:
-                        row.update(case['case_details'])
-                    if 'listing_status' in case:
-                        row.update(case['listing_status'])
-                    writer.writerow(row)
+            # Rendered in memory so the compressed file can record its size
+            buffer = io.StringIO(newline='')
+            writer = csv.DictWriter(buffer, fieldnames=headers)
+            writer.writeheader()
+            
+            for case in cases:
+                row = {}
+                if 'case_details' in case:
+                    row.update(case['case_details'])
+                if 'listing_status' in case:
+                    row.update(case['listing_status'])
+                writer.writerow(row)
+            
+            self._write_output(filepath, buffer.getvalue().encode('utf-8'))
             
             logger.info(f"Exported to CSV: {filepath}")
             print(f"[+] Results exported to: {filepath}")
@@ -206,15 +265,20 @@ class OutputManager:
             return None
     
     def get_output_files(self) -> list:
-        """Get list of all output files"""
+        """Get list of all output files, with their uncompressed size and name"""
         try:
             files = []
             for file_path in self.output_dir.glob('*'):
                 if file_path.is_file():
+                    compression = next((name for name, suffix in COMPRESSION_SUFFIXES.items()
+                                        if file_path.suffix == suffix), None)
                     files.append({
                         'filename': file_path.name,
+                        'name': file_path.stem if compression else file_path.name,
                         'path': str(file_path),
                         'size_bytes': file_path.stat().st_size,
+                        'content_bytes': self._content_size(file_path),
+                        'compression': compression,
                         'modified': datetime.fromtimestamp(file_path.stat().st_mtime).isoformat()
                     })
             
@@ -224,6 +288,66 @@ class OutputManager:
             logger.error(f"Error getting output files: {e}")
             return []
     
+    @staticmethod
+    def _content_size(filepath: Path) -> Optional[int]:
+        """Uncompressed size from the gzip trailer or zstd frame header, without decompressing"""
+        try:
+            if filepath.suffix == '.gz':
+                with open(filepath, 'rb') as f:
+                    f.seek(-4, os.SEEK_END)
+                    return int.from_bytes(f.read(4), 'little')
+            if filepath.suffix == '.zst':
+                if zstandard is None:
+                    return None
+                with open(filepath, 'rb') as f:
+                    size = zstandard.frame_content_size(f.read(18))
+                return size if size >= 0 else None
+            return filepath.stat().st_size
+        except Exception:
+            return None
+    
+    def find_output_file(self, filename: str) -> Optional[Path]:
+        """
+        Locate an output file by its stored name or its name without the compression suffix
+        
+        Returns:
+            Path inside the output directory, or None if there is no such file
+        """
+        if not filename or Path(filename).name != filename:
+            return None
+        
+        for suffix in ('', *COMPRESSION_SUFFIXES.values()):
+            filepath = self.output_dir / f"{filename}{suffix}"
+            if filepath.is_file():
+                return filepath
+        return None
+    
+    def read_output(self, filename: str) -> Optional[bytes]:
+        """Contents of an output file, decompressed"""
+        filepath = self.find_output_file(filename)
+        if filepath is None:
+            return None
+        
+        with self._open_input(filepath) as f:
+            return f.read()
+    
+    def render_text(self, filename: str) -> Optional[str]:
+        """
+        Readable text view of an output file
+        
+        JSON results are formatted as _save_text would have written them;
+        other files are returned as stored.
+        """
+        filepath = self.find_output_file(filename)
+        if filepath is None:
+            return None
+        
+        content = self.read_output(filepath.name)
+        if filepath.name.endswith(('.json', '.json.gz', '.json.zst')):
+            data = loads(content)
+            return self._format_text(data) if isinstance(data, Mapping) else content.decode('utf-8')
+        return content.decode('utf-8')
+    
     def cleanup_old_results(self, days: int = 30) -> Dict[str, Any]:
         """
         Remove result files older than specified days
@@ -3,16 +3,49 @@ PDF Manager Module
 Handles PDF downloads and file management
 """
 
-from ecourts_scraper import CauseListDownloader
+from ecourts_scraper import CaptchaSource, CauseListDownloader
+from browser_broker import RemoteScraper, open_scraper
+from scraper_errors import ECourtsError, CaptchaSpentError
+from contextlib import ExitStack
 from pathlib import Path
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Iterator, Callable, Tuple
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
 import zipfile
 import os
+import time
 
 logger = logging.getLogger(__name__)
 
+# Longest span of dates accepted for one range download
+MAX_DATE_RANGE_DAYS = 31
+
+
+def get_date_range(start: str, end: str) -> List[str]:
+    """
+    Every date from start to end inclusive
+    
+    Args:
+        start: First date in DD-MM-YYYY format
+        end: Last date in DD-MM-YYYY format
+    
+    Returns:
+        Dates in DD-MM-YYYY format
+    
+    Raises:
+        ValueError: On malformed dates, an end before the start or a span over MAX_DATE_RANGE_DAYS
+    """
+    first = datetime.strptime(start, '%d-%m-%Y').date()
+    last = datetime.strptime(end, '%d-%m-%Y').date()
+    days = (last - first).days + 1
+    
+    if days < 1:
+        raise ValueError(f"End date {end} is before start date {start}")
+    if days > MAX_DATE_RANGE_DAYS:
+        raise ValueError(f"Date range spans {days} days; at most {MAX_DATE_RANGE_DAYS} are allowed")
+    
+    return [(first + timedelta(days=offset)).strftime('%d-%m-%Y') for offset in range(days)]
+
 
 class PDFDownloadManager:
     """Manages PDF downloads from eCourts"""
@@ -23,7 +56,8 @@ class PDFDownloadManager:
         logger.info(f"PDF download directory: {self.download_dir}")
     
     def download_case_pdf(self, state: str, district: str, complex_name: str,
-                         court_name: str, date: str, captcha: str) -> Optional[str]:
+                         court_name: str, date: str, captcha: CaptchaSource,
+                         raise_errors: bool = False, downloader=None) -> Optional[str]:
         """
         Download a case PDF
         
@@ -33,21 +67,30 @@ class PDFDownloadManager:
             complex_name: Court complex name
             court_name: Court name
             date: Date in DD-MM-YYYY format
-            captcha: Captcha code
+            captcha: Captcha code, or a callable solving each captcha shown
+            raise_errors: Raise typed scraping errors instead of returning None
+            downloader: Open CauseListDownloader to reuse; a new one is opened if not given
         
         Returns:
             Path to downloaded file or None if failed
+        
+        Raises:
+            ECourtsError: On scraping failure, if raise_errors is set
         """
         try:
-            with CauseListDownloader() as downloader:
+            with ExitStack() as stack:
+                if downloader is None:
+                    downloader = stack.enter_context(open_scraper(CauseListDownloader))
+                if callable(captcha) and isinstance(downloader, RemoteScraper):
+                    # Broker calls may run on different browsers, so none holds the captcha being solved
+                    raise ECourtsError("Solving each captcha needs a local browser, not the browser broker")
+                
                 pdf_content = downloader.download_cause_list(
                     state, district, complex_name, court_name, date, captcha
                 )
                 
                 if pdf_content:
-                    # Create filename
-                    filename = f"{state}_{district}_{court_name}_{date}.pdf"
-                    filepath = self.download_dir / filename
+                    filepath = self.get_pdf_path(state, district, court_name, date)
                     
                     # Save PDF
                     with open(filepath, 'wb') as f:
@@ -59,16 +102,76 @@ class PDFDownloadManager:
                     logger.warning(f"Failed to download PDF for {court_name}")
                     return None
         
+        except ECourtsError as e:
+            logger.error(f"Error downloading PDF ({e.error_type}): {e}")
+            if raise_errors:
+                raise
+            return None
+        
         except Exception as e:
             logger.error(f"Error downloading PDF: {e}")
+            if raise_errors:
+                raise ECourtsError(str(e)) from e
             return None
     
-    def download_multiple_pdfs(self, downloads: List[Dict]) -> Dict:
+    def get_pdf_path(self, state: str, district: str, court_name: str, date: str) -> Path:
+        """Get the download path for a court's cause list on a date"""
+        return self.download_dir / f"{state}_{district}_{court_name}_{date}.pdf"
+    
+    @staticmethod
+    def iter_pdf_pages(filepath: str) -> Iterator[Tuple[int, List[str]]]:
+        """
+        Iterate over the pages of a downloaded PDF, extracting one page at a time
+        
+        Args:
+            filepath: Path to the PDF file
+        
+        Yields:
+            (page number, non-empty text lines of the page)
+        """
+        from pypdf import PdfReader
+        
+        reader = PdfReader(filepath)
+        for page_number, page in enumerate(reader.pages, 1):
+            lines = [line.strip() for line in (page.extract_text() or '').splitlines()]
+            yield page_number, [line for line in lines if line]
+            
+            # Drop the objects parsed for this page so long lists don't accumulate them;
+            # anything a later page shares is re-read from the file on demand
+            reader.resolved_objects.clear()
+    
+    def iter_pdf_lines(self, filepath: str) -> Iterator[str]:
+        """
+        Iterate over the text lines of a downloaded PDF, one page at a time
+        
+        Args:
+            filepath: Path to the PDF file
+        
+        Yields:
+            Non-empty text lines in page order
+        """
+        for _, lines in self.iter_pdf_pages(filepath):
+            yield from lines
+    
+    def download_multiple_pdfs(self, downloads: List[Dict],
+                               progress_callback: Optional[Callable[[str, Dict], None]] = None) -> Dict:
         """
-        Download multiple PDFs
+        Download multiple PDFs on one browser session
+        
+        Consecutive downloads in the same complex only change the court and
+        date on the loaded form, so order downloads by complex, then court,
+        to save navigation. A download's captcha may be a callable solving
+        each captcha shown, see CauseListDownloader.download_cause_list.
+        
+        The portal shows a new captcha after every submit, so a captcha code
+        is only tried once: later downloads given the same code fail as
+        captcha_spent and are listed under 'needs_captcha' (without the code)
+        for a caller that can solve them, e.g. the captcha pool.
         
         Args:
             downloads: List of download dictionaries with court info
+            progress_callback: Called as progress_callback(event, data) with
+                               'started', 'downloaded' and 'failed' events per court
         
         Returns:
             Dictionary with download results
@@ -78,42 +181,115 @@ class PDFDownloadManager:
             'successful': 0,
             'failed': 0,
             'files': [],
-            'errors': []
+            'errors': [],
+            'needs_captcha': []
         }
         
-        for idx, download_info in enumerate(downloads, 1):
-            try:
-                logger.info(f"Downloading {idx}/{len(downloads)}: {download_info.get('court_name')}")
+        # Captcha codes already submitted, with the court they were submitted for
+        spent_captchas = {}
+        started_at = time.monotonic()
+        total_bytes = 0
+        
+        def report(event: str, idx: int, download_info: Dict, **data):
+            if progress_callback:
+                elapsed = time.monotonic() - started_at
+                remaining = len(downloads) - idx
+                data.update({
+                    'court': download_info.get('court_name'),
+                    'index': idx,
+                    'total': len(downloads),
+                    'successful': results['successful'],
+                    'failed': results['failed'],
+                    'total_bytes': total_bytes,
+                    'elapsed_seconds': round(elapsed, 1),
+                    'eta_seconds': round(elapsed / idx * remaining, 1) if event != 'started' else None
+                })
+                progress_callback(event, data)
+        
+        downloader = None
+        
+        with ExitStack() as session:
+            for idx, download_info in enumerate(downloads, 1):
+                captcha = download_info.get('captcha')
+                if not callable(captcha) and captcha in spent_captchas:
+                    error = CaptchaSpentError(
+                        f"Captcha was already submitted for {spent_captchas[captcha]}; a new captcha is needed"
+                    )
+                    results['failed'] += 1
+                    results['errors'].append({
+                        'court': download_info.get('court_name'),
+                        'reason': str(error),
+                        'error_type': error.error_type
+                    })
+                    results['needs_captcha'].append(
+                        {key: value for key, value in download_info.items() if key != 'captcha'}
+                    )
+                    report('failed', idx, download_info, reason=str(error), error_type=error.error_type)
+                    continue
                 
-                filepath = self.download_case_pdf(
-                    download_info.get('state'),
-                    download_info.get('district'),
-                    download_info.get('complex_name'),
-                    download_info.get('court_name'),
-                    download_info.get('date'),
-                    download_info.get('captcha')
-                )
+                try:
+                    logger.info(f"Downloading {idx}/{len(downloads)}: {download_info.get('court_name')}")
+                    report('started', idx, download_info)
+                    
+                    if downloader is None:
+                        downloader = session.enter_context(open_scraper(CauseListDownloader))
+                    
+                    filepath = self.download_case_pdf(
+                        download_info.get('state'),
+                        download_info.get('district'),
+                        download_info.get('complex_name'),
+                        download_info.get('court_name'),
+                        download_info.get('date'),
+                        captcha,
+                        raise_errors=True,
+                        downloader=downloader
+                    )
+                    
+                    if filepath:
+                        file_bytes = os.path.getsize(filepath)
+                        total_bytes += file_bytes
+                        results['successful'] += 1
+                        results['files'].append({
+                            'court': download_info.get('court_name'),
+                            'date': download_info.get('date'),
+                            'path': filepath,
+                            'timestamp': datetime.now().isoformat()
+                        })
+                        report('downloaded', idx, download_info, path=filepath,
+                               filename=os.path.basename(filepath), bytes=file_bytes)
+                    else:
+                        results['failed'] += 1
+                        results['errors'].append({
+                            'court': download_info.get('court_name'),
+                            'reason': 'PDF download failed'
+                        })
+                        report('failed', idx, download_info, reason='PDF download failed')
                 
-                if filepath:
-                    results['successful'] += 1
-                    results['files'].append({
+                except ECourtsError as e:
+                    results['failed'] += 1
+                    results['errors'].append({
                         'court': download_info.get('court_name'),
-                        'path': filepath,
-                        'timestamp': datetime.now().isoformat()
+                        'reason': str(e),
+                        'error_type': e.error_type
                     })
-                else:
+                    report('failed', idx, download_info, reason=str(e), error_type=e.error_type)
+                
+                except Exception as e:
                     results['failed'] += 1
                     results['errors'].append({
                         'court': download_info.get('court_name'),
-                        'reason': 'PDF download failed'
+                        'reason': str(e)
                     })
-            
-            except Exception as e:
-                results['failed'] += 1
-                results['errors'].append({
-                    'court': download_info.get('court_name'),
-                    'reason': str(e)
-                })
+                    report('failed', idx, download_info, reason=str(e))
+                
+                # Whatever the outcome, the form now shows a different captcha
+                if not callable(captcha):
+                    spent_captchas.setdefault(captcha, download_info.get('court_name'))
+                
+                # Start the next court on a fresh session if this one's browser died
+                if isinstance(downloader, CauseListDownloader) and not downloader.driver_manager.is_alive():
+                    session.close()
+                    downloader = None
         
         logger.info(f"Download complete: {results['successful']} successful, {results['failed']} failed")
         return results
@@ -147,7 +323,8 @@ class PDFDownloadManager:
             return None
     
     def download_today_cause_list(self, state: str, district: str, complex_name: str,
-                                  date: str, captcha: str) -> Dict:
+                                  date: str, captcha: CaptchaSource,
+                                  progress_callback: Optional[Callable[[str, Dict], None]] = None) -> Dict:
         """
         Download cause list for all courts in a complex for today
         
@@ -156,7 +333,8 @@ class PDFDownloadManager:
             district: District name
             complex_name: Court complex name
             date: Date in DD-MM-YYYY format
-            captcha: Captcha code
+            captcha: Captcha code, or a callable solving each captcha shown
+            progress_callback: Receives per-court progress events, see download_multiple_pdfs
         
         Returns:
             Dictionary with download results
@@ -164,7 +342,7 @@ class PDFDownloadManager:
         try:
             from ecourts_scraper import CauseListScraper
             
-            with CauseListScraper() as scraper:
+            with open_scraper(CauseListScraper) as scraper:
                 courts = scraper.get_courts(state, district, complex_name)
             
             if not courts:
@@ -184,8 +362,11 @@ class PDFDownloadManager:
                 for court in courts
             ]
             
+            if progress_callback:
+                progress_callback('planned', {'total': len(courts), 'courts': courts})
+            
             # Download all PDFs
-            results = self.download_multiple_pdfs(downloads)
+            results = self.download_multiple_pdfs(downloads, progress_callback)
             
             # Create ZIP archive if downloads were successful
             if results['files']:
@@ -202,6 +383,68 @@ class PDFDownloadManager:
             logger.error(f"Error downloading today's cause list: {e}")
             return {'error': str(e)}
     
+    def download_date_range(self, state: str, district: str, complex_name: str,
+                            dates: List[str], captcha: CaptchaSource,
+                            progress_callback: Optional[Callable[[str, Dict], None]] = None) -> Dict:
+        """
+        Download cause lists for all courts in a complex over several dates
+        
+        Downloads run court by court, so each court's hierarchy is selected
+        once and only the date changes between its submits.
+        
+        Args:
+            state: State name
+            district: District name
+            complex_name: Court complex name
+            dates: Dates in DD-MM-YYYY format, see get_date_range
+            captcha: Captcha code, or a callable solving each captcha shown
+            progress_callback: Receives per-download progress events, see download_multiple_pdfs
+        
+        Returns:
+            Dictionary with download results
+        """
+        try:
+            from ecourts_scraper import CauseListScraper
+            
+            with open_scraper(CauseListScraper) as scraper:
+                courts = scraper.get_courts(state, district, complex_name)
+            
+            if not courts:
+                logger.warning("No courts found")
+                return {'error': 'No courts found'}
+            
+            downloads = [
+                {
+                    'state': state,
+                    'district': district,
+                    'complex_name': complex_name,
+                    'court_name': court,
+                    'date': date,
+                    'captcha': captcha
+                }
+                for court in courts
+                for date in dates
+            ]
+            
+            if progress_callback:
+                progress_callback('planned', {'total': len(downloads), 'courts': courts, 'dates': dates})
+            
+            results = self.download_multiple_pdfs(downloads, progress_callback)
+            
+            if results['files']:
+                file_paths = [f['path'] for f in results['files']]
+                archive_path = self.create_zip_archive(
+                    file_paths,
+                    f"cause_list_{state}_{district}_{dates[0].replace('-', '_')}_to_{dates[-1].replace('-', '_')}"
+                )
+                results['archive'] = archive_path
+            
+            return results
+        
+        except Exception as e:
+            logger.error(f"Error downloading cause lists for {dates[0]} to {dates[-1]}: {e}")
+            return {'error': str(e)}
+    
     def get_download_history(self) -> List[Dict]:
         """
         Get list of all downloaded files
@@ -237,8 +480,6 @@ class PDFDownloadManager:
             Dictionary with cleanup results
         """
         try:
-            from datetime import timedelta
-            
             cutoff_time = datetime.now() - timedelta(days=days)
             removed_count = 0
             freed_space = 0
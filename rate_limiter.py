@@ -0,0 +1,206 @@
+"""
+Rate Limiter Module
+Handles shared rate limiting and adaptive concurrency for eCourts portal traffic
+"""
+
+from metrics import metrics
+from contextlib import contextmanager
+from collections import deque
+from typing import Dict, Optional
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Sustained portal requests per second and burst allowance
+PORTAL_RATE_LIMIT = 1.0
+PORTAL_BURST = 3
+
+# Concurrency bounds for the AIMD controller
+MIN_CONCURRENCY = 1
+MAX_CONCURRENCY = 8
+INITIAL_CONCURRENCY = 2
+
+# Requests slower than this (seconds) do not count as healthy
+LATENCY_THRESHOLD = 15.0
+
+# Consecutive healthy requests needed before raising concurrency
+HEALTHY_WINDOW = 10
+
+
+class TokenBucket:
+    """Token bucket that blocks callers until a token is available"""
+    
+    def __init__(self, rate: float = PORTAL_RATE_LIMIT, capacity: int = PORTAL_BURST):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def _refill(self):
+        """Add tokens accrued since the last refill"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+    
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Take one token, waiting for it if necessary
+        
+        Args:
+            timeout: Maximum seconds to wait, or None to wait indefinitely
+        
+        Returns:
+            True if a token was taken, False on timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                wait = (1 - self.tokens) / self.rate
+            
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            
+            time.sleep(wait)
+
+
+class AIMDController:
+    """Additive-increase/multiplicative-decrease limit on concurrent requests"""
+    
+    def __init__(self, min_limit: int = MIN_CONCURRENCY, max_limit: int = MAX_CONCURRENCY,
+                 initial_limit: int = INITIAL_CONCURRENCY, latency_threshold: float = LATENCY_THRESHOLD,
+                 healthy_window: int = HEALTHY_WINDOW, decrease_factor: float = 0.5):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.limit = initial_limit
+        self.latency_threshold = latency_threshold
+        self.healthy_window = healthy_window
+        self.decrease_factor = decrease_factor
+        self.in_flight = 0
+        self.healthy_streak = 0
+        self.condition = threading.Condition()
+    
+    def acquire(self):
+        """Wait for a free concurrency slot"""
+        with self.condition:
+            while self.in_flight >= self.limit:
+                self.condition.wait()
+            self.in_flight += 1
+    
+    def release(self):
+        """Return a concurrency slot"""
+        with self.condition:
+            self.in_flight -= 1
+            self.condition.notify()
+    
+    def record(self, latency: float, success: bool):
+        """
+        Adjust the concurrency limit from a request outcome
+        
+        Args:
+            latency: Request duration in seconds
+            success: False for timeouts, errors and portal error pages
+        """
+        with self.condition:
+            if not success:
+                new_limit = max(self.min_limit, int(self.limit * self.decrease_factor))
+                if new_limit < self.limit:
+                    logger.warning(f"Portal unhealthy, reducing concurrency {self.limit} -> {new_limit}")
+                    metrics.increment('portal_backoffs_total')
+                self.limit = new_limit
+                self.healthy_streak = 0
+                return
+            
+            if latency > self.latency_threshold:
+                self.healthy_streak = 0
+                return
+            
+            self.healthy_streak += 1
+            if self.healthy_streak >= self.healthy_window and self.limit < self.max_limit:
+                self.limit += 1
+                self.healthy_streak = 0
+                logger.info(f"Portal healthy, raising concurrency to {self.limit}")
+                self.condition.notify()
+
+
+class PortalTrafficController:
+    """Gates every portal request through the rate limiter and AIMD controller"""
+    
+    def __init__(self, bucket: Optional[TokenBucket] = None,
+                 controller: Optional[AIMDController] = None):
+        self.bucket = bucket or TokenBucket()
+        self.controller = controller or AIMDController()
+        self.recent = deque()
+        self.lock = threading.Lock()
+        self._report()
+    
+    @contextmanager
+    def request(self, kind: str):
+        """
+        Run one portal request under the shared limits
+        
+        Args:
+            kind: Request type for metrics ('navigate', 'submit', 'fetch')
+        
+        Yields:
+            Outcome dictionary; set 'success' to False to report an error page
+        """
+        self.controller.acquire()
+        self.bucket.acquire()
+        
+        outcome = {'success': True}
+        started = time.monotonic()
+        try:
+            yield outcome
+        except Exception:
+            outcome['success'] = False
+            raise
+        finally:
+            latency = time.monotonic() - started
+            self.controller.release()
+            self.controller.record(latency, outcome['success'])
+            
+            metrics.increment('portal_requests_total')
+            metrics.increment(f'portal_requests_{kind}_total')
+            if not outcome['success']:
+                metrics.increment('portal_request_failures_total')
+            metrics.set_gauge('portal_last_latency_seconds', round(latency, 3))
+            
+            with self.lock:
+                self.recent.append(time.monotonic())
+            self._report()
+    
+    def get_request_rate(self, window: float = 60.0) -> float:
+        """Observed portal requests per second over the last window"""
+        cutoff = time.monotonic() - window
+        with self.lock:
+            while self.recent and self.recent[0] < cutoff:
+                self.recent.popleft()
+            return len(self.recent) / window
+    
+    def get_status(self) -> Dict[str, float]:
+        """Get the current rate and concurrency state"""
+        return {
+            'rate_limit': self.bucket.rate,
+            'request_rate': round(self.get_request_rate(), 3),
+            'concurrency_limit': self.controller.limit,
+            'in_flight': self.controller.in_flight
+        }
+    
+    def _report(self):
+        """Publish the current rate and concurrency as gauges"""
+        for name, value in self.get_status().items():
+            metrics.set_gauge(f'portal_{name}', value)
+
+
+portal_traffic = PortalTrafficController()
@@ -0,0 +1,144 @@
+"""
+Records Module
+Compact, read-only record types for case results held in large batches
+"""
+
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, Optional, Tuple
+import sys
+
+# Key tuples shared by every record with the same case_info fields
+_KEY_LAYOUTS: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+
+def intern_value(value: Any) -> Any:
+    """
+    Intern a short string that repeats across records (court names, dates, status messages)
+    
+    Only for shared fields: interned strings outlive the records, so per-case
+    values (CNR and case numbers, party names) are never interned.
+    """
+    if isinstance(value, str) and len(value) <= 64:
+        return sys.intern(value)
+    return value
+
+
+def _share_layout(keys: Tuple[str, ...]) -> Tuple[str, ...]:
+    layout = _KEY_LAYOUTS.get(keys)
+    if layout is None:
+        layout = _KEY_LAYOUTS[keys] = tuple(sys.intern(key) for key in keys)
+    return layout
+
+
+class ListingStatus(Mapping):
+    """
+    Listing status of one case, read like the dictionary CaseManager.check_listing_status returns
+    
+    The optional serial number, court name and hearing date only appear as
+    keys when set, as in the dictionary form.
+    """
+    
+    __slots__ = ('is_listed', 'listed_date', 'days_until_listing', 'status_message',
+                 'serial_number', 'court_name', 'hearing_date')
+    
+    REQUIRED_KEYS = ('is_listed', 'listed_date', 'days_until_listing', 'status_message')
+    OPTIONAL_KEYS = ('serial_number', 'court_name', 'hearing_date')
+    
+    def __init__(self, is_listed: bool = False, listed_date: Optional[str] = None,
+                 days_until_listing: Optional[int] = None,
+                 status_message: str = 'Case not listed today or tomorrow',
+                 serial_number: Optional[str] = None, court_name: Optional[str] = None,
+                 hearing_date: Optional[str] = None):
+        self.is_listed = is_listed
+        self.listed_date = intern_value(listed_date)
+        self.days_until_listing = days_until_listing
+        self.status_message = intern_value(status_message)
+        self.serial_number = serial_number
+        self.court_name = intern_value(court_name)
+        self.hearing_date = intern_value(hearing_date)
+    
+    def _keys(self) -> Tuple[str, ...]:
+        return self.REQUIRED_KEYS + tuple(key for key in self.OPTIONAL_KEYS if getattr(self, key))
+    
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._keys():
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys())
+    
+    def __len__(self) -> int:
+        return len(self._keys())
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {key: getattr(self, key) for key in self._keys()}
+    
+    def __repr__(self) -> str:
+        return f"ListingStatus({self.to_dict()!r})"
+
+
+class CaseResult(Mapping):
+    """
+    One case check result, read like the summary or error dictionaries it replaces
+    
+    case_info fields are stored as a key layout shared across records plus a
+    value tuple, rather than a dictionary per record.
+    """
+    
+    __slots__ = ('case_keys', 'case_values', 'listing_status', 'search_timestamp', 'search_type',
+                 'error', 'error_type', 'search_params')
+    
+    SUMMARY_KEYS = ('case_details', 'listing_status', 'search_timestamp', 'search_type')
+    
+    def __init__(self, case_details: Optional[Dict[str, Any]] = None,
+                 listing_status: Optional[ListingStatus] = None,
+                 search_timestamp: Optional[str] = None, search_type: Optional[str] = None,
+                 error: Optional[str] = None, error_type: Optional[str] = None,
+                 search_params: Optional[Dict[str, Any]] = None):
+        case_details = case_details or {}
+        self.case_keys = _share_layout(tuple(case_details))
+        self.case_values = tuple(case_details.values())
+        self.listing_status = listing_status
+        self.search_timestamp = search_timestamp
+        self.search_type = intern_value(search_type)
+        self.error = error
+        self.error_type = intern_value(error_type)
+        self.search_params = search_params
+    
+    @classmethod
+    def from_error(cls, error: str, search_params: Dict[str, Any],
+                   error_type: Optional[str] = None) -> 'CaseResult':
+        return cls(error=error, error_type=error_type, search_params=search_params)
+    
+    @property
+    def case_details(self) -> Dict[str, Any]:
+        return dict(zip(self.case_keys, self.case_values))
+    
+    def _keys(self) -> Tuple[str, ...]:
+        if self.error is None:
+            return self.SUMMARY_KEYS
+        if self.error_type is None:
+            return ('error', 'search_params')
+        return ('error', 'error_type', 'search_params')
+    
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._keys():
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys())
+    
+    def __len__(self) -> int:
+        return len(self._keys())
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """The summary or error dictionary this record stands for"""
+        result = {key: getattr(self, key) for key in self._keys()}
+        if self.error is None:
+            result['listing_status'] = self.listing_status.to_dict()
+        return result
+    
+    def __repr__(self) -> str:
+        return f"CaseResult({self.to_dict()!r})"
@@ -0,0 +1,107 @@
+"""
+Report Aggregator Module
+Builds case listing reports in one pass as results arrive
+"""
+
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+UNKNOWN_COURT = 'Unknown court'
+
+
+def _court_of(result: Mapping) -> str:
+    """Court a result belongs to: the listing's court, else the one searched for"""
+    listing_status = result.get('listing_status') or {}
+    search_params = result.get('search_params') or {}
+    return listing_status.get('court_name') or search_params.get('court_name') or UNKNOWN_COURT
+
+
+class ReportAggregator:
+    """
+    Running counts and per-court/per-status breakdowns of case check results
+    
+    Each add() updates the counters in place, so a report can be taken at any
+    point of a stream without re-scanning it. With keep_cases=False the
+    results themselves are not held, and memory stays flat however many
+    results pass through.
+    """
+    
+    def __init__(self, keep_cases: bool = True):
+        self.keep_cases = keep_cases
+        self.cases: List[Mapping] = []
+        self.total = 0
+        self.listed_today = 0
+        self.listed_tomorrow = 0
+        self.not_listed = 0
+        self.errors = 0
+        self.errors_by_type: Dict[str, int] = {}
+        self.by_court: Dict[str, Dict[str, int]] = {}
+        self.by_status: Dict[str, int] = {}
+    
+    @classmethod
+    def from_results(cls, results: Iterable[Mapping], keep_cases: bool = True) -> 'ReportAggregator':
+        """Aggregate an iterable of results, consuming it once"""
+        aggregator = cls(keep_cases)
+        for result in results:
+            aggregator.add(result)
+        return aggregator
+    
+    def add(self, result: Mapping):
+        """Count one result (a dictionary or CaseResult record)"""
+        self.total += 1
+        if self.keep_cases:
+            self.cases.append(result)
+        
+        court_name = _court_of(result)
+        court = self.by_court.get(court_name)
+        if court is None:
+            court = self.by_court[court_name] = {
+                'total': 0, 'listed_today': 0, 'listed_tomorrow': 0, 'not_listed': 0, 'errors': 0
+            }
+        court['total'] += 1
+        
+        if 'error' in result:
+            self.errors += 1
+            error_type = result.get('error_type', 'error')
+            self.errors_by_type[error_type] = self.errors_by_type.get(error_type, 0) + 1
+            court['errors'] += 1
+            return
+        
+        listing_status = result.get('listing_status', {})
+        days_until_listing = listing_status.get('days_until_listing')
+        if days_until_listing == 0:
+            self.listed_today += 1
+            court['listed_today'] += 1
+        elif days_until_listing == 1:
+            self.listed_tomorrow += 1
+            court['listed_tomorrow'] += 1
+        else:
+            self.not_listed += 1
+            court['not_listed'] += 1
+        
+        status_message = listing_status.get('status_message') or 'Unknown'
+        self.by_status[status_message] = self.by_status.get(status_message, 0) + 1
+    
+    def report(self, generated_at: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Snapshot of the counts so far
+        
+        Returns:
+            Dictionary in the CaseListingChecker.generate_report layout, plus
+            by_court and by_status breakdowns; 'cases' only when kept
+        """
+        report = {
+            'total_cases_checked': self.total,
+            'cases_listed_today': self.listed_today,
+            'cases_listed_tomorrow': self.listed_tomorrow,
+            'cases_not_listed': self.not_listed,
+            'errors': self.errors,
+            'errors_by_type': dict(self.errors_by_type),
+            'by_court': {court: dict(counts) for court, counts in self.by_court.items()},
+            'by_status': dict(self.by_status),
+        }
+        if self.keep_cases:
+            report['cases'] = self.cases
+        report['generated_at'] = generated_at or datetime.now().isoformat()
+        return report
@@ -0,0 +1,177 @@
+"""
+Resilience Module
+Handles retries with jittered backoff and the portal circuit breaker
+"""
+
+from scraper_errors import (
+    ECourtsError, PortalTimeoutError, ElementMissingError, PortalUnavailableError,
+    CircuitOpenError, classify_error
+)
+from metrics import metrics
+from functools import wraps
+from typing import Dict, Optional, Type
+import logging
+import random
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class RetryPolicy:
+    """Retry limits and exponential backoff for one error class"""
+    
+    def __init__(self, max_attempts: int, base_delay: float, max_delay: float):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+    
+    def get_delay(self, attempt: int) -> float:
+        """Full-jitter backoff delay before the next attempt"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+
+
+RETRY_POLICIES: Dict[Type[ECourtsError], RetryPolicy] = {
+    PortalTimeoutError: RetryPolicy(max_attempts=3, base_delay=2.0, max_delay=30.0),
+    ElementMissingError: RetryPolicy(max_attempts=2, base_delay=1.0, max_delay=5.0),
+    PortalUnavailableError: RetryPolicy(max_attempts=3, base_delay=5.0, max_delay=60.0),
+}
+
+
+class CircuitBreaker:
+    """Fails fast while the portal is down instead of waiting on doomed requests"""
+    
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 60.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = 'closed'
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trial_in_flight = False
+        self.lock = threading.Lock()
+        self._report()
+    
+    def check(self):
+        """
+        Raise CircuitOpenError if portal requests are suspended
+        
+        After the reset timeout one trial request is let through; its
+        outcome closes the circuit again or keeps it open.
+        """
+        with self.lock:
+            if self.state == 'closed':
+                return
+            
+            if self.state == 'open' and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = 'half_open'
+                self.trial_in_flight = False
+                self._report()
+            
+            if self.state == 'half_open' and not self.trial_in_flight:
+                self.trial_in_flight = True
+                return
+            
+            metrics.increment('circuit_breaker_rejections_total')
+            retry_in = max(0, self.reset_timeout - (time.monotonic() - self.opened_at))
+            raise CircuitOpenError(f"Portal requests suspended, retry in {retry_in:.0f}s")
+    
+    def raise_if_open(self):
+        """Raise CircuitOpenError while the circuit is open, without claiming the trial request"""
+        with self.lock:
+            elapsed = time.monotonic() - self.opened_at
+            if self.state == 'open' and elapsed < self.reset_timeout:
+                metrics.increment('circuit_breaker_rejections_total')
+                raise CircuitOpenError(f"Portal requests suspended, retry in {self.reset_timeout - elapsed:.0f}s")
+    
+    def record_success(self):
+        """Close the circuit after a successful portal request"""
+        with self.lock:
+            if self.state != 'closed':
+                logger.info("Portal recovered, closing circuit")
+            self.state = 'closed'
+            self.failures = 0
+            self.trial_in_flight = False
+            self._report()
+    
+    def record_failure(self, error: ECourtsError):
+        """Count a portal failure and open the circuit past the threshold"""
+        if isinstance(error, CircuitOpenError):
+            return
+        
+        # Any other answer from the portal means it is up
+        if not isinstance(error, (PortalTimeoutError, PortalUnavailableError)):
+            self.record_success()
+            return
+        
+        with self.lock:
+            self.failures += 1
+            self.trial_in_flight = False
+            if self.state == 'half_open' or self.failures >= self.failure_threshold:
+                if self.state != 'open':
+                    logger.warning(f"Portal failing ({self.failures} consecutive errors), opening circuit")
+                    metrics.increment('circuit_breaker_opens_total')
+                self.state = 'open'
+                self.opened_at = time.monotonic()
+            self._report()
+    
+    def _report(self):
+        """Publish the circuit state as a gauge"""
+        metrics.set_gauge('circuit_breaker_open', 0 if self.state == 'closed' else 1)
+        metrics.set_gauge('circuit_breaker_failures', self.failures)
+
+
+portal_breaker = CircuitBreaker()
+
+
+def call_with_retry(func, *args, policies: Optional[Dict[Type[ECourtsError], RetryPolicy]] = None,
+                    breaker: Optional[CircuitBreaker] = None, **kwargs):
+    """
+    Call a scraping function, retrying typed errors per their policy
+    
+    Args:
+        func: Function that raises on failure
+        policies: Retry policy per error class (default: RETRY_POLICIES)
+        breaker: Circuit breaker guarding the portal (default: portal_breaker)
+    
+    Returns:
+        The function's return value
+    
+    Raises:
+        ECourtsError: When the error is not retryable or attempts run out
+    """
+    policies = RETRY_POLICIES if policies is None else policies
+    breaker = breaker or portal_breaker
+    attempt = 0
+    
+    while True:
+        attempt += 1
+        breaker.check()
+        
+        try:
+            result = func(*args, **kwargs)
+            breaker.record_success()
+            return result
+        except Exception as e:
+            error = classify_error(e)
+            breaker.record_failure(error)
+            
+            policy = next((p for cls, p in policies.items() if isinstance(error, cls)), None)
+            if not error.retryable or policy is None or attempt >= policy.max_attempts:
+                metrics.increment(f'scraper_errors_{error.error_type}_total')
+                if error is e:
+                    raise
+                raise error from e
+            
+            delay = policy.get_delay(attempt)
+            metrics.increment('scraper_retries_total')
+            logger.warning(f"{func.__name__} failed ({error.error_type}: {error}), "
+                           f"retry {attempt}/{policy.max_attempts - 1} in {delay:.1f}s")
+            time.sleep(delay)
+
+
+def with_retry(func):
+    """Decorate a scraping method with typed retries and the portal circuit breaker"""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        return call_with_retry(func, *args, **kwargs)
+    return wrapper
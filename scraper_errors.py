@@ -0,0 +1,102 @@
+"""
+Scraper Errors Module
+Typed errors raised by eCourts scraping operations
+"""
+
+import sys
+
+
+class ECourtsError(Exception):
+    """Base class for eCourts scraping errors"""
+    
+    error_type = 'error'
+    retryable = False
+
+
+class PortalTimeoutError(ECourtsError):
+    """The portal did not respond or render in time"""
+    
+    error_type = 'timeout'
+    retryable = True
+
+
+class ElementMissingError(ECourtsError):
+    """An expected form element or option was not on the page"""
+    
+    error_type = 'element_missing'
+    retryable = True
+
+
+class CaptchaRejectedError(ECourtsError):
+    """The portal rejected the captcha code"""
+    
+    error_type = 'captcha_rejected'
+
+
+class CaptchaSpentError(ECourtsError):
+    """The captcha code was already submitted once; the portal shows a new captcha after every submit"""
+    
+    error_type = 'captcha_spent'
+
+
+class PDFNotFoundError(ECourtsError):
+    """The portal returned no cause list PDF"""
+    
+    error_type = 'pdf_absent'
+
+
+class PortalUnavailableError(ECourtsError):
+    """The portal is down, overloaded or blocking requests"""
+    
+    error_type = 'portal_down'
+    retryable = True
+
+
+class CircuitOpenError(PortalUnavailableError):
+    """Portal requests are suspended after repeated failures"""
+    
+    error_type = 'circuit_open'
+    retryable = False
+
+
+def classify_error(error: Exception) -> ECourtsError:
+    """
+    Convert a Selenium or HTTP exception into a typed eCourts error
+    
+    Args:
+        error: Exception raised while scraping
+    
+    Returns:
+        Typed error carrying the original message
+    """
+    if isinstance(error, ECourtsError):
+        return error
+    
+    message = str(error).strip() or error.__class__.__name__
+    
+    # Selenium and requests are imported lazily by the scraper; if one isn't loaded, this can't be one of its errors
+    selenium = sys.modules.get('selenium.common.exceptions')
+    requests = sys.modules.get('requests')
+    
+    if ((selenium and isinstance(error, selenium.TimeoutException))
+            or (requests and isinstance(error, requests.Timeout))):
+        return PortalTimeoutError(message)
+    
+    if selenium and isinstance(error, (selenium.NoSuchElementException, selenium.StaleElementReferenceException)):
+        return ElementMissingError(message)
+    
+    if requests and isinstance(error, requests.ConnectionError):
+        return PortalUnavailableError(message)
+    
+    if requests and isinstance(error, requests.HTTPError) and error.response is not None:
+        status = error.response.status_code
+        if status == 429 or status >= 500:
+            return PortalUnavailableError(message)
+    
+    if selenium and isinstance(error, selenium.WebDriverException):
+        if 'timeout' in message.lower():
+            return PortalTimeoutError(message)
+        if 'net::ERR_' in message:
+            return PortalUnavailableError(message)
+    
+    return ECourtsError(message)
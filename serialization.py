@@ -0,0 +1,91 @@
+"""
+Serialization Module
+One JSON encoding layer for saved results and API responses, using orjson when it is installed
+"""
+
+from datetime import date
+from pathlib import Path
+from typing import Any, Callable, Optional
+import json
+import logging
+import os
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+JSON_BACKEND_ENV = 'ECOURTS_JSON_BACKEND'
+BACKENDS = ('orjson', 'json')
+
+
+def _select_backend() -> str:
+    backend = os.environ.get(JSON_BACKEND_ENV, 'orjson' if orjson else 'json')
+    if backend not in BACKENDS:
+        logger.warning(f"Unknown JSON backend {backend!r}, using json")
+        return 'json'
+    if backend == 'orjson' and orjson is None:
+        logger.warning("orjson is not installed, using json")
+        return 'json'
+    return backend
+
+
+JSON_BACKEND = _select_backend()
+
+
+def to_serializable(value: Any) -> Any:
+    """Encode values JSON has no type for: records as their dictionaries, dates as ISO strings"""
+    if hasattr(value, 'to_dict'):
+        return value.to_dict()
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Path):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _lenient(value: Any) -> Any:
+    try:
+        return to_serializable(value)
+    except TypeError:
+        return str(value)
+
+
+def dumps_bytes(data: Any, pretty: bool = False, lenient: bool = False,
+                backend: Optional[str] = None) -> bytes:
+    """
+    Encode data as UTF-8 JSON
+    
+    Args:
+        data: Data to encode; CaseResult records and dates are converted
+        pretty: Indent by two spaces for people; compact otherwise
+        lenient: Encode otherwise unsupported values with str() instead of raising TypeError
+        backend: 'orjson' or 'json' (default: ECOURTS_JSON_BACKEND, else orjson when installed)
+    """
+    default: Callable[[Any], Any] = _lenient if lenient else to_serializable
+    
+    if (backend or JSON_BACKEND) == 'orjson':
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=default, option=option)
+    
+    if pretty:
+        text = json.dumps(data, indent=2, ensure_ascii=False, default=default)
+    else:
+        text = json.dumps(data, separators=(',', ':'), ensure_ascii=False, default=default)
+    return text.encode('utf-8')
+
+
+def dumps(data: Any, pretty: bool = False, lenient: bool = False, backend: Optional[str] = None) -> str:
+    """Encode data as a JSON string; see dumps_bytes"""
+    return dumps_bytes(data, pretty, lenient, backend).decode('utf-8')
+
+
+def loads(data: Any, backend: Optional[str] = None) -> Any:
+    """Decode JSON from str or bytes"""
+    if (backend or JSON_BACKEND) == 'orjson':
+        return orjson.loads(data)
+    return json.loads(data)
@@ -0,0 +1,87 @@
+"""
+Single Flight Module
+Coalesces concurrent identical scraping calls into one in-flight execution
+"""
+
+from metrics import metrics
+from typing import Any, Callable, Dict, Hashable
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    """An in-flight call and the callers waiting on it"""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Runs one call per key at a time and shares its outcome with concurrent callers"""
+    
+    def __init__(self, name: str = 'single_flight'):
+        self.name = name
+        self.lock = threading.Lock()
+        self.calls: Dict[Hashable, _Call] = {}
+        self.stats = {'calls': 0, 'executions': 0, 'coalesced': 0}
+    
+    def do(self, key: Hashable, func: Callable, *args, **kwargs) -> Any:
+        """
+        Call func unless an identical call is already in flight
+        
+        Args:
+            key: Identifies identical calls
+            func: Function to call
+            *args, **kwargs: Arguments for func
+        
+        Returns:
+            The result of the shared call
+        
+        Raises:
+            Exception: Whatever the shared call raised
+        """
+        with self.lock:
+            self.stats['calls'] += 1
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self.calls[key] = call
+                self.stats['executions'] += 1
+            else:
+                call.waiters += 1
+                self.stats['coalesced'] += 1
+        
+        metrics.increment(f'{self.name}_calls_total')
+        
+        if not leader:
+            metrics.increment(f'{self.name}_coalesced_total')
+            logger.info(f"Joining in-flight call for {key}")
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        
+        metrics.increment(f'{self.name}_executions_total')
+        try:
+            call.result = func(*args, **kwargs)
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self.lock:
+                del self.calls[key]
+            call.done.set()
+            if call.waiters:
+                logger.info(f"Shared result of {key} with {call.waiters} waiting callers")
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Get call, execution and coalescing counts"""
+        with self.lock:
+            return dict(self.stats, in_flight=len(self.calls))
@@ -0,0 +1,136 @@
+"""
+Snapshot Store Module
+Handles per-case result snapshots and change detection between searches
+"""
+
+from pathlib import Path
+from typing import Dict, Any, Optional
+from datetime import datetime
+import hashlib
+import json
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+# Fields that change on every search or with the calendar, not with the case
+VOLATILE_FIELDS = ('search_timestamp', 'search_type', 'listed_today', 'listed_tomorrow')
+
+# Top-level fields reported individually in a delta
+TRACKED_FIELDS = ('hearing_date', 'serial_number', 'court_name')
+
+
+class SnapshotStore:
+    """Stores the last known result of each case and computes deltas against it"""
+    
+    def __init__(self, snapshot_dir: str = 'snapshots'):
+        self.snapshot_dir = Path(snapshot_dir)
+        self.snapshot_dir.mkdir(exist_ok=True)
+        logger.info(f"Snapshot directory: {self.snapshot_dir}")
+    
+    def _get_path(self, case_id: str) -> Path:
+        """
+        Get the snapshot file path for a case
+        
+        The readable part of the name can collide (A/1/2020 and A_1_2020), so
+        a short hash of the raw ID keeps each case in its own file.
+        """
+        safe_id = re.sub(r'[^A-Za-z0-9_-]', '_', case_id)
+        id_hash = hashlib.sha256(case_id.encode('utf-8')).hexdigest()[:12]
+        return self.snapshot_dir / f"{safe_id}-{id_hash}.json"
+    
+    def compute_hash(self, result: Dict[str, Any]) -> str:
+        """
+        Compute a content hash of a case result
+        
+        Args:
+            result: Case result from CaseManager.search_case
+        
+        Returns:
+            Hex digest that only changes when the case content changes
+        """
+        content = {key: value for key, value in result.items() if key not in VOLATILE_FIELDS}
+        encoded = json.dumps(content, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+    
+    def load(self, case_id: str) -> Optional[Dict[str, Any]]:
+        """Load the last snapshot of a case"""
+        filepath = self._get_path(case_id)
+        if not filepath.exists():
+            return None
+        
+        try:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.error(f"Error loading snapshot for {case_id}: {e}")
+            return None
+    
+    def save(self, case_id: str, result: Dict[str, Any], content_hash: Optional[str] = None) -> Dict[str, Any]:
+        """Save a case result as the latest snapshot"""
+        snapshot = {
+            'case_id': case_id,
+            'hash': content_hash or self.compute_hash(result),
+            'saved_at': datetime.now().isoformat(),
+            'result': result
+        }
+        
+        filepath = self._get_path(case_id)
+        tmp_path = filepath.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f, ensure_ascii=False)
+        tmp_path.replace(filepath)
+        
+        return snapshot
+    
+    def diff(self, case_id: str, result: Dict[str, Any], save: bool = True) -> Dict[str, Any]:
+        """
+        Compare a case result against the last snapshot
+        
+        Args:
+            case_id: Case identifier
+            result: Case result from CaseManager.search_case
+            save: Store the result as the new snapshot when it changed
+        
+        Returns:
+            Dictionary describing what changed since the last snapshot
+        """
+        content_hash = self.compute_hash(result)
+        previous = self.load(case_id)
+        
+        delta = {
+            'case_id': case_id,
+            'changed': True,
+            'is_new': previous is None,
+            'hash': content_hash,
+            'previous_hash': previous.get('hash') if previous else None,
+            'previous_saved_at': previous.get('saved_at') if previous else None,
+            'fields_changed': {},
+            'checked_at': result.get('search_timestamp') or datetime.now().isoformat()
+        }
+        
+        if previous and previous.get('hash') == content_hash:
+            delta['changed'] = False
+            return delta
+        
+        old_result = previous.get('result', {}) if previous else {}
+        old_info = old_result.get('case_info') or {}
+        new_info = result.get('case_info') or {}
+        
+        for key in sorted(new_info.keys() | old_info.keys()):
+            if old_info.get(key) != new_info.get(key):
+                delta['fields_changed'][key] = {
+                    'old': old_info.get(key),
+                    'new': new_info.get(key)
+                }
+        
+        for field in TRACKED_FIELDS:
+            if old_result.get(field) != result.get(field):
+                delta[f'new_{field}'] = result.get(field)
+                delta[f'previous_{field}'] = old_result.get(field)
+        
+        if save:
+            self.save(case_id, result, content_hash)
+        
+        logger.info(f"Case {case_id} changed: {len(delta['fields_changed'])} fields")
+        return delta
@@ -7,15 +7,12 @@ document.getElementById("district").addEventListener("change", handleDistrictCha
 document.getElementById("complex").addEventListener("change", handleComplexChange)
 document.getElementById("refreshCaptcha").addEventListener("click", refreshCaptcha)
 document.getElementById("scrapperForm").addEventListener("submit", handleFormSubmit)
+document.getElementById("queueCaptchas").addEventListener("click", queueCaptchaBatch)
 
 // Fetch states on page load
 async function initializeStates() {
   try {
-    const response = await fetch("/fetch_dropdowns", {
-      method: "POST",
-      headers: { "Content-Type": "application/json" },
-      body: JSON.stringify({}),
-    })
+    const response = await fetch("/fetch_dropdowns")
     const data = await response.json()
 
     if (data.states) {
@@ -49,11 +46,7 @@ async function handleStateChange() {
   if (!state) return
 
   try {
-    const response = await fetch("/fetch_dropdowns", {
-      method: "POST",
-      headers: { "Content-Type": "application/json" },
-      body: JSON.stringify({ state }),
-    })
+    const response = await fetch(`/fetch_dropdowns?${new URLSearchParams({ state })}`)
     const data = await response.json()
 
     if (data.districts) {
@@ -84,11 +77,7 @@ async function handleDistrictChange() {
   if (!district) return
 
   try {
-    const response = await fetch("/fetch_dropdowns", {
-      method: "POST",
-      headers: { "Content-Type": "application/json" },
-      body: JSON.stringify({ state, district }),
-    })
+    const response = await fetch(`/fetch_dropdowns?${new URLSearchParams({ state, district })}`)
     const data = await response.json()
 
     if (data.complexes) {
@@ -117,11 +106,7 @@ async function handleComplexChange() {
   if (!complex) return
 
   try {
-    const response = await fetch("/fetch_dropdowns", {
-      method: "POST",
-      headers: { "Content-Type": "application/json" },
-      body: JSON.stringify({ state, district, complex }),
-    })
+    const response = await fetch(`/fetch_dropdowns?${new URLSearchParams({ state, district, complex })}`)
     const data = await response.json()
 
     if (data.courts) {
@@ -175,9 +160,16 @@ async function handleFormSubmit(e) {
   submitBtn.disabled = true
   submitBtn.innerHTML = '<span class="spinner-border spinner-border-sm me-2"></span>Processing...'
 
+  if (bulkDownload) {
+    streamBulkDownload({ state, district, complex, date, captcha }, () => {
+      submitBtn.disabled = false
+      submitBtn.innerHTML = "Download PDF"
+    })
+    return
+  }
+
   try {
-    const endpoint = bulkDownload ? "/download_all" : "/download_pdf"
-    const response = await fetch(endpoint, {
+    const response = await fetch("/download_pdf", {
       method: "POST",
       headers: { "Content-Type": "application/json" },
       body: JSON.stringify({ state, district, complex, court, date, captcha }),
@@ -185,9 +177,7 @@ async function handleFormSubmit(e) {
 
     const data = await response.json()
 
-    if (bulkDownload && data.success) {
-      showBulkDownloadResults(data)
-    } else if (data.success) {
+    if (data.success) {
       showStatus(`PDF downloaded successfully: ${data.filename}`, "success")
       showDownloadLink(data.filename)
     } else {
@@ -222,29 +212,219 @@ function showDownloadLink(filename) {
   linksDiv.appendChild(link)
 }
 
-function showBulkDownloadResults(data) {
-  const message = `Downloaded ${data.downloaded}/${data.total} PDFs successfully`
-  showStatus(message, data.downloaded === data.total ? "success" : "info")
-
+function streamBulkDownload(params, onDone) {
   const linksDiv = document.getElementById("downloadLinks")
+  const progressContainer = document.getElementById("progressContainer")
+  const progressBar = document.getElementById("progressBar")
+  const progressText = document.getElementById("progressText")
+
   linksDiv.innerHTML = "<h6>Download Results:</h6>"
+  progressBar.style.width = "0%"
+  progressText.textContent = "Fetching court list..."
+  progressContainer.classList.remove("d-none")
+
+  const source = new EventSource(`/api/stream/download_all?${new URLSearchParams(params)}`)
+
+  const updateProgress = (data) => {
+    const done = data.successful + data.failed
+    progressBar.style.width = `${Math.round((done / data.total) * 100)}%`
+    const eta = data.eta_seconds !== null && data.eta_seconds !== undefined ? `, about ${Math.round(data.eta_seconds)}s left` : ""
+    const size = (data.total_bytes / (1024 * 1024)).toFixed(1)
+    progressText.textContent = `${done}/${data.total} courts (${data.failed} failed, ${size} MB${eta})`
+  }
+
+  const finish = () => {
+    source.close()
+    onDone()
+  }
+
+  source.addEventListener("planned", (e) => {
+    const data = JSON.parse(e.data)
+    progressText.textContent = `0/${data.total} courts`
+  })
 
-  data.results.forEach((result) => {
-    if (result.status === "success") {
-      const link = document.createElement("a")
-      link.href = `/file/${result.filename}`
-      link.className = "download-link"
-      link.textContent = `✓ ${result.filename}`
-      link.download = result.filename
-      linksDiv.appendChild(link)
+  source.addEventListener("started", (e) => {
+    const data = JSON.parse(e.data)
+    progressText.textContent = `Downloading ${data.index}/${data.total}: ${data.court}`
+  })
+
+  source.addEventListener("downloaded", (e) => {
+    const data = JSON.parse(e.data)
+    const link = document.createElement("a")
+    link.href = `/file/${data.filename}`
+    link.className = "download-link"
+    link.textContent = `✓ ${data.filename}`
+    link.download = data.filename
+    linksDiv.appendChild(link)
+    updateProgress(data)
+  })
+
+  source.addEventListener("failed", (e) => {
+    const data = JSON.parse(e.data)
+    const failedItem = document.createElement("div")
+    failedItem.className = "download-link"
+    if (data.error_type === "captcha_spent") {
+      // Queued in the captcha grid once the batch finishes
+      failedItem.textContent = `… ${data.court}: needs a new captcha`
     } else {
-      const failedItem = document.createElement("div")
-      failedItem.className = "download-link"
       failedItem.style.color = "var(--danger-color)"
-      failedItem.textContent = `✗ ${result.court}: ${result.reason}`
-      linksDiv.appendChild(failedItem)
+      failedItem.textContent = `✗ ${data.court}: ${data.reason}`
     }
+    linksDiv.appendChild(failedItem)
+    updateProgress(data)
   })
+
+  source.addEventListener("complete", (e) => {
+    const data = JSON.parse(e.data)
+    if (data.error) {
+      showStatus("Error: " + data.error, "danger")
+    } else {
+      const queued = data.captcha_jobs ? data.captcha_jobs.length : 0
+      const message = queued
+        ? `Downloaded ${data.successful}/${data.total} PDFs; solve the captchas below for the other ${queued}`
+        : `Downloaded ${data.successful}/${data.total} PDFs successfully`
+      showStatus(message, data.successful === data.total ? "success" : "info")
+      if (queued) {
+        document.getElementById("captchaGridSection").classList.remove("d-none")
+        pollCaptchaJobs()
+      }
+    }
+    finish()
+  })
+
+  source.addEventListener("error", (e) => {
+    // Server-sent 'error' events carry data; connection failures do not
+    const message = e.data ? JSON.parse(e.data).error : "Connection to server lost"
+    showStatus("Error: " + message, "danger")
+    finish()
+  })
+}
+
+const CAPTCHA_POLL_INTERVAL = 2000
+let captchaPollTimer = null
+
+async function queueCaptchaBatch() {
+  const state = document.getElementById("state").value
+  const district = document.getElementById("district").value
+  const complex = document.getElementById("complex").value
+  const court = document.getElementById("court").value
+  const date = document.getElementById("date").value
+  const bulkDownload = document.getElementById("bulkDownload").checked
+
+  if (!state || !district || !complex || !date || (!court && !bulkDownload)) {
+    showStatus("Please select a court (or all courts) and a date", "danger")
+    return
+  }
+
+  try {
+    const response = await fetch("/api/captcha/batch", {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ state, district, complex, date, courts: bulkDownload ? null : [court] }),
+    })
+    const data = await response.json()
+
+    if (!data.success) {
+      showStatus("Error: " + (data.error || "Unknown error"), "danger")
+      return
+    }
+
+    showStatus(`Queued ${data.job_ids.length} courts; captchas appear below as sessions load them`, "info")
+    document.getElementById("captchaGridSection").classList.remove("d-none")
+    pollCaptchaJobs()
+  } catch (error) {
+    showStatus("Error: " + error.message, "danger")
+  }
+}
+
+async function pollCaptchaJobs() {
+  clearTimeout(captchaPollTimer)
+  try {
+    const response = await fetch("/api/captcha/jobs")
+    const data = await response.json()
+    renderCaptchaGrid(data.jobs)
+
+    const active = data.jobs.some((job) => !["downloaded", "failed"].includes(job.status))
+    if (active) {
+      captchaPollTimer = setTimeout(pollCaptchaJobs, CAPTCHA_POLL_INTERVAL)
+    }
+  } catch (error) {
+    captchaPollTimer = setTimeout(pollCaptchaJobs, CAPTCHA_POLL_INTERVAL)
+  }
+}
+
+function renderCaptchaGrid(jobs) {
+  const grid = document.getElementById("captchaGrid")
+  const counts = {}
+
+  jobs.forEach((job) => {
+    counts[job.status] = (counts[job.status] || 0) + 1
+    let card = document.getElementById(`captcha-${job.job_id}`)
+
+    // Cards are updated in place so a half-typed answer survives each poll
+    if (!card) {
+      card = document.createElement("div")
+      card.id = `captcha-${job.job_id}`
+      card.className = "captcha-card"
+      card.innerHTML = `
+        <div class="captcha-card-title"></div>
+        <img class="captcha-image d-none" alt="Captcha">
+        <input type="text" class="form-control form-control-sm d-none" placeholder="Type and press Enter">
+        <div class="captcha-card-status"></div>`
+      card.querySelector(".captcha-card-title").textContent = job.court_name
+      card.querySelector("input").addEventListener("keydown", (e) => {
+        if (e.key === "Enter") {
+          e.preventDefault()
+          solveCaptcha(job.job_id, e.target)
+        }
+      })
+      grid.appendChild(card)
+    }
+
+    const image = card.querySelector("img")
+    const input = card.querySelector("input")
+    const status = card.querySelector(".captcha-card-status")
+    const ready = job.status === "ready"
+
+    if (ready && image.src !== job.captcha) {
+      image.src = job.captcha
+      input.value = ""
+    }
+    image.classList.toggle("d-none", !ready)
+    input.classList.toggle("d-none", !ready)
+
+    if (job.status === "downloaded") {
+      status.innerHTML = `<a class="download-link" href="/file/${job.filename}" download>✓ ${job.filename}</a>`
+    } else {
+      const expires = ready ? ` (${job.expires_in}s left)` : ""
+      status.textContent = `${job.status}${expires}${job.message ? " – " + job.message : ""}`
+    }
+  })
+
+  const summary = Object.entries(counts).map(([status, count]) => `${count} ${status}`).join(", ")
+  document.getElementById("captchaGridStatus").textContent = summary
+}
+
+async function solveCaptcha(jobId, input) {
+  const captcha = input.value.trim()
+  if (!captcha) return
+
+  // Move straight on to the next waiting captcha
+  const inputs = [...document.querySelectorAll("#captchaGrid input:not(.d-none)")]
+  const next = inputs[inputs.indexOf(input) + 1] || inputs.find((other) => other !== input)
+  input.classList.add("d-none")
+  if (next) next.focus()
+
+  try {
+    await fetch("/api/captcha/solve", {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ job_id: jobId, captcha }),
+    })
+  } catch (error) {
+    showStatus("Error: " + error.message, "danger")
+  }
+  pollCaptchaJobs()
 }
 
 // Initialize on page load
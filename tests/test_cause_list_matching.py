@@ -0,0 +1,76 @@
+"""
+Cause list matching tests
+Joining watched cases against cause lists without a browser
+"""
+
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from case_manager import CaseListingChecker
+
+
+class FakePDFManager:
+    """Serves cause list lines from memory; a typed captcha downloads only the first court"""
+    
+    def __init__(self, directory: Path, lists: dict):
+        self.directory = directory
+        self.lists = lists
+    
+    def get_pdf_path(self, state, district, court_name, date) -> Path:
+        return self.directory / f"{court_name}_{date}.pdf"
+    
+    def download_multiple_pdfs(self, downloads, progress_callback):
+        for idx, download in enumerate(downloads, 1):
+            if idx == 1:
+                self.get_pdf_path(None, None, download['court_name'], download['date']).write_text('pdf')
+                progress_callback('downloaded', {'index': idx})
+            else:
+                progress_callback('failed', {'index': idx, 'reason': 'Captcha was already submitted',
+                                             'error_type': 'captcha_spent'})
+    
+    def iter_pdf_lines(self, filepath):
+        return iter(self.lists[Path(filepath).stem.split('_')[0]])
+
+
+def make_case(court_name: str, case_type: str, case_number: str = '12') -> dict:
+    return {'search_type': 'details', 'case_type': case_type, 'case_number': case_number, 'year': '2023',
+            'state': 'S', 'district': 'D', 'complex_name': 'C', 'court_name': court_name}
+
+
+def make_checker(tmp_path, lists) -> CaseListingChecker:
+    checker = CaseListingChecker.__new__(CaseListingChecker)
+    checker.pdf_manager = FakePDFManager(tmp_path, lists)
+    return checker
+
+
+def test_case_type_must_match_even_for_a_single_candidate(tmp_path):
+    checker = make_checker(tmp_path, {})
+    
+    matches = checker._match_cause_list(
+        [make_case('Court 1', 'CS'), make_case('Court 1', 'MACP', '7')],
+        ['1. OS 12/2023 Ram vs Shyam', '2. MACP/7/2023 Mohan vs Insurer'],
+    )
+    
+    assert 0 not in matches
+    assert matches[1][0] == '2'
+
+
+def test_courts_after_a_spent_captcha_are_reported_unchecked(tmp_path):
+    checker = make_checker(tmp_path, {'Court 1': ['1. CS 12/2023 Ram vs Shyam']})
+    records = []
+    
+    class FakeCaseManager:
+        def get_case_record(self, case_info):
+            records.append(case_info)
+            return case_info
+    
+    checker.case_manager = FakeCaseManager()
+    results = checker.check_cases_by_cause_list(
+        [make_case('Court 1', 'CS'), make_case('Court 2', 'CS')], '01-05-2024', 'ABC123', compact=True
+    )
+    
+    assert results[0] is records[0]
+    assert results[1].error_type == 'captcha_spent'
@@ -0,0 +1,58 @@
+"""
+Cause list parser tests
+Rows the parser used to merge into the previous entry or misread
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cause_list_parser import CauseListParser
+
+
+def parse(*lines):
+    return list(CauseListParser().parse_lines(enumerate(lines, 1)))
+
+
+def test_row_without_case_type_starts_a_new_row():
+    rows = parse(
+        '1. CS DJ/123/2023 Ram vs Shyam ADV. A. Sharma',
+        '2. 45/2020 Mohan vs State',
+    )
+    
+    assert [row['serial'] for row in rows] == ['1', '2']
+    assert rows[0]['advocate'] == 'A. Sharma'
+    assert rows[1]['case_number'] == '45/2020'
+    assert rows[1]['case_type'] is None
+    assert (rows[1]['petitioner'], rows[1]['respondent']) == ('Mohan', 'State')
+
+
+def test_party_name_is_not_read_as_case_type():
+    rows = parse('3. Mohan 45/2020 vs State')
+    
+    assert rows[0]['case_type'] is None
+    assert rows[0]['case_number'] == '45/2020'
+    assert rows[0]['petitioner'] == 'Mohan'
+
+
+def test_mixed_case_type_is_kept_as_written():
+    rows = parse('4. Crl.A/12/2021 X v. Y')
+    
+    assert rows[0]['case_number'] == 'Crl.A/12/2021'
+    assert rows[0]['case_type'] == 'Crl.A'
+
+
+def test_continuation_lines_stay_with_their_row():
+    rows = parse(
+        '5. MACP 7/2019 Mohan Lal',
+        'vs United Insurer',
+        'Adv. B. Rao',
+        '6) 8/2019 Sita vs Gita',
+    )
+    
+    assert len(rows) == 2
+    assert rows[0]['case_number'] == 'MACP/7/2019'
+    assert rows[0]['respondent'] == 'United Insurer'
+    assert rows[0]['advocate'] == 'B. Rao'
+    assert rows[1]['case_number'] == '8/2019'
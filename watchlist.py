@@ -0,0 +1,367 @@
+"""
+Watchlist Module
+Handles watched cases and their hearing-date-aware refresh schedule
+"""
+
+from case_manager import CaseManager
+from hearing_index import HearingIndex
+from pathlib import Path
+from typing import Dict, List, Optional
+from datetime import date, datetime, timedelta
+import heapq
+import json
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Refresh interval (seconds) by days until the next hearing
+REFRESH_SCHEDULE = [
+    (1, 60 * 60),            # today or tomorrow: hourly
+    (7, 6 * 60 * 60),        # within a week: every 6 hours
+    (30, 24 * 60 * 60),      # within a month: daily
+]
+DISTANT_HEARING_INTERVAL = 7 * 24 * 60 * 60
+UNKNOWN_HEARING_INTERVAL = 24 * 60 * 60
+PAST_HEARING_INTERVAL = 60 * 60
+FAILED_REFRESH_INTERVAL = 30 * 60
+
+
+class WatchlistStore:
+    """Persists watched cases and their last known results to a JSON file"""
+    
+    def __init__(self, path: str = 'watchlist.json'):
+        self.path = Path(path)
+        self.lock = threading.RLock()
+        self.mtime = None
+        self.entries = self._load()
+        logger.info(f"Watchlist: {len(self.entries)} cases in {self.path}")
+    
+    def _load(self) -> Dict[str, Dict]:
+        """Load watchlist entries from disk"""
+        if not self.path.exists():
+            return {}
+        
+        try:
+            self.mtime = self.path.stat().st_mtime
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.error(f"Error loading watchlist: {e}")
+            return {}
+    
+    def _reload_if_changed(self):
+        """Pick up changes written by another process, such as a running monitor"""
+        try:
+            if self.path.exists() and self.path.stat().st_mtime != self.mtime:
+                self.entries = self._load()
+        except OSError:
+            pass
+    
+    def save(self):
+        """Write watchlist entries to disk atomically"""
+        with self.lock:
+            tmp_path = self.path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f, indent=2, ensure_ascii=False)
+            tmp_path.replace(self.path)
+            self.mtime = self.path.stat().st_mtime
+    
+    def get(self, case_id: str) -> Optional[Dict]:
+        """Get a watched case entry"""
+        with self.lock:
+            self._reload_if_changed()
+            return self.entries.get(case_id)
+    
+    def put(self, entry: Dict):
+        """Insert or replace a watched case entry"""
+        with self.lock:
+            self._reload_if_changed()
+            self.entries[entry['case_id']] = entry
+            self.save()
+    
+    def remove(self, case_id: str) -> bool:
+        """Remove a watched case entry"""
+        with self.lock:
+            self._reload_if_changed()
+            if case_id not in self.entries:
+                return False
+            del self.entries[case_id]
+            self.save()
+            return True
+    
+    def all(self) -> List[Dict]:
+        """Get all watched case entries"""
+        with self.lock:
+            self._reload_if_changed()
+            return list(self.entries.values())
+
+
+class WatchlistMonitor:
+    """Refreshes watched cases on a schedule driven by their hearing dates"""
+    
+    def __init__(self, store: Optional[WatchlistStore] = None,
+                 case_manager: Optional[CaseManager] = None,
+                 index: Optional[HearingIndex] = None):
+        self.store = store or WatchlistStore()
+        self.case_manager = case_manager or CaseManager()
+        self.index = index or HearingIndex()
+        self.queue = []
+        self.scheduled = set()
+        self.wakeup = threading.Event()
+        
+        entries = self.store.all()
+        for entry in entries:
+            self._schedule(entry)
+        
+        # Watchlists from before the index existed
+        if not self.index.exists:
+            self.index.rebuild(entries)
+    
+    def _schedule(self, entry: Dict):
+        """Push a case onto the priority queue at its next check time"""
+        item = (entry['next_check'], entry['case_id'])
+        if item not in self.scheduled:
+            self.scheduled.add(item)
+            heapq.heappush(self.queue, item)
+    
+    def add_case(self, search_type: str, **params) -> Optional[str]:
+        """
+        Add a case to the watchlist
+        
+        Args:
+            search_type: 'cnr' or 'details'
+            **params: Search parameters as accepted by CaseManager.search_case
+        
+        Returns:
+            Case identifier or None if parameters are incomplete
+        """
+        case_id = CaseManager.get_case_id(search_type, **params)
+        if not case_id:
+            logger.error("Cannot watch case: incomplete search parameters")
+            return None
+        
+        existing = self.store.get(case_id)
+        if existing:
+            return case_id
+        
+        now = datetime.now().isoformat()
+        entry = {
+            'case_id': case_id,
+            'search_type': search_type,
+            'params': params,
+            'added_at': now,
+            'last_checked': None,
+            'next_check': now,
+            'last_result': None,
+            'last_error': None,
+            'last_change': None,
+            'failures': 0
+        }
+        self.store.put(entry)
+        self._schedule(entry)
+        self.wakeup.set()
+        
+        logger.info(f"Watching case {case_id}")
+        return case_id
+    
+    def remove_case(self, case_id: str) -> bool:
+        """Remove a case from the watchlist"""
+        removed = self.store.remove(case_id)
+        if removed:
+            self.index.remove(case_id)
+            logger.info(f"Stopped watching case {case_id}")
+        return removed
+    
+    def get_refresh_interval(self, hearing_date: Optional[str]) -> int:
+        """
+        Get the refresh interval for a case
+        
+        Args:
+            hearing_date: Next hearing date in DD-MM-YYYY format
+        
+        Returns:
+            Seconds until the case should be refreshed again
+        """
+        if not hearing_date:
+            return UNKNOWN_HEARING_INTERVAL
+        
+        try:
+            hearing = datetime.strptime(hearing_date, '%d-%m-%Y').date()
+        except ValueError:
+            return UNKNOWN_HEARING_INTERVAL
+        
+        days_until = (hearing - datetime.now().date()).days
+        
+        # A past hearing means the next date is due to be published
+        if days_until < 0:
+            return PAST_HEARING_INTERVAL
+        
+        for max_days, interval in REFRESH_SCHEDULE:
+            if days_until <= max_days:
+                return interval
+        
+        return DISTANT_HEARING_INTERVAL
+    
+    def refresh_case(self, case_id: str) -> Optional[Dict]:
+        """
+        Scrape a watched case and reschedule it
+        
+        Args:
+            case_id: Watched case identifier
+        
+        Returns:
+            Updated watchlist entry or None if the case is not watched
+        """
+        entry = self.store.get(case_id)
+        if not entry:
+            return None
+        
+        entry = dict(entry)
+        now = datetime.now()
+        result = self.case_manager.search_case(entry['search_type'], **entry['params'])
+        
+        entry['last_checked'] = now.isoformat()
+        if result:
+            delta = self.case_manager.get_case_delta(case_id, result, consumer='watchlist')
+            if delta['changed']:
+                entry['last_change'] = delta
+            entry['last_result'] = result
+            entry['last_error'] = None
+            entry['failures'] = 0
+            interval = self.get_refresh_interval(result.get('hearing_date'))
+        else:
+            entry['last_error'] = 'Failed to retrieve case information'
+            entry['failures'] += 1
+            interval = FAILED_REFRESH_INTERVAL * min(entry['failures'], 8)
+        
+        entry['next_check'] = (now + timedelta(seconds=interval)).isoformat()
+        
+        # The case may have been removed while it was being scraped
+        if self.store.get(case_id):
+            self.store.put(entry)
+            self._schedule(entry)
+            if result:
+                self.index.update(case_id, result)
+        
+        logger.info(f"Refreshed {case_id}, next check at {entry['next_check']}")
+        return entry
+    
+    def run_pending(self, max_checks: Optional[int] = None) -> int:
+        """
+        Refresh every case that is due, most overdue first
+        
+        Args:
+            max_checks: Maximum number of cases to refresh
+        
+        Returns:
+            Number of cases refreshed
+        """
+        checked = 0
+        now = datetime.now().isoformat()
+        
+        # Cases may have been added by another process since the last run
+        for entry in self.store.all():
+            self._schedule(entry)
+        
+        while self.queue and self.queue[0][0] <= now:
+            if max_checks is not None and checked >= max_checks:
+                break
+            
+            next_check, case_id = heapq.heappop(self.queue)
+            self.scheduled.discard((next_check, case_id))
+            entry = self.store.get(case_id)
+            
+            # Skip stale queue items for removed or rescheduled cases
+            if not entry or entry['next_check'] != next_check:
+                continue
+            
+            self.refresh_case(case_id)
+            checked += 1
+        
+        return checked
+    
+    def run(self, stop_event: Optional[threading.Event] = None, max_sleep: int = 300):
+        """
+        Refresh watched cases until stopped
+        
+        Args:
+            stop_event: Event that stops the monitor when set
+            max_sleep: Maximum seconds to sleep between schedule checks
+        """
+        stop_event = stop_event or threading.Event()
+        logger.info(f"Watchlist monitor started with {len(self.store.all())} cases")
+        
+        while not stop_event.is_set():
+            self.run_pending()
+            
+            sleep_for = max_sleep
+            if self.queue:
+                next_due = datetime.fromisoformat(self.queue[0][0])
+                sleep_for = min(max_sleep, max(0, (next_due - datetime.now()).total_seconds()))
+            
+            self.wakeup.clear()
+            self.wakeup.wait(sleep_for)
+        
+        logger.info("Watchlist monitor stopped")
+    
+    def get_status(self, case_id: str) -> Optional[Dict]:
+        """
+        Get the current listing status of a watched case without scraping
+        
+        Args:
+            case_id: Watched case identifier
+        
+        Returns:
+            Dictionary with the case summary and schedule details
+        """
+        entry = self.store.get(case_id)
+        if not entry:
+            return None
+        
+        status = {
+            'case_id': case_id,
+            'last_checked': entry['last_checked'],
+            'next_check': entry['next_check'],
+            'last_error': entry['last_error'],
+            'last_change': entry.get('last_change'),
+            'summary': None
+        }
+        
+        if entry['last_result']:
+            result = self._refresh_listing_flags(entry['last_result'])
+            status['summary'] = self.case_manager.get_case_summary(result)
+        
+        return status
+    
+    def get_hearings(self, start: date, end: date) -> Dict[str, List[Dict]]:
+        """
+        Watched cases with a hearing from start to end inclusive, without scraping
+        
+        Returns:
+            Court name to index entries, see HearingIndex.query_by_court
+        """
+        return self.index.query_by_court(start, end)
+    
+    def get_all_statuses(self) -> List[Dict]:
+        """Get the current listing status of every watched case without scraping"""
+        statuses = [self.get_status(entry['case_id']) for entry in self.store.all()]
+        # A case removed while the list is built has no status
+        return sorted((status for status in statuses if status), key=lambda x: x['next_check'])
+    
+    def _refresh_listing_flags(self, result: Dict) -> Dict:
+        """Recompute today/tomorrow flags from the stored hearing date"""
+        result = dict(result)
+        result['listed_today'] = False
+        result['listed_tomorrow'] = False
+        
+        if result.get('hearing_date'):
+            try:
+                hearing = datetime.strptime(result['hearing_date'], '%d-%m-%Y').date()
+                today = datetime.now().date()
+                result['listed_today'] = hearing == today
+                result['listed_tomorrow'] = hearing == today + timedelta(days=1)
+            except ValueError:
+                pass
+        
+        return result
@@ -0,0 +1,434 @@
+"""
+Work Queue Module
+Handles leased crawl tasks shared between a coordinator and worker nodes
+"""
+
+from metrics import metrics
+from typing import Dict, List, Optional, Tuple
+import json
+import logging
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Seconds a worker holds a task before it is handed to someone else
+DEFAULT_LEASE_SECONDS = 300
+
+# Attempts before a retryable failure is recorded as final
+MAX_TASK_ATTEMPTS = 3
+
+TASK_STATUSES = ('pending', 'leased', 'done', 'failed')
+
+
+class SQLiteWorkQueue:
+    """
+    Work queue in a SQLite database
+    
+    Suits workers on one machine or sharing a local disk; use
+    RedisWorkQueue for workers on separate machines.
+    """
+    
+    def __init__(self, path: str = 'crawl_queue.db', max_attempts: int = MAX_TASK_ATTEMPTS):
+        self.path = path
+        self.max_attempts = max_attempts
+        self.local = threading.local()
+        with self._connect() as conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS tasks (
+                    task_id TEXT PRIMARY KEY,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    worker_id TEXT,
+                    lease_expires REAL,
+                    result TEXT,
+                    error TEXT,
+                    error_type TEXT,
+                    updated_at REAL
+                );
+                CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status, lease_expires);
+                CREATE TABLE IF NOT EXISTS workers (
+                    worker_id TEXT PRIMARY KEY,
+                    last_heartbeat REAL,
+                    task_id TEXT
+                );
+            """)
+    
+    def _connect(self) -> sqlite3.Connection:
+        """One connection per thread; transactions are taken explicitly"""
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            self.local.conn = conn
+        return conn
+    
+    def _transaction(self):
+        """Write transaction that locks out other workers until it commits"""
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        return _Transaction(conn)
+    
+    def enqueue(self, tasks: List[Tuple[str, Dict]]) -> int:
+        """
+        Add tasks that are not already queued
+        
+        Args:
+            tasks: (task_id, payload) pairs
+        
+        Returns:
+            Number of tasks added
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO tasks (task_id, payload, updated_at) VALUES (?, ?, ?)",
+                [(task_id, json.dumps(payload), now) for task_id, payload in tasks]
+            )
+            added = conn.total_changes - before
+        
+        metrics.increment('work_queue_enqueued_total', added)
+        return added
+    
+    def lease(self, worker_id: str, lease_seconds: float = DEFAULT_LEASE_SECONDS) -> Optional[Tuple[str, Dict]]:
+        """
+        Take the next pending task
+        
+        Returns:
+            (task_id, payload), or None when nothing is pending
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT task_id, payload FROM tasks WHERE status = 'pending' ORDER BY rowid LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None
+            
+            conn.execute(
+                "UPDATE tasks SET status = 'leased', worker_id = ?, lease_expires = ?, "
+                "attempts = attempts + 1, updated_at = ? WHERE task_id = ?",
+                (worker_id, now + lease_seconds, now, row[0])
+            )
+            self._touch_worker(conn, worker_id, row[0], now)
+        
+        metrics.increment('work_queue_leases_total')
+        return row[0], json.loads(row[1])
+    
+    def heartbeat(self, worker_id: str, task_id: Optional[str] = None,
+                  lease_seconds: float = DEFAULT_LEASE_SECONDS) -> bool:
+        """
+        Report a worker alive and extend its lease on task_id
+        
+        Returns:
+            False if the task's lease was lost to another worker
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            self._touch_worker(conn, worker_id, task_id, now)
+            if task_id is None:
+                return True
+            cursor = conn.execute(
+                "UPDATE tasks SET lease_expires = ?, updated_at = ? "
+                "WHERE task_id = ? AND worker_id = ? AND status = 'leased'",
+                (now + lease_seconds, now, task_id, worker_id)
+            )
+            return cursor.rowcount == 1
+    
+    def complete(self, worker_id: str, task_id: str, result: Dict) -> bool:
+        """
+        Record a task's result
+        
+        Returns:
+            False if the lease had expired and the task was handed to another worker
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE tasks SET status = 'done', result = ?, error = NULL, error_type = NULL, "
+                "lease_expires = NULL, updated_at = ? WHERE task_id = ? AND worker_id = ? AND status = 'leased'",
+                (json.dumps(result), now, task_id, worker_id)
+            )
+            self._touch_worker(conn, worker_id, None, now)
+        
+        if cursor.rowcount == 1:
+            metrics.increment('work_queue_completed_total')
+        return cursor.rowcount == 1
+    
+    def fail(self, worker_id: str, task_id: str, error: str, error_type: str = 'error',
+             retry: bool = False) -> bool:
+        """
+        Record a task failure, re-queueing it if retry is set and attempts remain
+        
+        Returns:
+            True if the task was re-queued
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT attempts FROM tasks WHERE task_id = ? AND worker_id = ? AND status = 'leased'",
+                (task_id, worker_id)
+            ).fetchone()
+            self._touch_worker(conn, worker_id, None, now)
+            if row is None:
+                return False
+            
+            requeue = retry and row[0] < self.max_attempts
+            conn.execute(
+                "UPDATE tasks SET status = ?, error = ?, error_type = ?, worker_id = NULL, "
+                "lease_expires = NULL, updated_at = ? WHERE task_id = ?",
+                ('pending' if requeue else 'failed', error, error_type, now, task_id)
+            )
+        
+        metrics.increment('work_queue_requeued_total' if requeue else 'work_queue_failed_total')
+        return requeue
+    
+    def requeue_expired(self) -> int:
+        """
+        Return tasks whose lease ran out to the pending queue, failing those out of attempts
+        
+        Returns:
+            Number of expired leases
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            expired = conn.execute(
+                "SELECT task_id, worker_id, attempts FROM tasks WHERE status = 'leased' AND lease_expires < ?",
+                (now,)
+            ).fetchall()
+            for task_id, worker_id, attempts in expired:
+                status = 'pending' if attempts < self.max_attempts else 'failed'
+                conn.execute(
+                    "UPDATE tasks SET status = ?, error = ?, error_type = 'lease_expired', "
+                    "worker_id = NULL, lease_expires = NULL, updated_at = ? WHERE task_id = ?",
+                    (status, f"Lease held by {worker_id} expired", now, task_id)
+                )
+        
+        if expired:
+            logger.warning(f"Re-queued {len(expired)} tasks with expired leases")
+            metrics.increment('work_queue_lease_expiries_total', len(expired))
+        return len(expired)
+    
+    def get_stats(self) -> Dict:
+        """Task counts by status and the last heartbeat of each worker"""
+        conn = self._connect()
+        counts = dict.fromkeys(TASK_STATUSES, 0)
+        counts.update(conn.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status").fetchall())
+        workers = {
+            worker_id: {'last_heartbeat': last_heartbeat, 'task_id': task_id}
+            for worker_id, last_heartbeat, task_id in conn.execute(
+                "SELECT worker_id, last_heartbeat, task_id FROM workers"
+            )
+        }
+        return {'tasks': counts, 'total': sum(counts.values()), 'workers': workers}
+    
+    def get_results(self, status: str = 'done') -> List[Dict]:
+        """Payload, result and error of every task in a status"""
+        rows = self._connect().execute(
+            "SELECT task_id, payload, result, error, error_type, attempts FROM tasks WHERE status = ?",
+            (status,)
+        )
+        return [
+            {
+                'task_id': task_id,
+                'payload': json.loads(payload),
+                'result': json.loads(result) if result else None,
+                'error': error,
+                'error_type': error_type,
+                'attempts': attempts
+            }
+            for task_id, payload, result, error, error_type, attempts in rows
+        ]
+    
+    def _touch_worker(self, conn: sqlite3.Connection, worker_id: str, task_id: Optional[str], now: float):
+        conn.execute(
+            "INSERT INTO workers (worker_id, last_heartbeat, task_id) VALUES (?, ?, ?) "
+            "ON CONFLICT(worker_id) DO UPDATE SET last_heartbeat = excluded.last_heartbeat, "
+            "task_id = excluded.task_id",
+            (worker_id, now, task_id)
+        )
+
+
+class _Transaction:
+    """Commits on success and rolls back on error"""
+    
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+    
+    def __enter__(self) -> sqlite3.Connection:
+        return self.conn
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.conn.execute('ROLLBACK' if exc_type else 'COMMIT')
+
+
+class RedisWorkQueue:
+    """
+    Work queue in Redis or any server speaking its protocol
+    
+    Pending task IDs live in a list, leases in a sorted set scored by
+    expiry, and payloads, results and worker heartbeats in hashes.
+    """
+    
+    # Pop a pending task and record its lease in one step
+    LEASE_SCRIPT = """
+        local task_id = redis.call('LPOP', KEYS[1])
+        if not task_id then return nil end
+        redis.call('ZADD', KEYS[2], ARGV[1], task_id)
+        redis.call('HSET', KEYS[3], task_id, ARGV[2])
+        redis.call('HINCRBY', KEYS[4], task_id, 1)
+        redis.call('HSET', KEYS[5], task_id, 'leased')
+        return task_id
+    """
+    
+    def __init__(self, url: str, prefix: str = 'ecourts:crawl', max_attempts: int = MAX_TASK_ATTEMPTS):
+        import redis
+        
+        self.redis = redis.Redis.from_url(url, decode_responses=True)
+        self.max_attempts = max_attempts
+        self.keys = {name: f"{prefix}:{name}" for name in (
+            'pending', 'leases', 'owners', 'attempts', 'status', 'payloads', 'results', 'workers'
+        )}
+        self.lease_script = self.redis.register_script(self.LEASE_SCRIPT)
+    
+    def enqueue(self, tasks: List[Tuple[str, Dict]]) -> int:
+        """Add tasks that are not already queued; returns the number added"""
+        added = 0
+        for task_id, payload in tasks:
+            if self.redis.hsetnx(self.keys['payloads'], task_id, json.dumps(payload)):
+                pipe = self.redis.pipeline()
+                pipe.hset(self.keys['status'], task_id, 'pending')
+                pipe.rpush(self.keys['pending'], task_id)
+                pipe.execute()
+                added += 1
+        
+        metrics.increment('work_queue_enqueued_total', added)
+        return added
+    
+    def lease(self, worker_id: str, lease_seconds: float = DEFAULT_LEASE_SECONDS) -> Optional[Tuple[str, Dict]]:
+        """Take the next pending task, or None when nothing is pending"""
+        keys = [self.keys[name] for name in ('pending', 'leases', 'owners', 'attempts', 'status')]
+        task_id = self.lease_script(keys=keys, args=[time.time() + lease_seconds, worker_id])
+        self.redis.hset(self.keys['workers'], worker_id,
+                        json.dumps({'last_heartbeat': time.time(), 'task_id': task_id}))
+        if task_id is None:
+            return None
+        
+        metrics.increment('work_queue_leases_total')
+        return task_id, json.loads(self.redis.hget(self.keys['payloads'], task_id))
+    
+    def heartbeat(self, worker_id: str, task_id: Optional[str] = None,
+                  lease_seconds: float = DEFAULT_LEASE_SECONDS) -> bool:
+        """Report a worker alive and extend its lease; False if the lease was lost"""
+        self.redis.hset(self.keys['workers'], worker_id,
+                        json.dumps({'last_heartbeat': time.time(), 'task_id': task_id}))
+        if task_id is None:
+            return True
+        if self.redis.hget(self.keys['owners'], task_id) != worker_id:
+            return False
+        # XX only updates a lease that still exists
+        self.redis.zadd(self.keys['leases'], {task_id: time.time() + lease_seconds}, xx=True)
+        return self.redis.hget(self.keys['status'], task_id) == 'leased'
+    
+    def complete(self, worker_id: str, task_id: str, result: Dict) -> bool:
+        """Record a task's result; False if the lease was lost to another worker"""
+        if not self._release(worker_id, task_id):
+            return False
+        pipe = self.redis.pipeline()
+        pipe.hset(self.keys['results'], task_id, json.dumps({'result': result}))
+        pipe.hset(self.keys['status'], task_id, 'done')
+        pipe.execute()
+        self.heartbeat(worker_id, None)
+        metrics.increment('work_queue_completed_total')
+        return True
+    
+    def fail(self, worker_id: str, task_id: str, error: str, error_type: str = 'error',
+             retry: bool = False) -> bool:
+        """Record a task failure, re-queueing it if retry is set; True if re-queued"""
+        if not self._release(worker_id, task_id):
+            return False
+        self.heartbeat(worker_id, None)
+        return self._requeue_or_fail(task_id, error, error_type, retry)
+    
+    def requeue_expired(self) -> int:
+        """Return tasks whose lease ran out to the pending queue"""
+        expired = self.redis.zrangebyscore(self.keys['leases'], 0, time.time())
+        requeued = 0
+        for task_id in expired:
+            # ZREM decides the race with a late complete() or another coordinator
+            if self.redis.zrem(self.keys['leases'], task_id):
+                worker_id = self.redis.hget(self.keys['owners'], task_id)
+                self.redis.hdel(self.keys['owners'], task_id)
+                self._requeue_or_fail(task_id, f"Lease held by {worker_id} expired", 'lease_expired', True)
+                requeued += 1
+        
+        if requeued:
+            logger.warning(f"Re-queued {requeued} tasks with expired leases")
+            metrics.increment('work_queue_lease_expiries_total', requeued)
+        return requeued
+    
+    def get_stats(self) -> Dict:
+        """Task counts by status and the last heartbeat of each worker"""
+        counts = dict.fromkeys(TASK_STATUSES, 0)
+        for status in self.redis.hvals(self.keys['status']):
+            counts[status] = counts.get(status, 0) + 1
+        workers = {worker_id: json.loads(info)
+                   for worker_id, info in self.redis.hgetall(self.keys['workers']).items()}
+        return {'tasks': counts, 'total': sum(counts.values()), 'workers': workers}
+    
+    def get_results(self, status: str = 'done') -> List[Dict]:
+        """Payload, result and error of every task in a status"""
+        results = []
+        for task_id, task_status in self.redis.hgetall(self.keys['status']).items():
+            if task_status != status:
+                continue
+            record = json.loads(self.redis.hget(self.keys['results'], task_id) or '{}')
+            results.append({
+                'task_id': task_id,
+                'payload': json.loads(self.redis.hget(self.keys['payloads'], task_id)),
+                'result': record.get('result'),
+                'error': record.get('error'),
+                'error_type': record.get('error_type'),
+                'attempts': int(self.redis.hget(self.keys['attempts'], task_id) or 0)
+            })
+        return results
+    
+    def _release(self, worker_id: str, task_id: str) -> bool:
+        """Drop a worker's lease; False if it no longer holds it"""
+        if self.redis.hget(self.keys['owners'], task_id) != worker_id:
+            return False
+        if not self.redis.zrem(self.keys['leases'], task_id):
+            return False
+        self.redis.hdel(self.keys['owners'], task_id)
+        return True
+    
+    def _requeue_or_fail(self, task_id: str, error: str, error_type: str, retry: bool) -> bool:
+        attempts = int(self.redis.hget(self.keys['attempts'], task_id) or 0)
+        requeue = retry and attempts < self.max_attempts
+        pipe = self.redis.pipeline()
+        pipe.hset(self.keys['results'], task_id, json.dumps({'error': error, 'error_type': error_type}))
+        pipe.hset(self.keys['status'], task_id, 'pending' if requeue else 'failed')
+        if requeue:
+            pipe.rpush(self.keys['pending'], task_id)
+        pipe.execute()
+        
+        metrics.increment('work_queue_requeued_total' if requeue else 'work_queue_failed_total')
+        return requeue
+
+
+def open_work_queue(location: str):
+    """
+    Open the work queue at a location
+    
+    Args:
+        location: redis:// or rediss:// URL, or a SQLite database path
+    
+    Returns:
+        RedisWorkQueue or SQLiteWorkQueue
+    """
+    if location.startswith(('redis://', 'rediss://', 'unix://')):
+        return RedisWorkQueue(location)
+    return SQLiteWorkQueue(location)